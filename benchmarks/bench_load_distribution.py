@@ -0,0 +1,163 @@
+"""
+Benchmarks for pyBridgeLD
+
+Times the hot paths of the library on deterministic synthetic inputs and writes the results as JSON:
+
+    python benchmarks/bench_load_distribution.py --output results.json
+    python benchmarks/bench_load_distribution.py --output new.json --compare results.json
+
+Scaling axes: number of beams (2 to 40), number of vehicles (1 to 50) and number of load cases.
+Every benchmark is repeated and the best time is kept, as the least disturbed by other processes.
+"""
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pyBridgeLD as pybld
+
+N_BEAMS = [2, 5, 10, 20, 40]
+N_VEHICLES = [1, 5, 10, 25, 50]
+N_CASES = [1, 10, 100, 1000]
+
+#Stiffness parameters of gmb(), typical of a prestressed concrete deck
+STIFFNESS = {'E': [36e6, 36e6], 'nu': 0.2, 'I_l': [0.60, 0.15], 'I_t': [0.05, 0.01]}
+
+
+def bridge(n_beams: int) -> pybld.geometry.Bridge_configuration:
+    """
+    Returns a cross section with n_beams beams spaced 2.50, with the carriageway on the whole deck.
+    """
+    return pybld.geometry.Bridge_configuration(cw_width=2.50 * n_beams,
+                                               n_beams=n_beams,
+                                               beam_spacing=2.50,
+                                               beam_cantilever_left=1.25,
+                                               beam_cantilever_right=1.25,
+                                               beam_length=30,
+                                               diaph_spacing=7.50)
+
+
+def traffic(n_vehicles: int, cw_width: float, seed: int = 0) -> pybld.traffic_load.TL_configuration:
+    """
+    Returns a traffic load configuration of n_vehicles two-axle vehicles, with loads and eccentricities from a fixed seed.
+    """
+    rng = np.random.default_rng(seed)
+    veh_list = [pybld.traffic_load.Vehicle(veh_width=2.00,
+                                           veh_load_conc=[float(load), float(load)],
+                                           veh_load_conc_spacing=[2.00],
+                                           veh_load_dist=float(rng.uniform(0, 9)))
+                for load in rng.uniform(50, 150, n_vehicles)]
+    veh_ecc = rng.uniform(-(cw_width - 2.00) / 2, (cw_width - 2.00) / 2, n_vehicles).tolist()
+    return pybld.traffic_load.TL_configuration(veh_list=veh_list, veh_ecc=veh_ecc)
+
+
+def timeit(function, repeat: int = 7, min_time: float = 0.05) -> dict:
+    """
+    Returns the best and median time of a single call of function, calling it in loops of at least min_time seconds.
+    """
+    n_calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or n_calls >= 1_000_000:
+            break
+        n_calls *= 10
+
+    times = [elapsed / n_calls]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            function()
+        times.append((time.perf_counter() - start) / n_calls)
+    return {'best': min(times), 'median': statistics.median(times), 'n_calls': n_calls, 'repeat': repeat}
+
+
+def benchmarks(repeat: int = 7, min_time: float = 0.05):
+    """
+    Yields name, parameters and timing of every benchmark.
+    Cold benchmarks build new objects at every call, so that the cached arrays are computed again.
+    """
+    measure = functools.partial(timeit, repeat=repeat, min_time=min_time)
+
+    for n_beams in N_BEAMS:
+        cs = bridge(n_beams)
+        parameters = {'n_beams': n_beams}
+        yield 'geometry.beam_distance', parameters, measure(lambda: cs.beam_distance)
+        yield 'geometry.beam_distance_cold', parameters, measure(lambda: bridge(n_beams).beam_distance)
+
+    for n_vehicles in N_VEHICLES:
+        tl_config = traffic(n_vehicles, 2.50 * 40)
+        veh_list, veh_ecc = tl_config.veh_list, tl_config.veh_ecc
+        parameters = {'n_vehicles': n_vehicles}
+        yield 'traffic_load.tl_conc', parameters, measure(lambda: tl_config.tl_conc())
+        yield 'traffic_load.tl_dist', parameters, measure(lambda: tl_config.tl_dist())
+        yield 'traffic_load.tl_conc_cold', parameters, measure(
+            lambda: pybld.traffic_load.TL_configuration(veh_list=veh_list, veh_ecc=veh_ecc).tl_conc())
+        yield 'traffic_load.tl_dist_cold', parameters, measure(
+            lambda: pybld.traffic_load.TL_configuration(veh_list=veh_list, veh_ecc=veh_ecc).tl_dist())
+
+    for n_beams in N_BEAMS:
+        for n_vehicles in N_VEHICLES:
+            if 2.00 * n_vehicles > 2.50 * n_beams:
+                continue
+            cs = bridge(n_beams)
+            distribution = pybld.load_distribution.LoadDistribution(cs=cs, tl_config=traffic(n_vehicles, cs.cw_width))
+            parameters = {'n_beams': n_beams, 'n_vehicles': n_vehicles}
+            yield 'load_distribution.courbon', parameters, measure(distribution.courbon)
+            yield 'load_distribution.gmb', parameters, measure(lambda: distribution.gmb(**STIFFNESS))
+
+    for n_cases in N_CASES:
+        cs = bridge(10)
+        tl_batch = pybld.traffic_load.TL_batch.from_configurations([traffic(5, cs.cw_width, seed) for seed in range(n_cases)])
+        distribution = pybld.load_distribution.LoadDistributionBatch(cs=cs, tl_batch=tl_batch)
+        parameters = {'n_beams': 10, 'n_vehicles': 5, 'n_cases': n_cases}
+        yield 'load_distribution.batch_courbon', parameters, measure(distribution.courbon)
+        yield 'load_distribution.batch_gmb', parameters, measure(lambda: distribution.gmb(**STIFFNESS))
+
+
+def compare(results: list[dict], baseline: list[dict]):
+    """
+    Print the ratio between the best times of the results and of a baseline, for the benchmarks found in both.
+    """
+    reference = {(item['name'], json.dumps(item['parameters'], sort_keys=True)): item['best'] for item in baseline}
+    for item in results:
+        key = (item['name'], json.dumps(item['parameters'], sort_keys=True))
+        if key in reference:
+            print(f"{item['name']:36s} {key[1]:50s} {item['best'] / reference[key]:6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='benchmarks.json', help='path of the JSON results (benchmarks.json as default)')
+    parser.add_argument('--compare', default=None, help='path of the JSON results of a previous run')
+    parser.add_argument('--quick', action='store_true', help='fewer and shorter repetitions, for a smoke run')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, parameters, timing in benchmarks(*((3, 0.005) if args.quick else (7, 0.05))):
+        results.append({'name': name, 'parameters': parameters, **timing})
+        print(f"{name:36s} {json.dumps(parameters):50s} {timing['best'] * 1e6:12.1f} us")
+
+    report = {'pyBridgeLD': pybld.__version__,
+              'python': sys.version.split()[0],
+              'numpy': np.__version__,
+              'platform': platform.platform(),
+              'machine': platform.machine(),
+              'results': results}
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            compare(results, json.load(file)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,21 @@ THE SOFTWARE.
 
 __version__ = "0.1.3"
 
-from pyBridgeLD import geometry
-from pyBridgeLD import traffic_load
-from pyBridgeLD import load_distribution
+import importlib
+
+#Submodules are imported on first access (e.g. pybld.load_distribution), so that "import pyBridgeLD" stays fast
+__all__ = ['geometry', 'traffic_load', 'load_distribution', 'envelope', 'lane_placement', 'longitudinal', 'wim',
+           'grillage', 'study', 'results', 'cache', 'profiling', 'session', 'service', 'plotting', 'combination',
+           'inventory', 'simulation', 'store']
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f'pyBridgeLD.{name}')
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module 'pyBridgeLD' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
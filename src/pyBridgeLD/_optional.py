@@ -0,0 +1,11 @@
+import importlib
+
+
+def import_optional(name: str, extra: str):
+    """
+    Import an optional dependency on first use, with a hint on the extra of pyBridgeLD that installs it.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as error:
+        raise ImportError(f"{name} is needed for this function, install it with: pip install pyBridgeLD[{extra}]") from error
@@ -0,0 +1,18 @@
+import numpy as np
+
+def round_builtin(values, ndigits: int):
+    """
+    Vectorized equivalent of the built-in round(value, ndigits).
+
+    numpy.round scales by 10**ndigits before rounding, so it can disagree with round() on values
+    lying close to a half-way point. Those few values are rounded again with the built-in function,
+    so that array results match the scalar ones exactly.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0**ndigits
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded = np.array(rounded, copy=True)
+        rounded[near_half] = [round(float(value), ndigits) for value in values[near_half]]
+    return rounded
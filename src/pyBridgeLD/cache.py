@@ -0,0 +1,159 @@
+from dataclasses import dataclass, fields, is_dataclass
+import numpy as np
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+#Version of the cached results, increase it when the computation of cached results changes
+CACHE_VERSION = 1
+
+#Default size limit of a cache directory, in bytes
+CACHE_MAX_BYTES = 256 * 2**20
+
+#Age in seconds after which temporary files of interrupted writes are removed
+CACHE_STALE_TEMP = 3600
+
+def default_directory() -> str:
+    """
+    Returns the default cache directory: PYBRIDGELD_CACHE_DIR environment variable, or pyBridgeLD in the user cache folder.
+    """
+    directory = os.environ.get('PYBRIDGELD_CACHE_DIR')
+    if directory is None:
+        directory = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'pyBridgeLD')
+    return directory
+
+
+def _canonical(value):
+    """
+    Converts dataclasses, NumPy arrays and scalars to plain Python values, with a stable representation for hashing.
+    """
+    if is_dataclass(value):
+        return {item.name: _canonical(getattr(value, item.name)) for item in fields(value) if item.init}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value).hex()
+    return value
+
+
+def cache_key(*parts) -> str:
+    """
+    Returns a stable SHA-256 key of the inputs (e.g. Bridge_configuration, TL_configuration and stiffness parameters).
+    Floats are hashed with their exact binary value, so the key is the same on every machine and session.
+    """
+    data = json.dumps([CACHE_VERSION, _canonical(parts)], separators=(',', ':'))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+@dataclass
+class DiskCache:
+    """
+    A data class to define a persistent cache of NumPy arrays in a local directory, shared by many processes.
+
+    Every entry is a .npz file named after its key. Files are written to a temporary file and then renamed,
+    so that readers never see a partial entry. Reading an entry updates its modification time,
+    and the least recently used entries are removed when the directory is greater than max_bytes.
+
+    Parameters:
+    directory: path of the cache directory, created if missing (default_directory() as default)
+    max_bytes: size limit of the directory (CACHE_MAX_BYTES as default)
+    """
+    directory: str = None
+    max_bytes: int = CACHE_MAX_BYTES
+
+    def __post_init__(self):
+        if self.directory is None:
+            self.directory = default_directory()
+        self.directory = os.fspath(self.directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def get(self, key: str):
+        """
+        Returns the dictionary of arrays stored with the key, None if missing.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            # Corrupted entry, e.g. from a disk full: removed and computed again
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return arrays
+
+    def put(self, key: str, arrays: dict):
+        """
+        Store a dictionary of arrays with the key, then remove the least recently used entries over the size limit.
+        """
+        handle, temp = tempfile.mkstemp(dir=self.directory, prefix=f'{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, **arrays)
+                # The entry is on disk before it is renamed, a crash cannot publish a partial entry
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp, self.path(key))
+        except BaseException:
+            self._remove(temp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the directory is not greater than max_bytes,
+        and the temporary files left by interrupted writes.
+        """
+        entries = []
+        now = time.time()
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith('.npz'):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith('.tmp') and now - stat.st_mtime > CACHE_STALE_TEMP:
+                    self._remove(entry.path)
+
+        total = sum([size for _, size, _ in entries])
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all the entries of the cache.
+        """
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith('.npz') or entry.name.endswith('.tmp'):
+                    self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,222 @@
+from dataclasses import dataclass, field
+import numpy as np
+
+import math
+
+#Maximum number of combinations evaluated at once, memory used by envelope() does not grow beyond it
+COMBINATION_BLOCK = 65_536
+
+def result_effects(result, quantity: str = 'resultant_conc', names: list[str] = None) -> dict:
+    """
+    Returns the effects of every load case of a results.DistributionResult, as a dictionary for LoadCombination.
+
+    quantity: 'resultant_conc' or 'resultant_dist', or any quantity of the result with one value for every beam
+    names: name of every load case (case_1 to case_n as default)
+    """
+    values = getattr(result, quantity)
+    if names is None:
+        names = [f'case_{idx + 1}' for idx in range(len(values))]
+    if len(names) != len(values):
+        raise ValueError(f"Number of names {len(names)} is different from the number of load cases {len(values)}")
+    return dict(zip(names, values))
+
+
+@dataclass
+class LoadGroup:
+    """
+    A data class that defines a group of alternative load cases: in every combination at most one case of the group acts,
+    multiplied by one of the partial factors of the group (e.g. the transversal positions of the same vehicle).
+
+    Parameters:
+    name: name of the group
+    cases: names of the load cases of the group
+    factors: alternative partial factors of the group, e.g. [1.35, 1.0] for unfavourable and favourable permanent loads
+             ([1.0] as default)
+    variable: True if the group can be absent from a combination and counts for the multi-presence factor
+              (e.g. traffic loads), False if it is always present (e.g. permanent loads) (True as default)
+    """
+    name: str
+    cases: list[str]
+    factors: list[float] = field(default_factory=lambda: [1.0])
+    variable: bool = True
+
+    @property
+    def n_options(self) -> int:
+        """
+        Returns the number of alternatives of the group in a combination, absence included for variable groups.
+        """
+        return len(self.cases) * len(self.factors) + int(self.variable)
+
+
+@dataclass
+class CombinationEnvelope:
+    """
+    A data class to store the envelope of the load combinations for every beam.
+
+    Parameters:
+    max_effect: array (n_beams) with the maximum combined effect of every beam
+    min_effect: array (n_beams) with the minimum combined effect of every beam
+    max_index: array (n_beams) with the index of the combination giving the maximum, see LoadCombination.combination()
+    min_index: array (n_beams) with the index of the combination giving the minimum
+    n_combinations: number of evaluated combinations
+    """
+    max_effect: np.ndarray
+    min_effect: np.ndarray
+    max_index: np.ndarray
+    min_index: np.ndarray
+    n_combinations: int
+
+
+@dataclass
+class LoadCombination:
+    """
+    A data class that combines named load cases with partial factors and multi-presence factors.
+
+    A combination takes one alternative from every group (a load case with one of its factors, or nothing for variable groups).
+    Its effect on every beam is the sum of the factored effects of the permanent groups, plus the sum of the factored effects
+    of the variable groups multiplied by the multi-presence factor of the number of variable groups that are present.
+    Combinations are numbered as the points of a grid with one dimension for every group (last group changes fastest);
+    for every alternative of a group the factors change faster than the cases, and absence is the last alternative.
+
+    Parameters:
+    effects: dictionary with the effect of every load case on every beam, e.g. resultant_conc of courbon() or of
+             LoadDistributionBatch.result() (one list or array of n_beams values for every case)
+    groups: list of LoadGroup objects, every load case used at most in one group
+    presence_factors: multi-presence factors for 1, 2, 3... variable groups present at once, the last one is used
+                      for more groups (None as default, no reduction)
+    """
+    effects: dict[str, list[float]]
+    groups: list[LoadGroup]
+    presence_factors: list[float] = None
+    _matrix: np.ndarray = field(default=None, init=False, repr=False)
+    _options: list = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        names = list(self.effects)
+        effects = [np.asarray(self.effects[name], dtype=float).ravel() for name in names]
+        if len(effects) == 0 or len({len(effect) for effect in effects}) > 1:
+            raise ValueError(f"At least one load case is needed, with one effect for every beam")
+        # Matrix of the effects with a row of zeros at the end, used by absent groups (case index -1)
+        self._matrix = np.vstack(effects + [np.zeros(len(effects[0]))])
+        if len(self.groups) == 0:
+            raise ValueError(f"At least one load group is needed to build the combinations")
+        index = {name: idx for idx, name in enumerate(names)}
+        used = set()
+
+        # Options of every group: case index (-1 when absent), factor, present (variable groups only)
+        # and the factored effects of every option, gathered by evaluate()
+        self._options = []
+        for group in self.groups:
+            for case in group.cases:
+                if case not in index:
+                    raise ValueError(f"Load case {case} of group {group.name} is not defined in effects")
+                if case in used:
+                    raise ValueError(f"Load case {case} is used by more than one group")
+                used.add(case)
+            if len(group.cases) * len(group.factors) == 0 and not group.variable:
+                raise ValueError(f"Permanent group {group.name} needs at least one load case and one factor")
+            case_idx = [index[case] for case in group.cases for _ in group.factors]
+            factors = [factor for _ in group.cases for factor in group.factors]
+            present = [group.variable] * len(case_idx)
+            if group.variable:
+                case_idx.append(-1)
+                factors.append(0.0)
+                present.append(False)
+            case_idx, factors = np.array(case_idx, dtype=int), np.array(factors, dtype=float)
+            self._options.append((case_idx, factors, np.array(present), factors[:, None] * self._matrix[case_idx]))
+
+        if self.presence_factors is not None and len(self.presence_factors) == 0:
+            raise ValueError(f"At least one multi-presence factor is needed, or None for no reduction")
+
+    @property
+    def shape(self) -> tuple[int]:
+        """
+        Returns the number of alternatives of every group.
+        """
+        return tuple(group.n_options for group in self.groups)
+
+    @property
+    def n_beams(self) -> int:
+        return self._matrix.shape[1]
+
+    @property
+    def n_combinations(self) -> int:
+        return math.prod(self.shape)
+
+    def combination(self, idx: int) -> dict:
+        """
+        Returns the idx-th combination, as a dictionary with the load case and the factor of every group (None if absent).
+        The factor of the variable groups does not include the multi-presence factor.
+        """
+        position = np.unravel_index(idx, self.shape)
+        names = list(self.effects)
+        combination = {}
+        for group, (case_idx, factors, _, _), option in zip(self.groups, self._options, position):
+            combination[group.name] = None if case_idx[option] < 0 else (names[case_idx[option]], float(factors[option]))
+        return combination
+
+    def _presence(self, count: np.ndarray) -> np.ndarray:
+        # Multi-presence factor of every combination, 1 when no variable group is present
+        if self.presence_factors is None:
+            return np.ones(len(count))
+        factors = np.concatenate([[1.0], np.asarray(self.presence_factors, dtype=float)])
+        return factors[np.minimum(count, len(factors) - 1)]
+
+    def evaluate(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns the array (n_combinations x n_beams) of the effects of the combinations from start to stop (excluded).
+        """
+        position = np.unravel_index(np.arange(start, stop), self.shape)
+        permanent = np.zeros((stop - start, self.n_beams))
+        if self.presence_factors is None:
+            # Without multi-presence factors all the groups are summed together
+            for (_, _, _, effects), option in zip(self._options, position):
+                permanent += np.take(effects, option, axis=0)
+            return permanent
+
+        variable = np.zeros((stop - start, self.n_beams))
+        count = np.zeros(stop - start, dtype=int)
+        for group, (_, _, present, effects), option in zip(self.groups, self._options, position):
+            total = variable if group.variable else permanent
+            total += np.take(effects, option, axis=0)
+            count += present[option]
+        variable *= self._presence(count)[:, None]
+        permanent += variable
+        return permanent
+
+    def envelope(self, block_size: int = COMBINATION_BLOCK, progress=None) -> CombinationEnvelope:
+        """
+        The function evaluates all the combinations, in blocks of block_size combinations, and returns the maximum and
+        minimum effect of every beam with the combinations that give them. Only the running extremes are kept between
+        blocks, so memory does not grow with the number of combinations.
+
+        block_size: number of combinations of every block (COMBINATION_BLOCK as default)
+        progress: optional function called with the number of evaluated combinations and the total number of combinations,
+                  after every block
+        """
+        n_combinations = self.n_combinations
+        max_effect = np.full(self.n_beams, -np.inf)
+        min_effect = np.full(self.n_beams, np.inf)
+        max_index = np.zeros(self.n_beams, dtype=np.int64)
+        min_index = np.zeros(self.n_beams, dtype=np.int64)
+
+        for start in range(0, n_combinations, block_size):
+            stop = min(start + block_size, n_combinations)
+            effect = self.evaluate(start, stop)
+
+            #Running extremes: a block replaces them only where it is strictly better, so the first governing combination is kept.
+            #The index is searched only for the beams that improved, usually few of them after the first blocks
+            block_max = effect.max(axis=0)
+            for beam in np.flatnonzero(block_max > max_effect):
+                max_effect[beam] = block_max[beam]
+                max_index[beam] = start + effect[:, beam].argmax()
+
+            block_min = effect.min(axis=0)
+            for beam in np.flatnonzero(block_min < min_effect):
+                min_effect[beam] = block_min[beam]
+                min_index[beam] = start + effect[:, beam].argmin()
+
+            if progress is not None:
+                progress(stop, n_combinations)
+
+        return CombinationEnvelope(max_effect, min_effect, max_index, min_index, n_combinations)
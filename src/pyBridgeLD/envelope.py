@@ -0,0 +1,78 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from dataclasses import dataclass
+
+@dataclass
+class TransverseEnvelope:
+    """
+    A data class to find the transversal positions of a set of vehicles that give the maximum and minimum load on every beam.
+    Vehicles cannot overlap and must stay inside the carriageway, that goes from -cw_width/2 to +cw_width/2.
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    veh_list: A list of pre-defined Vehicle objects, all of them are placed on the carriageway
+    """
+    cs: geom.Bridge_configuration
+    veh_list: list[tl.Vehicle]
+
+    def packed_ecc(self, side: int, weights: list[float]) -> list[float]:
+        """
+        Returns the eccentricities of the vehicles packed side by side against one edge of the carriageway.
+        Vehicles with the greatest weight per unit width are the nearest to the edge.
+
+        side: +1 for the right edge, -1 for the left edge
+        weights: weight of every vehicle, used to sort them
+        """
+        order = sorted(range(len(self.veh_list)),
+                       key=lambda idx: weights[idx] / self.veh_list[idx].veh_width, reverse=True)
+        veh_ecc = [0.0] * len(self.veh_list)
+        edge = self.cs.cw_width / 2
+        for idx in order:
+            veh_width = self.veh_list[idx].veh_width
+            veh_ecc[idx] = side * (edge - veh_width / 2)
+            edge = edge - veh_width
+        return veh_ecc
+
+    def courbon(self, load: str = 'conc'):
+        """
+        The function returns the envelope of the Courbon load distribution for every beam of the cross section.
+
+        With Courbon theory the load on a beam is linear in the eccentricity of every vehicle, so the extreme values
+        are reached with all the vehicles packed against one of the two edges of the carriageway, sorted by weight
+        per unit width (heaviest at the edge). Only these two placements are evaluated.
+
+        load: 'conc' to envelope the concentrated loads, 'dist' to envelope the distributed loads
+
+        Returns
+        -------
+        [max_load, min_load, max_ecc, min_ecc]
+
+        max_load: maximum load for i-th beam (resultant_conc or resultant_dist of courbon())
+        min_load: minimum load for i-th beam
+        max_ecc: veh_ecc list of the placement giving the maximum load for i-th beam
+        min_ecc: veh_ecc list of the placement giving the minimum load for i-th beam
+        """
+        if load == 'conc':
+            weights = [sum(vehicle.veh_load_conc) for vehicle in self.veh_list]
+            result_idx = 3
+        elif load == 'dist':
+            weights = [vehicle.veh_load_dist * vehicle.veh_width for vehicle in self.veh_list]
+            result_idx = 4
+        else:
+            raise ValueError(f"Load type must be 'conc' or 'dist', not {load}")
+
+        veh_width = sum([vehicle.veh_width for vehicle in self.veh_list])
+        if veh_width > self.cs.cw_width:
+            raise ValueError(f"Total width of vehicles {veh_width} is greater than carriageway width {self.cs.cw_width}")
+
+        placements = [self.packed_ecc(-1, weights), self.packed_ecc(+1, weights)]
+        tl_batch = tl.TL_batch.from_configurations([tl.TL_configuration(veh_list=self.veh_list, veh_ecc=veh_ecc)
+                                                    for veh_ecc in placements])
+        loads = ld.LoadDistributionBatch(cs=self.cs, tl_batch=tl_batch).courbon()[result_idx]
+
+        max_load = loads.max(axis=0).tolist()
+        min_load = loads.min(axis=0).tolist()
+        max_ecc = [placements[idx] for idx in loads.argmax(axis=0)]
+        min_ecc = [placements[idx] for idx in loads.argmin(axis=0)]
+        return max_load, min_load, max_ecc, min_ecc
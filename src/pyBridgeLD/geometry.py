@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from pyBridgeLD.profiling import instrumented
+from dataclasses import dataclass, field
+import numpy as np
     
 #Definition of geometry Class
 
-@dataclass
+@dataclass(slots=True)
 class Bridge_configuration:
     """
     A class that contains all the information to describe a configuration of a bridge (longitudinal and transversal directions)
@@ -17,6 +19,8 @@ class Bridge_configuration:
     -n_diaph: number of internal transversal diaphragms, the external diaphragms near supports are not considered (3 as default)
     -diaph_spacing: longitudinal spacing between diaphragms, supposed constant (0 as default)
 
+    Beam distances and the polar inertia of the beams are computed once and cached, 
+    the cache is cleared when a parameter is assigned a new value.
     """
     cw_width: float
     n_beams: int
@@ -26,17 +30,62 @@ class Bridge_configuration:
     beam_length: float = 0
     n_diaph: int = 3
     diaph_spacing: float = 0
+    _beam_distance: tuple = field(default=None, init=False, repr=False, compare=False)
+    _beam_offsets: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _polar_inertia: float = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_beam_distance', None)
+            object.__setattr__(self, '_beam_offsets', None)
+            object.__setattr__(self, '_polar_inertia', None)
 
     @property
     def beam_distance(self) -> list[float]:
         """
         Returns a list of floats containing the relative distance between i-th beam and the centerline of cross section's bridge.
         """
+        if self._beam_distance is None:
+            object.__setattr__(self, '_beam_distance', tuple(self._compute_beam_distance()))
+        return list(self._beam_distance)
+
+    @property
+    def beam_offsets(self) -> np.ndarray:
+        """
+        Returns a read-only array with the same values of beam_distance.
+        """
+        if self._beam_offsets is None:
+            beam_offsets = np.array(self.beam_distance, dtype=float)
+            beam_offsets.setflags(write=False)
+            object.__setattr__(self, '_beam_offsets', beam_offsets)
+        return self._beam_offsets
+
+    @property
+    def polar_inertia(self) -> float:
+        """
+        Returns the polar inertia of the beams, the sum of the squared beam distances.
+        """
+        if self._polar_inertia is None:
+            object.__setattr__(self, '_polar_inertia', sum([distance ** 2 for distance in self.beam_distance]))
+        return self._polar_inertia
+
+    @property
+    def diaph_position(self) -> tuple[float]:
+        """
+        Returns the longitudinal positions of the internal diaphragms, symmetric about midspan and spaced diaph_spacing
+        (beam_length/(n_diaph+1) if diaph_spacing is 0).
+        """
+        spacing = self.diaph_spacing if self.diaph_spacing > 0 else self.beam_length / (self.n_diaph + 1)
+        return tuple(self.beam_length / 2 + spacing * (idx - (self.n_diaph - 1) / 2) for idx in range(self.n_diaph))
+
+    @instrumented('geometry.beam_distance')
+    def _compute_beam_distance(self) -> list[float]:
         if self.n_beams < 2:
             raise ValueError(f"Number of beams can't be {self.n_beams}, but at least > 2")
         elif self.n_beams == 2:
-            dist_1 = self.beams_spacing/2
-            dist_2 = self.beams_spacing/2 
+            dist_1 = self.beam_spacing/2
+            dist_2 = self.beam_spacing/2
             dist = [-dist_1, +dist_2]
         elif self.n_beams > 2 and (self.n_beams % 2) == 0:
             beam_idx_mid = int(round(self.n_beams/2, 0)) #index of middle beam
@@ -0,0 +1,173 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD.profiling import instrumented
+from dataclasses import dataclass
+import numpy as np
+
+import functools
+import math
+
+#Number of grillage models whose midspan deflections are kept in memory
+GRILLAGE_CACHE_SIZE = 32
+
+@dataclass
+class Grillage:
+    """
+    A data class to define a grillage model of the deck: beams and internal diaphragms are members with flexural and
+    torsional stiffness, connected at the nodes. Every node has three degrees of freedom: the deflection w and the slopes
+    dw/dx (longitudinal) and dw/dy (transversal). Beams are simply supported, with torsional restraints at the supports.
+
+    Beams are divided in n_elements members, diaphragms and midspan are always nodes of the model.
+    For a skewed deck the supports and the diaphragms are parallel, rotated by the skew angle.
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    E: Elasticity modulusus of beams and diaphragms [E_beams, E_diaphragms, ...]
+    nu: Poisson modulus
+    I_l: Inertia of sections [I_l_beams, I_l_diaphragms]
+    I_t: Torsional inertia of sections [I_t_beams, I_t_diaphragms]
+    n_elements: number of members of every beam between the supports (20 as default)
+    skew: skew angle of supports and diaphragms in degrees, 0 for a right deck (0 as default)
+    """
+    cs: geom.Bridge_configuration
+    E: list[float]
+    nu: float
+    I_l: list[float]
+    I_t: list[float]
+    n_elements: int = 20
+    skew: float = 0
+
+    def stations(self) -> np.ndarray:
+        """
+        Returns the longitudinal positions of the nodes of every beam, measured from the first support of the beam.
+        """
+        length = self.cs.beam_length
+        stations = np.concatenate([np.linspace(0, length, self.n_elements + 1), self.cs.diaph_position, [length / 2]])
+        return np.unique(np.round(stations, 9))
+
+    def nodes(self):
+        """
+        Returns the coordinates of the nodes as two arrays (n_beams x n_stations), x along the beams and y across them.
+        """
+        y = self.cs.beam_offsets[:, None]
+        x = self.stations()[None, :] + y * math.tan(math.radians(self.skew))
+        return np.broadcast_to(x, (self.cs.n_beams, x.shape[1])), np.broadcast_to(y, (self.cs.n_beams, x.shape[1]))
+
+    def members(self):
+        """
+        Returns the members of the grillage as arrays of first node, second node, flexural stiffness and torsional stiffness.
+        Nodes are numbered beam by beam.
+        """
+        n_stations = len(self.stations())
+        node = np.arange(self.cs.n_beams * n_stations).reshape(self.cs.n_beams, n_stations)
+        G = [E / (2 * (1 + self.nu)) for E in self.E[:2]]
+
+        # Beams, between consecutive stations
+        first = [node[:, :-1].ravel()]
+        second = [node[:, 1:].ravel()]
+        EI = [np.full(first[0].shape, self.E[0] * self.I_l[0])]
+        GJ = [np.full(first[0].shape, G[0] * self.I_t[0])]
+
+        # Diaphragms, between adjacent beams
+        diaph_station = np.searchsorted(self.stations(), np.round(self.cs.diaph_position, 9))
+        if len(diaph_station) > 0:
+            first.append(node[:-1, diaph_station].ravel())
+            second.append(node[1:, diaph_station].ravel())
+            EI.append(np.full(first[-1].shape, self.E[1] * self.I_l[1]))
+            GJ.append(np.full(first[-1].shape, G[1] * self.I_t[1]))
+        return np.concatenate(first), np.concatenate(second), np.concatenate(EI), np.concatenate(GJ)
+
+    @instrumented('grillage.stiffness_matrix')
+    def stiffness_matrix(self):
+        """
+        Returns the sparse stiffness matrix (3 n_nodes x 3 n_nodes) of the grillage, without boundary conditions.
+        """
+        import scipy.sparse as sp
+
+        x, y = self.nodes()
+        x = x.ravel()
+        y = y.ravel()
+        first, second, EI, GJ = self.members()
+        dx = x[second] - x[first]
+        dy = y[second] - y[first]
+        L = np.hypot(dx, dy)
+        c = dx / L
+        s = dy / L
+
+        # Local stiffness matrices, degrees of freedom [w1, slope1, twist1, w2, slope2, twist2]
+        k = np.zeros((len(L), 6, 6))
+        bending = EI[:, None, None] / L[:, None, None]**3 * np.array([[12, 6, -12, 6],
+                                                                      [6, 4, -6, 2],
+                                                                      [-12, -6, 12, -6],
+                                                                      [6, 2, -6, 4]])
+        scale = np.stack([np.ones_like(L), L, np.ones_like(L), L], axis=1)
+        bending = bending * scale[:, :, None] * scale[:, None, :]
+        idx = np.array([0, 1, 3, 4])
+        k[:, idx[:, None], idx[None, :]] = bending
+        torsion = GJ[:, None, None] / L[:, None, None] * np.array([[1, -1], [-1, 1]])
+        idx = np.array([2, 5])
+        k[:, idx[:, None], idx[None, :]] = torsion
+
+        # Rotation from global [w, dw/dx, dw/dy] to local [w, slope, twist]
+        T = np.zeros((len(L), 6, 6))
+        for offset in [0, 3]:
+            T[:, offset, offset] = 1
+            T[:, offset + 1, offset + 1] = c
+            T[:, offset + 1, offset + 2] = s
+            T[:, offset + 2, offset + 1] = -s
+            T[:, offset + 2, offset + 2] = c
+        k_global = np.einsum('eji,ejk,ekl->eil', T, k, T)
+
+        dof = np.concatenate([3 * first[:, None] + np.arange(3), 3 * second[:, None] + np.arange(3)], axis=1)
+        rows = np.broadcast_to(dof[:, :, None], k_global.shape).ravel()
+        cols = np.broadcast_to(dof[:, None, :], k_global.shape).ravel()
+        n_dof = 3 * x.size
+        return sp.coo_matrix((k_global.ravel(), (rows, cols)), shape=(n_dof, n_dof)).tocsc()
+
+    @instrumented('grillage.midspan_deflections')
+    def midspan_deflections(self) -> np.ndarray:
+        """
+        Returns the matrix (n_beams x n_beams) of midspan deflections: column j contains the deflections of all the beams
+        for a unit load at midspan of j-th beam. The stiffness matrix is factorized once and the unit loads
+        are solved together as multiple right-hand sides.
+        """
+        import scipy.sparse.linalg as spla
+
+        if self.cs.beam_length <= 0:
+            raise ValueError(f"Beam length must be greater than 0 for grillage analysis, not {self.cs.beam_length}")
+        if not all(0 < position < self.cs.beam_length for position in self.cs.diaph_position):
+            raise ValueError(f"Internal diaphragms at {self.cs.diaph_position} are not inside the span (0, {self.cs.beam_length}), "
+                             f"reduce diaph_spacing")
+        if self.I_t[0] <= 0:
+            raise ValueError(f"Torsional inertia of beams must be greater than 0 for grillage analysis, not {self.I_t[0]}")
+        n_stations = len(self.stations())
+        node = np.arange(self.cs.n_beams * n_stations).reshape(self.cs.n_beams, n_stations)
+
+        # Supports: deflection and twist of the beams restrained at both ends
+        fixed = np.concatenate([3 * node[:, [0, -1]].ravel(), 3 * node[:, [0, -1]].ravel() + 2])
+        free = np.setdiff1d(np.arange(3 * node.size), fixed)
+        K = self.stiffness_matrix()[free][:, free]
+        lu = spla.splu(K.tocsc())
+
+        midspan = 3 * node[:, np.searchsorted(self.stations(), round(self.cs.beam_length / 2, 9))]
+        rhs = np.zeros((3 * node.size, self.cs.n_beams))
+        rhs[midspan, np.arange(self.cs.n_beams)] = 1
+        displacement = np.zeros((3 * node.size, self.cs.n_beams))
+        displacement[free] = lu.solve(rhs[free])
+        return displacement[midspan]
+
+
+@functools.lru_cache(maxsize=GRILLAGE_CACHE_SIZE)
+def _midspan_deflections(cs_key: tuple, E: tuple, nu: float, I_l: tuple, I_t: tuple, n_elements: int, skew: float) -> np.ndarray:
+    cs = geom.Bridge_configuration(*cs_key)
+    deflections = Grillage(cs, list(E), nu, list(I_l), list(I_t), n_elements, skew).midspan_deflections()
+    deflections.setflags(write=False)
+    return deflections
+
+
+def midspan_deflections(cs: geom.Bridge_configuration, E, nu, I_l, I_t, n_elements: int = 20, skew: float = 0) -> np.ndarray:
+    """
+    Same as Grillage.midspan_deflections, with the results of the last GRILLAGE_CACHE_SIZE models kept in memory.
+    """
+    cs_key = (cs.cw_width, cs.n_beams, cs.beam_spacing, cs.beam_cantilever_right, cs.beam_cantilever_left,
+              cs.beam_length, cs.n_diaph, cs.diaph_spacing)
+    return _midspan_deflections(cs_key, tuple(E), nu, tuple(I_l), tuple(I_t), n_elements, skew)
@@ -0,0 +1,438 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from pyBridgeLD._optional import import_optional
+from pyBridgeLD._rounding import round_builtin
+from dataclasses import MISSING, dataclass, field, fields
+import numpy as np
+
+import itertools
+import json
+
+#Name and version of the inventory format, see docs/inventory_format.md
+INVENTORY_FORMAT = 'pyBridgeLD-inventory'
+INVENTORY_VERSION = 1
+
+#Fields of every deck: geometry (with the defaults of Bridge_configuration, None if required), stiffness (optional)
+#and traffic (one value for every vehicle)
+GEOMETRY_FIELDS = {item.name: None if item.default is MISSING else item.default
+                   for item in fields(geom.Bridge_configuration) if item.init}
+STIFFNESS_FIELDS = ('E', 'nu', 'I_l', 'I_t')
+VEHICLE_FIELDS = ('veh_width', 'veh_ecc', 'veh_load_dist')
+LOAD_FIELDS = ('veh_load_conc', 'veh_load_conc_spacing')
+
+@dataclass
+class Inventory:
+    """
+    A data class to store a portfolio of decks, with their geometry, stiffness and traffic load configuration, as arrays.
+
+    Every deck is a row of the geometry and stiffness arrays. Vehicles of all the decks are stored in flat arrays,
+    with the offsets of the first vehicle of every deck, and the concentrated loads and spacings of all the vehicles
+    in flat arrays with the offsets of every vehicle, as the list columns of Arrow.
+    Batched load arrays, padded with zero loads, are built with array operations only, see conc_weights.
+
+    Parameters:
+    ids: identifier of every deck
+    geometry: dictionary with an array (n_decks) for every field of geometry.Bridge_configuration
+    stiffness: dictionary with arrays E (n_decks x 3), nu (n_decks), I_l (n_decks x 2), I_t (n_decks x 2),
+               NaN when missing (None as default, no stiffness)
+    veh_offsets: array (n_decks + 1), vehicles of i-th deck are from veh_offsets[i] to veh_offsets[i+1]
+    vehicles: dictionary with a flat array for veh_width, veh_ecc and veh_load_dist
+    loads: dictionary with (offsets, values) of veh_load_conc and veh_load_conc_spacing, offsets are (n_vehicles + 1)
+    """
+    ids: np.ndarray
+    geometry: dict[str, np.ndarray]
+    stiffness: dict[str, np.ndarray]
+    veh_offsets: np.ndarray
+    vehicles: dict[str, np.ndarray]
+    loads: dict[str, tuple]
+    _batch: tuple = field(default=None, init=False, repr=False)
+
+    @property
+    def n_decks(self) -> int:
+        return len(self.ids)
+
+    @property
+    def n_vehicles(self) -> np.ndarray:
+        """
+        Returns the number of vehicles of every deck.
+        """
+        return np.diff(self.veh_offsets)
+
+    @classmethod
+    def from_objects(cls, ids: list[str], bridges: list[geom.Bridge_configuration], tl_configs: list[tl.TL_configuration],
+                     stiffness: list[dict] = None):
+        """
+        Build an inventory from lists of Bridge_configuration and TL_configuration objects (and stiffness dictionaries
+        with E, nu, I_l, I_t, None for the decks without stiffness).
+        """
+        records = []
+        for idx, (deck_id, cs, tl_config) in enumerate(zip(ids, bridges, tl_configs)):
+            record = {'id': deck_id}
+            record.update({name: getattr(cs, name) for name in GEOMETRY_FIELDS})
+            if stiffness is not None and stiffness[idx] is not None:
+                record.update({name: stiffness[idx][name] for name in STIFFNESS_FIELDS})
+            record['veh_width'] = [vehicle.veh_width for vehicle in tl_config.veh_list]
+            record['veh_ecc'] = list(tl_config.veh_ecc)
+            record['veh_load_dist'] = [vehicle.veh_load_dist for vehicle in tl_config.veh_list]
+            record['veh_load_conc'] = [list(vehicle.veh_load_conc) for vehicle in tl_config.veh_list]
+            record['veh_load_conc_spacing'] = [list(vehicle.veh_load_conc_spacing) for vehicle in tl_config.veh_list]
+            records.append(record)
+        return _from_records(records)
+
+    def bridge(self, idx: int) -> geom.Bridge_configuration:
+        """
+        Returns the Bridge_configuration of idx-th deck.
+        """
+        values = {name: self.geometry[name][idx].item() for name in GEOMETRY_FIELDS}
+        return geom.Bridge_configuration(**values)
+
+    def stiffness_parameters(self, idx: int) -> dict:
+        """
+        Returns the dictionary of E, nu, I_l, I_t of idx-th deck, for LoadDistribution.gmb() and grillage().
+        """
+        if self.stiffness is None or np.isnan(self.stiffness['nu'][idx]):
+            raise ValueError(f"Stiffness parameters are not defined for deck {self.ids[idx]}")
+        E = self.stiffness['E'][idx]
+        return {'E': E[~np.isnan(E)].tolist(), 'nu': self.stiffness['nu'][idx].item(),
+                'I_l': self.stiffness['I_l'][idx].tolist(), 'I_t': self.stiffness['I_t'][idx].tolist()}
+
+    def tl_configuration(self, idx: int) -> tl.TL_configuration:
+        """
+        Returns the TL_configuration of idx-th deck.
+        """
+        start, stop = self.veh_offsets[idx], self.veh_offsets[idx + 1]
+        veh_list = []
+        for vehicle in range(start, stop):
+            conc = {name: array[offsets[vehicle]:offsets[vehicle + 1]].tolist() for name, (offsets, array) in self.loads.items()}
+            veh_list.append(tl.Vehicle(veh_width=self.vehicles['veh_width'][vehicle].item(),
+                                       veh_load_conc=conc['veh_load_conc'],
+                                       veh_load_conc_spacing=conc['veh_load_conc_spacing'],
+                                       veh_load_dist=self.vehicles['veh_load_dist'][vehicle].item()))
+        return tl.TL_configuration(veh_list=veh_list, veh_ecc=self.vehicles['veh_ecc'][start:stop].tolist())
+
+    def _batch_arrays(self):
+        # Padded arrays (n_decks x max_loads) of weights and eccentricities, and the number of loads of every deck
+        if self._batch is not None:
+            return self._batch
+        conc_offsets, conc_values = self.loads['veh_load_conc']
+        spacing_offsets, spacing_values = self.loads['veh_load_conc_spacing']
+
+        #Concentrated loads at -/+ spacing/2 from the centre of every vehicle, with the rounding of TL_configuration.tl_conc()
+        centre = np.repeat(self.vehicles['veh_ecc'], np.diff(spacing_offsets))
+        ecc_values = round_builtin(np.column_stack([centre - spacing_values / 2, centre + spacing_values / 2]).ravel(), 2)
+        deck_conc = conc_offsets[self.veh_offsets]
+        deck_ecc = 2 * spacing_offsets[self.veh_offsets]
+        n_conc = np.diff(deck_conc)
+        short = np.flatnonzero(np.diff(deck_ecc) < n_conc)
+        if len(short):
+            raise ValueError(f"Concentrated loads of deck {self.ids[short[0]]} have more weights than eccentricities")
+
+        # Eccentricities exceeding the number of load weights of a deck are discarded, as done by TL_configuration.conc_ecc
+        column = np.arange(n_conc.max(initial=0))
+        mask = column < n_conc[:, None]
+        conc_weights = np.zeros(mask.shape)
+        conc_ecc = np.zeros(mask.shape)
+        conc_weights[mask] = conc_values
+        conc_ecc[mask] = ecc_values[(deck_ecc[:-1, None] + column)[mask]]
+
+        n_dist = self.n_vehicles
+        mask = np.arange(n_dist.max(initial=0)) < n_dist[:, None]
+        dist_weights = np.zeros(mask.shape)
+        dist_ecc = np.zeros(mask.shape)
+        dist_weights[mask] = self.vehicles['veh_load_dist'] * self.vehicles['veh_width']
+        dist_ecc[mask] = self.vehicles['veh_ecc']
+
+        for array in [conc_weights, conc_ecc, dist_weights, dist_ecc]:
+            array.setflags(write=False)
+        self._batch = (conc_weights, conc_ecc, n_conc, dist_weights, dist_ecc, n_dist)
+        return self._batch
+
+    @property
+    def conc_weights(self) -> np.ndarray:
+        """
+        Returns a read-only array (n_decks x max_conc) with the weights of the concentrated loads of every deck,
+        padded with zero weights. Eccentricities are in conc_ecc, as in TL_batch.
+        """
+        return self._batch_arrays()[0]
+
+    @property
+    def conc_ecc(self) -> np.ndarray:
+        return self._batch_arrays()[1]
+
+    @property
+    def dist_weights(self) -> np.ndarray:
+        """
+        Returns a read-only array (n_decks x max_dist) with the weights of the distributed loads of every deck,
+        padded with zero weights. Eccentricities are in dist_ecc, as in TL_batch.
+        """
+        return self._batch_arrays()[3]
+
+    @property
+    def dist_ecc(self) -> np.ndarray:
+        return self._batch_arrays()[4]
+
+    @property
+    def beam_offsets(self) -> np.ndarray:
+        """
+        Returns an array (n_decks x max_beams) with the beam distances of every deck, the same of
+        Bridge_configuration.beam_distance, padded with NaN.
+        """
+        n_beams = self.geometry['n_beams'].astype(int)
+        spacing = self.geometry['beam_spacing'][:, None]
+        idx = np.arange(1, n_beams.max(initial=2) + 1)
+        even = -round_builtin(spacing / 2 + spacing * (n_beams[:, None] / 2 - idx), 2)
+        odd = -round_builtin(spacing * (n_beams[:, None] // 2 + 1 - idx), 2)
+        offsets = np.where(n_beams[:, None] % 2 == 0, even, odd)
+        offsets = np.where(n_beams[:, None] == 2, np.where(idx == 1, -spacing / 2, spacing / 2), offsets)
+        return np.where(idx <= n_beams[:, None], offsets, np.nan)
+
+    def check(self) -> list[tuple]:
+        """
+        Check the whole inventory with array operations.
+
+        Returns
+        -------
+        errors: list of (id, message) for every deck with an error, empty if the inventory is valid
+        """
+        g = self.geometry
+        half_width = g['cw_width'] / 2
+        vehicle_deck = np.repeat(np.arange(self.n_decks), self.n_vehicles)
+        outside = np.abs(self.vehicles['veh_ecc']) + self.vehicles['veh_width'] / 2 > half_width[vehicle_deck] + 1e-9
+        conc_offsets = self.loads['veh_load_conc'][0]
+        spacing_offsets = self.loads['veh_load_conc_spacing'][0]
+        rules = [(g['cw_width'] <= 0, "carriageway width must be greater than 0"),
+                 (g['n_beams'] < 2, "number of beams must be at least 2"),
+                 (g['beam_spacing'] <= 0, "beam spacing must be greater than 0"),
+                 (g['n_diaph'] < 0, "number of diaphragms cannot be negative"),
+                 (np.bincount(vehicle_deck, outside, minlength=self.n_decks) > 0, "vehicles outside the carriageway"),
+                 (np.diff(2 * spacing_offsets[self.veh_offsets]) < np.diff(conc_offsets[self.veh_offsets]),
+                  "concentrated loads have more weights than eccentricities"),
+                 (self.n_vehicles == 0, "traffic load configuration has no vehicles")]
+        errors = []
+        for failed, message in rules:
+            errors.extend([(self.ids[idx], message) for idx in np.flatnonzero(failed)])
+        order = {deck_id: idx for idx, deck_id in enumerate(self.ids)}
+        return sorted(errors, key=lambda error: order[error[0]])
+
+    def result(self, theory: str = 'courbon', **parameters):
+        """
+        The function returns the load distribution of every deck of the inventory, at full precision as
+        LoadDistribution.result(). Courbon theory is evaluated for all the decks at once; the other theories deck by deck,
+        with the stiffness parameters of the inventory.
+
+        theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+        parameters: further parameters of the theory, e.g. table=True for gmb()
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        resultant: array (n_decks x 4) of total vertical force and moment for concentrated and distributed loads
+        ki_conc, ki_dist, resultant_conc, resultant_dist: arrays (n_decks x max_beams), padded with NaN,
+        with the same definitions of LoadDistribution.courbon()
+        """
+        conc_weights, conc_ecc, n_conc, dist_weights, dist_ecc, n_dist = self._batch_arrays()
+        offsets = self.beam_offsets
+        if theory == 'courbon':
+            no_diaph = np.flatnonzero(self.geometry['n_diaph'] == 0)
+            if len(no_diaph):
+                raise ValueError(f"Number of internal diaphragms of deck {self.ids[no_diaph[0]]} is less than 1, "
+                                 f"so Courbon theory cannot be used")
+            n_beams = self.geometry['n_beams'][:, None, None]
+            polar_inertia = ld._sequential_sum(np.nan_to_num(offsets) ** 2)[:, None, None]
+            k_conc = 1 / n_beams + conc_ecc[:, :, None] * offsets[:, None, :] / polar_inertia
+            k_dist = 1 / n_beams + dist_ecc[:, :, None] * offsets[:, None, :] / polar_inertia
+        elif theory in ['engesser', 'gmb', 'grillage']:
+            k_conc = np.full(conc_weights.shape + offsets.shape[1:], np.nan)
+            k_dist = np.full(dist_weights.shape + offsets.shape[1:], np.nan)
+            for idx in range(self.n_decks):
+                cs = self.bridge(idx)
+                batch = tl.TL_batch(conc_weights[idx, :n_conc[idx]], conc_ecc[idx, :n_conc[idx]],
+                                    dist_weights[idx, :n_dist[idx]], dist_ecc[idx, :n_dist[idx]])
+                distribution = ld.LoadDistributionBatch(cs=cs, tl_batch=batch)
+                if theory == 'engesser':
+                    coefficients = distribution._engesser_coefficients(**parameters)
+                else:
+                    stiffness = self.stiffness_parameters(idx)
+                    coefficients = getattr(distribution, f'_{theory}_coefficients')(**stiffness, **parameters)
+                k_conc[idx, :n_conc[idx], :cs.n_beams] = coefficients[0][0]
+                k_dist[idx, :n_dist[idx], :cs.n_beams] = coefficients[1][0]
+        else:
+            raise ValueError(f"Theory must be 'courbon', 'engesser', 'gmb' or 'grillage', not {theory}")
+
+        # Same reduction of results.DistributionResult.from_coefficients(), padded loads have zero weights
+        k_conc = np.where(np.arange(conc_weights.shape[1])[:, None] < n_conc[:, None, None], k_conc, 0.0)
+        dist_mask = np.arange(dist_weights.shape[1])[:, None] < n_dist[:, None, None]
+        conc_force = conc_weights.sum(axis=1)
+        dist_force = dist_weights.sum(axis=1)
+        resultant = np.column_stack([conc_force, (conc_weights * conc_ecc).sum(axis=1),
+                                     dist_force, (dist_weights * dist_ecc).sum(axis=1)])
+        resultant_conc = np.einsum('dl,dlb->db', conc_weights, k_conc)
+        resultant_dist = np.einsum('dl,dlb->db', dist_weights, np.where(dist_mask, k_dist, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ki_conc = resultant_conc / conc_force[:, None]
+            k_mean = np.where(dist_mask, k_dist, 0.0).sum(axis=1) / n_dist[:, None]
+            ki_dist = np.where(dist_force[:, None] == 0, k_mean, resultant_dist / dist_force[:, None])
+        beams = np.isnan(offsets)
+        for array in [ki_conc, ki_dist, resultant_conc, resultant_dist]:
+            array[beams] = np.nan
+        return resultant, ki_conc, ki_dist, resultant_conc, resultant_dist
+
+    def records(self) -> list[dict]:
+        """
+        Returns a list with the record of every deck, with the fields of the inventory format.
+        """
+        conc_offsets, conc_values = self.loads['veh_load_conc']
+        spacing_offsets, spacing_values = self.loads['veh_load_conc_spacing']
+        records = []
+        for idx in range(self.n_decks):
+            record = {'id': str(self.ids[idx])}
+            record.update({name: self.geometry[name][idx].item() for name in GEOMETRY_FIELDS})
+            if self.stiffness is not None and not np.isnan(self.stiffness['nu'][idx]):
+                record.update(self.stiffness_parameters(idx))
+            start, stop = self.veh_offsets[idx], self.veh_offsets[idx + 1]
+            record.update({name: self.vehicles[name][start:stop].tolist() for name in VEHICLE_FIELDS})
+            record['veh_load_conc'] = [conc_values[conc_offsets[vehicle]:conc_offsets[vehicle + 1]].tolist()
+                                       for vehicle in range(start, stop)]
+            record['veh_load_conc_spacing'] = [spacing_values[spacing_offsets[vehicle]:spacing_offsets[vehicle + 1]].tolist()
+                                               for vehicle in range(start, stop)]
+            records.append(record)
+        return records
+
+    def write(self, path: str):
+        """
+        Write the inventory as a JSON Lines file, or as a Parquet file if path has the .parquet extension.
+        """
+        if str(path).endswith('.parquet'):
+            pa = import_optional('pyarrow', 'parquet')
+            pq = import_optional('pyarrow.parquet', 'parquet')
+            records = self.records()
+            names = ['id', *GEOMETRY_FIELDS, *STIFFNESS_FIELDS, *VEHICLE_FIELDS, *LOAD_FIELDS]
+            table = pa.Table.from_pylist([{name: record.get(name) for name in names} for record in records])
+            table = table.replace_schema_metadata({INVENTORY_FORMAT: str(INVENTORY_VERSION)})
+            pq.write_table(table, path)
+        else:
+            with open(path, 'w') as file:
+                file.write(json.dumps({'format': INVENTORY_FORMAT, 'version': INVENTORY_VERSION}) + '\n')
+                for record in self.records():
+                    file.write(json.dumps(record) + '\n')
+
+
+def read(path: str) -> Inventory:
+    """
+    Read an inventory from a JSON Lines file, or from a Parquet file if path has the .parquet extension.
+    See docs/inventory_format.md for the format.
+    """
+    if str(path).endswith('.parquet'):
+        return _read_parquet(path)
+    with open(path) as file:
+        lines = [line for line in file if line.strip()]
+    if not lines:
+        raise ValueError(f"Inventory file {path} is empty")
+    header = json.loads(lines[0])
+    _check_version(header.get('format'), header.get('version'))
+    return _from_records([json.loads(line) for line in lines[1:]])
+
+
+def _check_version(name, version):
+    if name != INVENTORY_FORMAT:
+        raise ValueError(f"File is not a {INVENTORY_FORMAT} file")
+    if version is None or int(version) > INVENTORY_VERSION:
+        raise ValueError(f"Inventory version {version} is not supported, the greatest supported version is {INVENTORY_VERSION}")
+
+
+def _stiffness_arrays(values: dict, n_decks: int):
+    # Arrays of the stiffness parameters, NaN for the decks without stiffness; None if no deck has stiffness
+    if all(values[name] is None or all(value is None for value in values[name]) for name in STIFFNESS_FIELDS):
+        return None
+    stiffness = {}
+    for name, width in [('E', 3), ('nu', None), ('I_l', 2), ('I_t', 2)]:
+        if width is None:
+            stiffness[name] = np.array([np.nan if value is None else value for value in values[name]], dtype=float)
+            continue
+        array = np.full((n_decks, width), np.nan)
+        for idx, value in enumerate(values[name]):
+            if value is not None:
+                array[idx, :len(value)] = value
+        stiffness[name] = array
+    return stiffness
+
+
+def _from_records(records: list[dict]) -> Inventory:
+    """
+    Build an inventory from the records of the decks, with the fields of the inventory format.
+    """
+    n_decks = len(records)
+    ids = np.array([str(record['id']) for record in records], dtype=object)
+    geometry = {}
+    for name, default in GEOMETRY_FIELDS.items():
+        if default is not None and not isinstance(default, (int, float)):
+            default = None
+        values = [record.get(name, default) for record in records]
+        if any(value is None for value in values):
+            raise ValueError(f"Field {name} is missing for some decks of the inventory")
+        geometry[name] = np.array(values, dtype=int if name in ['n_beams', 'n_diaph'] else float)
+    stiffness = _stiffness_arrays({name: [record.get(name) for record in records] for name in STIFFNESS_FIELDS}, n_decks)
+
+    counts = np.array([len(record['veh_width']) for record in records], dtype=int)
+    for name in VEHICLE_FIELDS + LOAD_FIELDS:
+        if any(len(record[name]) != count for record, count in zip(records, counts)):
+            raise ValueError(f"Field {name} must have one value for every vehicle of the deck")
+    vehicles = {name: np.fromiter(itertools.chain.from_iterable(record[name] for record in records), dtype=float)
+                for name in VEHICLE_FIELDS}
+    loads = {}
+    for name in LOAD_FIELDS:
+        lists = [values for record in records for values in record[name]]
+        offsets = np.concatenate([[0], np.cumsum([len(values) for values in lists], dtype=int)])
+        loads[name] = (offsets, np.fromiter(itertools.chain.from_iterable(lists), dtype=float, count=offsets[-1]))
+    veh_offsets = np.concatenate([[0], np.cumsum(counts)])
+    return Inventory(ids, geometry, stiffness, veh_offsets, vehicles, loads)
+
+
+def _list_column(column):
+    # Offsets and flat values of a list column of Arrow
+    column = column.combine_chunks()
+    offsets = np.asarray(column.offsets)
+    return offsets - offsets[0], column.flatten()
+
+
+def _read_parquet(path: str) -> Inventory:
+    pq = import_optional('pyarrow.parquet', 'parquet')
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    _check_version(INVENTORY_FORMAT if INVENTORY_FORMAT.encode() in metadata else None,
+                   metadata.get(INVENTORY_FORMAT.encode()))
+    n_decks = table.num_rows
+    names = set(table.column_names)
+
+    ids = np.array(table.column('id').to_pylist(), dtype=object)
+    geometry = {}
+    for name, default in GEOMETRY_FIELDS.items():
+        dtype = int if name in ['n_beams', 'n_diaph'] else float
+        if name in names:
+            geometry[name] = table.column(name).to_numpy().astype(dtype)
+        elif default is None:
+            raise ValueError(f"Field {name} is missing for some decks of the inventory")
+        else:
+            geometry[name] = np.full(n_decks, default, dtype=dtype)
+    stiffness = None
+    if 'nu' in names:
+        stiffness = _stiffness_arrays({name: table.column(name).to_pylist() for name in STIFFNESS_FIELDS}, n_decks)
+
+    #List columns are read as offsets and flat values, without Python objects
+    veh_offsets, _ = _list_column(table.column('veh_width'))
+    vehicles = {}
+    for name in VEHICLE_FIELDS:
+        offsets, values = _list_column(table.column(name))
+        if not np.array_equal(offsets, veh_offsets):
+            raise ValueError(f"Field {name} must have one value for every vehicle of the deck")
+        vehicles[name] = values.to_numpy(zero_copy_only=False).astype(float)
+    loads = {}
+    for name in LOAD_FIELDS:
+        deck_offsets, lists = _list_column(table.column(name))
+        if not np.array_equal(deck_offsets, veh_offsets):
+            raise ValueError(f"Field {name} must have one value for every vehicle of the deck")
+        offsets = np.asarray(lists.offsets)
+        loads[name] = (offsets - offsets[0], lists.flatten().to_numpy(zero_copy_only=False).astype(float))
+    return Inventory(ids, geometry, stiffness, veh_offsets, vehicles, loads)
@@ -0,0 +1,184 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class LanePlacement:
+    """
+    A data class to find the arrangement of vehicles in notional lanes that gives the maximum load on every beam,
+    e.g. for Load Model 1 of Eurocode EN 1991-2.
+
+    The carriageway is divided in int(cw_width / lane_width) notional lanes, the remaining area is left at one of the edges
+    or shared between them (n_shifts positions of the lanes). Every vehicle is centered in its own lane,
+    any lane can hold any vehicle and lanes can be left empty. A vehicle can also be left out of the carriageway,
+    when it relieves the beam. For every beam and position of the lanes the worst arrangement is solved exactly 
+    as a linear assignment problem, without enumerating the arrangements.
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    lane_width: width of notional lanes
+    veh_list: A list of pre-defined Vehicle objects, one for every loaded lane (e.g. [lane_1, lane_2, lane_3])
+    n_shifts: number of positions of the lanes, evenly spaced between the left and the right edge (2 as default)
+    """
+    cs: geom.Bridge_configuration
+    lane_width: float
+    veh_list: list[tl.Vehicle]
+    n_shifts: int = 2
+
+    def lane_ecc(self) -> np.ndarray:
+        """
+        Returns an array (n_shifts x n_lanes) with the eccentricity of the lane centerlines for every position of the lanes.
+        """
+        n_lanes = int(self.cs.cw_width // self.lane_width)
+        if n_lanes < len(self.veh_list):
+            raise ValueError(f"Carriageway has {n_lanes} notional lanes, not enough for {len(self.veh_list)} vehicles")
+        for vehicle in self.veh_list:
+            if vehicle.veh_width > self.lane_width:
+                raise ValueError(f"Vehicle width {vehicle.veh_width} is greater than lane width {self.lane_width}")
+        remaining = self.cs.cw_width - n_lanes * self.lane_width
+        shifts = np.linspace(0, remaining, self.n_shifts) if self.n_shifts > 1 else np.zeros(1)
+        return -self.cs.cw_width / 2 + shifts[:, None] + self.lane_width * (np.arange(n_lanes) + 0.5)
+
+    def courbon(self, load: str = 'conc', processes: int = None):
+        """
+        The function returns the worst arrangement of the vehicles for every beam, using the Courbon theory.
+
+        load: 'conc' to maximize the concentrated loads, 'dist' to maximize the distributed loads
+        processes: number of worker processes, every beam and position of the lanes is an independent task (None to use the current process)
+
+        Returns
+        -------
+        [max_load, max_ecc]
+
+        max_load: maximum load for i-th beam (resultant_conc or resultant_dist of courbon(), without rounding)
+        max_ecc: veh_ecc list of the arrangement giving the maximum load for i-th beam, None for the vehicles left out
+        """
+        return self._search(ld._share_function(self.cs, 'courbon'), load, processes)
+
+    def gmb(self,
+            E: list[float],
+            nu: float,
+            I_l: list[float],
+            I_t: list[float],
+            load: str = 'conc',
+            processes: int = None
+            ):
+        """
+        The function returns the worst arrangement of the vehicles for every beam, using the Guyon-Massonnet-Bares theory.
+        The load of i-th beam is obtained as k * load weight / n_beams.
+
+        E, nu, I_l, I_t: stiffness parameters, see LoadDistribution.gmb
+        load: 'conc' to maximize the concentrated loads, 'dist' to maximize the distributed loads
+        processes: number of worker processes, every beam and position of the lanes is an independent task (None to use the current process)
+
+        Returns
+        -------
+        [max_load, max_ecc]
+
+        max_load: maximum load for i-th beam
+        max_ecc: veh_ecc list of the arrangement giving the maximum load for i-th beam, None for the vehicles left out
+        """
+        stiffness = {'E': E, 'nu': nu, 'I_l': I_l, 'I_t': I_t}
+        return self._search(ld._share_function(self.cs, 'gmb', stiffness), load, processes)
+
+    def _values(self, coefficients, load: str) -> np.ndarray:
+        """
+        Returns an array (n_shifts x n_beams x n_vehicles x n_lanes) with the load of every beam
+        due to every vehicle placed in every lane.
+        """
+        lane_ecc = self.lane_ecc()
+        values = np.zeros((lane_ecc.shape[0], self.cs.n_beams, len(self.veh_list), lane_ecc.shape[1]))
+        for idx, vehicle in enumerate(self.veh_list):
+            if load == 'conc':
+                tl_config = tl.TL_configuration(veh_list=[vehicle], veh_ecc=[0.0])
+                weights = tl_config.conc_weights
+                offsets = tl_config.conc_ecc
+            elif load == 'dist':
+                weights = np.array([vehicle.veh_load_dist * vehicle.veh_width])
+                offsets = np.zeros(1)
+            else:
+                raise ValueError(f"Load type must be 'conc' or 'dist', not {load}")
+            # (n_shifts x n_lanes x n_loads x n_beams) coefficients for the loads of the vehicle
+            k = coefficients(lane_ecc[:, :, None] + offsets)
+            values[:, :, idx, :] = np.einsum('i,slib->sbl', weights, k)
+        return values
+
+    def _search(self, coefficients, load: str, processes: int):
+        values = self._values(coefficients, load)
+        lane_ecc = self.lane_ecc()
+        n_shifts, n_beams, n_veh, n_lanes = values.shape
+
+        tasks = [(shift, beam) for beam in range(n_beams) for shift in range(n_shifts)]
+        # A zero column for every vehicle: a vehicle assigned to it is left out of the carriageway
+        problems = [np.hstack([values[shift, beam], np.zeros((n_veh, n_veh))]) for shift, beam in tasks]
+        if processes is None:
+            solutions = list(map(_assignment, problems))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                solutions = list(executor.map(_assignment, problems, chunksize=max(1, len(tasks) // (4 * processes))))
+
+        max_load = [-np.inf] * n_beams
+        max_ecc = [None] * n_beams
+        for (shift, beam), (value, assignment) in zip(tasks, solutions):
+            if value > max_load[beam]:
+                max_load[beam] = value
+                max_ecc[beam] = [float(lane_ecc[shift, idx]) if idx < n_lanes else None for idx in assignment]
+        return max_load, max_ecc
+
+
+def _assignment(values: np.ndarray):
+    """
+    Maximize the sum of values[vehicle, lane] over the assignments of every vehicle to a different lane (n_vehicles <= n_lanes).
+    The load of a beam is the sum of the loads of the single vehicles, so the worst arrangement is a linear assignment problem,
+    solved exactly with the Hungarian algorithm in O(n_vehicles^2 x n_lanes) operations.
+
+    Returns
+    -------
+    [best_value, best_assignment]
+
+    best_value: maximum sum of values
+    best_assignment: tuple with the lane of every vehicle
+    """
+    n_veh, n_lanes = values.shape
+    cost = -np.asarray(values, dtype=float)
+    # Potentials of vehicles (u) and lanes (v), vehicle assigned to every lane (p), 1-based with 0 as dummy
+    u = np.zeros(n_veh + 1)
+    v = np.zeros(n_lanes + 1)
+    p = np.zeros(n_lanes + 1, dtype=int)
+    way = np.zeros(n_lanes + 1, dtype=int)
+    for veh in range(1, n_veh + 1):
+        p[0] = veh
+        j0 = 0
+        minv = np.full(n_lanes + 1, np.inf)
+        used = np.zeros(n_lanes + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0 != 0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = [0] * n_veh
+    for lane in range(1, n_lanes + 1):
+        if p[lane] != 0:
+            assignment[p[lane] - 1] = lane - 1
+    best_value = float(sum([values[veh, lane] for veh, lane in enumerate(assignment)]))
+    return best_value, tuple(assignment)
@@ -1,11 +1,38 @@
 from pyBridgeLD import geometry as geom
 from pyBridgeLD import traffic_load as tl
+from pyBridgeLD._rounding import round_builtin
+from pyBridgeLD._optional import import_optional
+from pyBridgeLD.profiling import instrumented
 from dataclasses import dataclass
-import pandas as pd
-import plotly.express as px
+import numpy as np
 
+import functools
 import math
 
+#Massonnet tables: initial and maximum number of intervals per side, relative interpolation tolerance, number of tables kept in memory
+GMB_TABLE_RESOLUTION = 64
+GMB_TABLE_MAX_RESOLUTION = 1024
+GMB_TABLE_TOLERANCE = 1e-3
+GMB_TABLE_CACHE_SIZE = 32
+
+#Fourier series of GMB theory: tolerance on the coefficients, maximum harmonic, maximum flexural parameter of a harmonic
+#(hyperbolic functions of the closed form overflow for greater values)
+GMB_SERIES_TOLERANCE = 1e-4
+GMB_SERIES_MAX_HARMONIC = 99
+GMB_SERIES_MAX_THETA = 60
+
+#GMB influence lines: absolute tolerance on k, minimum segment width relative to the half width b,
+#number of influence lines kept in memory
+GMB_INFLUENCE_TOLERANCE = 1e-6
+GMB_INFLUENCE_MIN_WIDTH = 1e-6
+GMB_INFLUENCE_CACHE_SIZE = 32
+
+#Number of cross sections whose Engesser system is kept in memory
+ENGESSER_CACHE_SIZE = 128
+
+#Names of the arrays returned by LoadDistribution.gmb_arrays(), used as keys of the disk cache
+GMB_ARRAYS = ('k_0_conc', 'k_1_conc', 'k_conc', 'k_0_dist', 'k_1_dist', 'k_dist')
+
 @dataclass
 class LoadDistribution:
     """
@@ -21,6 +48,9 @@ class LoadDistribution:
     - Guyon-Massonnet-Bares theory: 1) Real grillage may be considered with an infinite continuos matrix having mean values of flexural and torsional stiffness;
                                     2) Harmonic analysis can be performed in longitudinal direction, so that means that a simple supported scheme is considered.
 
+    - Grillage: 1) Beams and internal diaphragms are members with their own flexural and torsional stiffness;
+                2) Beams are simply supported, supports and diaphragms may be skewed.
+
     Parameters:
     cs: geometry.Bridge_configuration
     tl_config: tl.TL_configuration
@@ -28,6 +58,7 @@ class LoadDistribution:
     cs: geom.Bridge_configuration
     tl_config: tl.TL_configuration
 
+    @instrumented('load_distribution.courbon')
     def courbon(self):
         """
         The function returns a load distribution for every beam of the cross section, using the Courbon theory.
@@ -46,42 +77,42 @@ class LoadDistribution:
             raise ValueError(f"Number of internal diaphragms is less than 1, so Courbon theory cannot be used")
         else:
             # Calculate the polar inertia of the beams
-            dist_square = [] #outer acc
-            for distance in self.cs.beam_distance:
-                dist_square.append(distance ** 2)
-            polar_inertia = sum(dist_square)
+            beam_distance = self.cs.beam_distance
+            polar_inertia = self.cs.polar_inertia
+            load_conc, ecc_conc_list = self.tl_config.tl_conc()
+            load_dist, ecc_dist_list = self.tl_config.tl_dist()
 
             # Calculate the eccentricity of concentrated/distributed resultant load
             load_per_ecc_conc = [] # (load * eccentricity) for every concentrated loads
-            for idx, item in enumerate(self.tl_config.tl_conc()[0]):
-                product = self.tl_config.tl_conc()[0][idx] * self.tl_config.tl_conc()[1][idx]    
+            for idx, item in enumerate(load_conc):
+                product = load_conc[idx] * ecc_conc_list[idx]    
                 load_per_ecc_conc.append(product)
-            ecc_conc = sum(load_per_ecc_conc) / sum(self.tl_config.tl_conc()[0])
+            ecc_conc = sum(load_per_ecc_conc) / sum(load_conc)
             
             load_per_ecc_dist = [] # (load * eccentricity) for every distritubed loads
-            for idx, item in enumerate(self.tl_config.tl_dist()[0]):
-                product = self.tl_config.tl_dist()[0][idx] * self.tl_config.tl_dist()[1][idx]    
+            for idx, item in enumerate(load_dist):
+                product = load_dist[idx] * ecc_dist_list[idx]    
                 load_per_ecc_dist.append(product)
-            if item == 0:
+            if sum(load_dist) == 0:
                 ecc_dist = 0
             else: 
-                ecc_dist = sum(load_per_ecc_dist) / sum(self.tl_config.tl_dist()[0])
+                ecc_dist = sum(load_per_ecc_dist) / sum(load_dist)
             
             # Calculate the resultant forces/moments of concentrated/distributed definition for traffic_load      
-            resultant_conc_force = round(sum(self.tl_config.tl_conc()[0]), 2)
+            resultant_conc_force = round(sum(load_conc), 2)
             resultant_conc_moment = resultant_conc_force * ecc_conc
-            resultant_dist_force = sum(self.tl_config.tl_dist()[0])
+            resultant_dist_force = sum(load_dist)
             resultant_dist_moment = round(resultant_dist_force * ecc_dist, 2)
             resultant = [resultant_conc_force, resultant_conc_moment, resultant_dist_force, resultant_dist_moment]
 
             # Calculate the repartition coefficients
             ki_conc = []
-            for distance in self.cs.beam_distance:
+            for distance in beam_distance:
                 k_conc = round((1 / self.cs.n_beams ) + ecc_conc * distance / polar_inertia, 3)
                 ki_conc.append(k_conc)
 
             ki_dist = []
-            for distance in self.cs.beam_distance:
+            for distance in beam_distance:
                 k_dist = round((1 / self.cs.n_beams ) + ecc_dist * distance / polar_inertia, 3)
                 ki_dist.append(k_dist)
 
@@ -98,16 +129,37 @@ class LoadDistribution:
 
         return resultant, ki_conc , ki_dist, resultant_conc, resultant_dist
     
-    def courbon_plot(self):
+    def result(self, theory: str = 'courbon', **parameters):
+        """
+        The function returns the load distribution at full precision, as a results.DistributionResult with a single load case.
+        See LoadDistributionBatch.result().
+
+        theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+        parameters: parameters of the theory, e.g. E, nu, I_l, I_t for gmb() and grillage()
+        """
+        tl_batch = tl.TL_batch.from_configurations([self.tl_config])
+        return LoadDistributionBatch(cs=self.cs, tl_batch=tl_batch).result(theory, **parameters)
+
+    def courbon_plot(self, result = None):
         """
         Plot the results of the Corboun load distribution
 
+        Parameters
+        -------
+
+        result: precomputed result of courbon() or result('courbon'), to plot without computing it again (None as default)
+
         Returns
         -------
         None.
         """
+        import pandas as pd
+
+        px = import_optional('plotly.express', 'plot')
         distance = self.cs.beam_distance
-        ki_conc = self.courbon()[1]
+        if result is None:
+            result = self.courbon()
+        ki_conc = result.ki_conc[0] if hasattr(result, 'ki_conc') else result[1]
         d = { 'distance' : distance, 'k': ki_conc}
         df = pd.DataFrame(data=d)
         fig = px.bar(data_frame=df, x='distance', y='k',
@@ -115,86 +167,94 @@ class LoadDistribution:
         fig.update_traces(textfont_size=10, textangle=0, textposition='outside', cliponaxis=False)
         fig.show()
 
-    # def engesser(self):
-    #     """
-    #     The infinite number of diaphragms is removed, so the function takes n_diaph and beam_length and returns a load distribution.
-        
-    #     n_diaph: Number of internal diaphragms positioned in beam length
-
-    #     Returns
-    #     -------
-
-    #     resultant: a list of total vertical reaction force and moment for concentrated and distributed loads
-
-    #     """
-    #     if self.cs.n_diaph == 0:
-    #         raise ValueError(f"Number of internal diaphragms is less than 1, so Engesser theory cannot be used")
-    #     elif self.cs.n_diaph > 3:
-    #         raise ValueError(f"Number of internal diaphragms is greater than 3, not currently supported. Use Courbon theory!")
-    #     else:
-    #         # Calculate the polar inertia of the beams
-    #         dist_square = [] #outer acc
-    #         for distance in self.cs.beam_distance:
-    #             dist_square.append(distance ** 2)
-    #         polar_inertia = sum(dist_square)
-
-    #         # Calculate the eccentricity of concentrated/distributed resultant load
-    #         load_per_ecc_conc = [] # (load * eccentricity) for every concentrated loads
-    #         for idx, item in enumerate(self.tl_config.tl_conc()[0]):
-    #             product = self.tl_config.tl_conc()[0][idx] * self.tl_config.tl_conc()[1][idx]    
-    #             load_per_ecc_conc.append(product)
-    #         ecc_conc = sum(load_per_ecc_conc) / sum(self.tl_config.tl_conc()[0])
-            
-    #         load_per_ecc_dist = [] # (load * eccentricity) for every distritubed loads
-    #         for idx, item in enumerate(self.tl_config.tl_dist()[0]):
-    #             product = self.tl_config.tl_dist()[0][idx] * self.tl_config.tl_dist()[1][idx]    
-    #             load_per_ecc_dist.append(product)
-    #         ecc_dist = sum(load_per_ecc_dist) / sum(self.tl_config.tl_dist()[0])
-            
-    #         # Calculate the resultant forces/moments of concentrated/distributed definition for traffic_load      
-    #         resultant_conc_force = round(sum(self.tl_config.tl_conc()[0]), 2)
-    #         resultant_conc_moment = resultant_conc_force * ecc_conc
-    #         resultant_dist_force = sum(self.tl_config.tl_dist()[0])
-    #         resultant_dist_moment = round(resultant_dist_force * ecc_dist, 2)
-    #         resultant = [resultant_conc_force, resultant_conc_moment, resultant_dist_force, resultant_dist_moment]
+    def engesser(self):
+        """
+        The function returns a load distribution for every beam of the cross section, using the Engesser theory.
+
+        The infinite number of diaphragms of Courbon theory is replaced by n_diaph (1 to 3) rigid internal diaphragms, 
+        spaced diaph_spacing (beam_length/(n_diaph+1) if 0) and symmetric about midspan. Loads act at midspan and are 
+        shared between adjacent beams with the lever rule; the repartition coefficient of a beam is the ratio between 
+        its midspan bending moment and the midspan moment of the whole load.
+        The compatibility system depends only on the geometry, so it is solved once for every cross section.
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        Same definitions of courbon().
+        """
+        tl_batch = tl.TL_batch.from_configurations([self.tl_config])
+        results = LoadDistributionBatch(cs=self.cs, tl_batch=tl_batch).engesser()
+        return tuple(result[0].tolist() for result in results)
+
+
+    @instrumented('load_distribution.gmb_arrays')
+    def gmb_arrays(self, 
+                   E: list[float],
+                   nu: float, 
+                   I_l: list[float], 
+                   I_t: list[float],
+                   table: bool = False,
+                   cache = None
+                   ):
+        """
+        The function returns the Guyon-Massonnet-Bares coefficients as arrays, with one row for every load and one column for every beam.
+        Concentrated and distributed loads are evaluated together in a single call of the vectorized kernel.
 
-    #         # Calculate the repartition coefficients as per Courbon theory
-    #         ki_conc = []
-    #         for distance in self.cs.beam_distance:
-    #             k_conc = round((1 / self.cs.n_beams ) + ecc_conc * distance / polar_inertia, 3)
-    #             ki_conc.append(k_conc)
+        With table=True k_0 and k_1 are interpolated on precomputed Massonnet tables, built once for every value of theta
+        and kept in memory (GMB_TABLE_CACHE_SIZE tables at most, least recently used are discarded).
 
-    #         ki_dist = []
-    #         for distance in self.cs.beam_distance:
-    #             k_dist = round((1 / self.cs.n_beams ) + ecc_dist * distance / polar_inertia, 3)
-    #             ki_dist.append(k_dist)
+        With a cache the coefficients are stored on disk, with a key given by the hash of the cross section, 
+        the traffic load configuration and the stiffness parameters, and read back by later calls and sessions.
 
-    #         # Calculate the load per beam after the load distribution
-    #         resultant_conc = []
-    #         for k in ki_conc:
-    #             r_conc = round(k * resultant_conc_force, 2)
-    #             resultant_conc.append(r_conc)
+        Parameters
+        -------
 
-    #         resultant_dist = []
-    #         for k in ki_dist:
-    #             r_dist = round(k * resultant_dist_force, 2)
-    #             resultant_dist.append(r_dist)
+        E: Elasticity modulusus of beams, diaphragms and slab [E_beams, E_diaphragms, E_slab]
+        nu: Poisson modulus
+        I_l: Inertia of sections [I_l_beams, I_l_diaphragms]
+        I_t: Torsional inertia of sections [I_t_beams, I_t_diaphragms]
+        table: use the precomputed Massonnet tables instead of the closed form (False as default)
+        cache: cache.DiskCache or path of a cache directory (None as default, no cache)
 
+        Returns
+        -------
+        [k_0_conc, k_1_conc, k_conc, k_0_dist, k_1_dist, k_dist]
 
-    #         # if self.cs.n_diaph == 1:
+        k_0_conc, k_1_conc, k_conc: arrays (n_conc x n_beams) of k_0, k_1 and k coefficients for concentrated loads
+        k_0_dist, k_1_dist, k_dist: arrays (n_dist x n_beams) of k_0, k_1 and k coefficients for distributed loads
+        """
+        if cache is not None:
+            from pyBridgeLD import cache as ch
 
-    #         # elif self.cs.n_diaph == 2:
+            disk_cache = cache if isinstance(cache, ch.DiskCache) else ch.DiskCache(cache)
+            key = ch.cache_key('gmb', self.cs, self.tl_config, E, nu, I_l, I_t, table)
+            arrays = disk_cache.get(key)
+            if arrays is None:
+                arrays = dict(zip(GMB_ARRAYS, self.gmb_arrays(E, nu, I_l, I_t, table)))
+                disk_cache.put(key, arrays)
+            return tuple(arrays[name] for name in GMB_ARRAYS)
 
-    #         # elif self.cs.n_diaph == 3:       
+        b, lambd, theta, alpha = _gmb_parameters(self.cs, E, nu, I_l, I_t)
 
-    #     return None
+        n_conc = len(self.tl_config.conc_weights)
+        e = np.concatenate([self.tl_config.conc_ecc, self.tl_config.dist_ecc])
+        y = self.cs.beam_offsets
 
+        if table:
+            k_0, k_1, k = _gmb_table_lookup(e[:, None], y[None, :], b, lambd, theta, alpha)
+        else:
+            k_0, k_1, k = _gmb_kernel(e[:, None], y[None, :], b, lambd, theta, alpha)
+        return k_0[:n_conc], k_1[:n_conc], k[:n_conc], k_0[n_conc:], k_1[n_conc:], k[n_conc:]
 
+    @instrumented('load_distribution.gmb')
     def gmb(self, 
             E: list[float],
             nu: float, 
             I_l: list[float], 
-            I_t: list[float]
+            I_t: list[float],
+            table: bool = False,
+            cache = None
             ):
         """
         Parameters
@@ -204,170 +264,797 @@ class LoadDistribution:
         nu: Poisson modulus
         I_l: Inertia of sections [I_l_beams, I_l_diaphragms]
         I_t: Torsional inertia of sections [I_t_beams, I_t_diaphragms]
+        table: use the precomputed Massonnet tables instead of the closed form (False as default)
+        cache: cache.DiskCache or path of a cache directory, see gmb_arrays() (None as default, no cache)
 
         Returns
         -------
 
-        k_dist: dictionary containing the repartition coefficient for all the beams, for every distributed load
-        k_conc: dictionary containing the repartition coefficient for all the beams, for every concentrated load
+        df_t: dataframe containing the repartition coefficient k for all the beams (columns), 
+              for every concentrated load (conc_load_i rows) and every distributed load (dist_load_i rows)
 
         """
-        b = self.cs.cw_width / 2
-        l = self.cs.beam_length
-        b_1 = self.cs.beam_spacing
-        l_1 = self.cs.diaph_spacing
-
-        G_beam = E[0] / (2*(1+nu))
-        G_diaph = E[1] / (2*(1+nu))  
-
-        #Flexural stiffness per unit
-        rho_p = E[0] * I_l[0]  / b_1         
-        rho_e = E[1] * I_l[1]  / l_1   
-
-        #Torsional stiffness per unit
-        gamma_p = G_beam * I_t[0]  / b_1      
-        gamma_e = G_diaph * I_t[1]  / l_1  
-
-        #Flexural parameter     
-        theta = (b / l) * (rho_p / rho_e)**(1/4)
-        
-        #Torsional parameter
-        alpha = (gamma_p + gamma_e) / (2 * (rho_p * rho_e)**(1/2))
-
-        #Calculation of k_0, k_1 and k parameters for concentrated loads
-        k_0_conc = {}
-        k_1_conc = {}
-        k_conc = {}
-        for idx, load_conc in enumerate(self.tl_config.tl_conc()[0]):
-            e_i = self.tl_config.tl_conc()[1][idx]
-
-            k_0_conc_int = []
-            k_1_conc_int = []
-            k_conc_int = [] 
-            for distance in self.cs.beam_distance:
-                y_i = distance #i-th beam
-                if e_i<=y_i:
-                    y_i = -distance
-                    e_i = -e_i
-
-                #Calculation of k_0
-                lambd = (math.pi / (self.cs.beam_length * math.sqrt(2))) * (rho_p / rho_e)**(1/4)
-
-                a_low = 2 * math.cosh(lambd*(y_i+b)) * math.cos(lambd*(y_i+b))
-                a_upp = math.sinh(2*lambd*b) * math.cos(lambd*(b+e_i)) * math.cosh(lambd*(b-e_i)) - math.sin(2*lambd*b) * math.cosh(lambd*(b + e_i)) * math.cos(lambd* (b-e_i))
-                b_low = math.cosh(lambd*(y_i+b)) * math.sin(lambd*(y_i + b)) + math.sinh(lambd * (y_i + b)) * math.cos(lambd*(y_i+b))
-                b_upp_1 =  math.sinh(2*lambd*b)*(math.sin(lambd*(b+e_i))*math.cosh(lambd*(b-e_i)) - math.cos(lambd*(b+e_i))*math.sinh(lambd*(b-e_i)))
-                b_upp_2 =  math.sin(2*lambd*b)*(math.sinh(lambd*(b+e_i))*math.cos(lambd*(b-e_i)) - math.cosh(lambd*(b+e_i))*math.sin(lambd*(b-e_i)))
-
-                k_0_conc_i = 2 * lambd * b * (a_low * a_upp + b_low * (b_upp_1+b_upp_2)) / (math.sinh(2*lambd*b)**2 - math.sin(2*lambd*b)**2)
-            
-                #Calculation of k_1
-                psi = math.pi * e_i / b 
-                beta = math.pi * y_i / b
-                sigma = theta * math.pi
-                csi = math.pi - abs(beta - psi)
-
-                r_psi = math.cosh(theta * psi) * (sigma*math.cosh(sigma) - math.sinh(sigma)) - theta * psi * math.sinh(sigma) * math.sinh(theta*psi)
-                r_beta = math.cosh(theta * beta) * (sigma*math.cosh(sigma) - math.sinh(sigma)) - theta * beta * math.sinh(sigma) * math.sinh(theta*beta)
-
-                q_psi = math.sinh(theta * psi) * (2*math.sinh(sigma) - sigma*math.cosh(sigma)) - theta * psi * math.sinh(sigma) * math.cosh(theta*psi)
-                q_beta = math.sinh(theta * beta) * (2*math.sinh(sigma) - sigma*math.cosh(sigma)) - theta * beta * math.sinh(sigma) * math.cosh(theta*beta)
-
-                c = math.cosh(theta * csi) * (sigma * math.cosh(sigma) + math.sinh(sigma))
-                d = theta*csi*math.sinh(sigma)*math.sinh(theta*csi)
-                e = r_beta*r_psi / (3*math.sinh(sigma)*math.cosh(sigma)-sigma)
-                f = q_beta*q_psi / (3*math.sinh(sigma)*math.cosh(sigma)+sigma)
-
-                k_1_conc_i = sigma * (c - d + e + f) / (2*(math.sinh(sigma))**2)
-
-                #Calculation of k for GMB theory
-                k_conc_i = k_0_conc_i + (k_1_conc_i - k_0_conc_i) * alpha**(1/2)
-                k_0_conc_int.append(k_0_conc_i)
-                k_1_conc_int.append(k_1_conc_i)
-                k_conc_int.append(k_conc_i)
-
-            k_0_conc[f'dist_load_{idx+1}'] = k_0_conc_int
-            k_1_conc[f'dist_load_{idx+1}'] = k_1_conc_int
-            k_conc[f'dist_load_{idx+1}'] = k_conc_int
-
-        #Calculation of k_0, k_1 and k parameters for distributed loads
-        k_0_dist = {}
-        k_1_dist = {}
-        k_dist = {} 
-        for idx, load_dist in enumerate(self.tl_config.tl_dist()[0]):
-            e_i = self.tl_config.tl_dist()[1][idx]
-            
-            k_0_dist_int = []
-            k_1_dist_int = []
-            k_dist_int = []
-            for distance in self.cs.beam_distance:
-                y_i = distance #i-th beam
-                if e_i<=y_i:
-                    y_i = -distance
-                    e_i = -e_i
-
-                #Calculation of k_0
-                lambd = (math.pi / (self.cs.beam_length * math.sqrt(2))) * (rho_p / rho_e)**(1/4)
-
-                a_low = 2 * math.cosh(lambd*(y_i+b)) * math.cos(lambd*(y_i+b))
-                a_upp = math.sinh(2*lambd*b) * math.cos(lambd*(b+e_i)) * math.cosh(lambd*(b-e_i)) - math.sin(2*lambd*b) * math.cosh(lambd*(b + e_i)) * math.cos(lambd* (b-e_i))
-                b_low = math.cosh(lambd*(y_i+b)) * math.sin(lambd*(y_i + b)) + math.sinh(lambd * (y_i + b)) * math.cos(lambd*(y_i+b))
-                b_upp_1 =  math.sinh(2*lambd*b)*(math.sin(lambd*(b+e_i))*math.cosh(lambd*(b-e_i)) - math.cos(lambd*(b+e_i))*math.sinh(lambd*(b-e_i)))
-                b_upp_2 =  math.sin(2*lambd*b)*(math.sinh(lambd*(b+e_i))*math.cos(lambd*(b-e_i)) - math.cosh(lambd*(b+e_i))*math.sin(lambd*(b-e_i)))
-
-                k_0_dist_i = 2 * lambd * b * (a_low * a_upp + b_low * (b_upp_1+b_upp_2)) / (math.sinh(2*lambd*b)**2 - math.sin(2*lambd*b)**2)
-            
-                #Calculation of k_1
-                psi = math.pi * e_i / b 
-                beta = math.pi * y_i / b
-                sigma = theta * math.pi
-                csi = math.pi - abs(beta - psi)
-
-                r_psi = math.cosh(theta * psi) * (sigma*math.cosh(sigma) - math.sinh(sigma)) - theta * psi * math.sinh(sigma) * math.sinh(theta*psi)
-                r_beta = math.cosh(theta * beta) * (sigma*math.cosh(sigma) - math.sinh(sigma)) - theta * beta * math.sinh(sigma) * math.sinh(theta*beta)
-
-                q_psi = math.sinh(theta * psi) * (2*math.sinh(sigma) - sigma*math.cosh(sigma)) - theta * psi * math.sinh(sigma) * math.cosh(theta*psi)
-                q_beta = math.sinh(theta * beta) * (2*math.sinh(sigma) - sigma*math.cosh(sigma)) - theta * beta * math.sinh(sigma) * math.cosh(theta*beta)
-
-                c = math.cosh(theta * csi) * (sigma * math.cosh(sigma) + math.sinh(sigma))
-                d = theta*csi*math.sinh(sigma)*math.sinh(theta*csi)
-                e = r_beta*r_psi / (3*math.sinh(sigma)*math.cosh(sigma)-sigma)
-                f = q_beta*q_psi / (3*math.sinh(sigma)*math.cosh(sigma)+sigma)
-
-                k_1_dist_i = sigma * (c - d + e + f) / (2*(math.sinh(sigma))**2)
-
-                #Calculation of k for GMB theory
-                k_dist_i = k_0_dist_i + (k_1_dist_i - k_0_dist_i) * alpha**(1/2)
-                k_0_dist_int.append(k_0_dist_i)
-                k_1_dist_int.append(k_1_dist_i)
-                k_dist_int.append(k_dist_i)
-
-            k_0_dist[f'conc_load_{idx+1}'] = k_0_dist_int
-            k_1_dist[f'conc_load_{idx+1}'] = k_1_dist_int
-            k_dist[f'conc_load_{idx+1}'] = k_dist_int
-
-        #Create the dataframe to visualize the repartition coefficient for every single load
-        df_conc = pd.DataFrame(data=k_conc)
-        df_dist = pd.DataFrame(data=k_dist)
-        df = df_conc.join(df_dist)
-        df.index= df.index + 1
-        df_t = df.transpose()
+        k_conc, k_dist = self.gmb_arrays(E, nu, I_l, I_t, table, cache)[2::3]
+        return _gmb_dataframe(k_conc, k_dist)
+
+    def gmb_series(self,
+                   E: list[float],
+                   nu: float,
+                   I_l: list[float],
+                   I_t: list[float],
+                   tolerance: float = GMB_SERIES_TOLERANCE,
+                   max_harmonic: int = GMB_SERIES_MAX_HARMONIC
+                   ):
+        """
+        The function returns the Guyon-Massonnet-Bares coefficients k summing the harmonics of the longitudinal load,
+        instead of the first harmonic only of gmb().
+
+        Loads act at midspan and the coefficients are referred to the midspan deflection: the m-th harmonic (odd m only) 
+        has flexural parameter m * theta and weight 1/m^4 for concentrated loads, (-1)^((m-1)/2)/m^5 for distributed loads 
+        (uniform along the span, so that the series of the weights gives the exact midspan deflection 5qL^4/384EI). 
+        Every harmonic is evaluated for all the loads and beams in a single call of the kernel, and the series stops 
+        when the last harmonic changes every coefficient less than tolerance.
+
+        Parameters
+        -------
+
+        E, nu, I_l, I_t: see gmb()
+        tolerance: maximum change of the coefficients due to the last harmonic (GMB_SERIES_TOLERANCE as default)
+        max_harmonic: maximum harmonic of the series (GMB_SERIES_MAX_HARMONIC as default)
+
+        Returns
+        -------
+
+        df_t: dataframe of gmb(), the last harmonic of the series is stored in df_t.attrs['harmonic']
+        """
+        b, lambd, theta, alpha = _gmb_parameters(self.cs, E, nu, I_l, I_t)
+        e = np.concatenate([self.tl_config.conc_ecc, self.tl_config.dist_ecc])
+        n_conc = len(self.tl_config.conc_weights)
+        k, harmonic = _gmb_series(e, self.cs.beam_offsets, np.arange(len(e)) < n_conc,
+                                  b, lambd, theta, alpha, tolerance, max_harmonic)
+        df_t = _gmb_dataframe(k[:n_conc], k[n_conc:])
+        df_t.attrs['harmonic'] = harmonic
         return df_t
 
-    def gmb_plot(self):
+    def grillage(self,
+                 E: list[float],
+                 nu: float,
+                 I_l: list[float],
+                 I_t: list[float],
+                 n_elements: int = 20,
+                 skew: float = 0
+                 ):
         """
-        Plot the results of the Guyon-Massonnet-Bares load distribution
+        The function returns a load distribution for every beam of the cross section, using a grillage model of the deck.
+
+        Beams and internal diaphragms (n_diaph, see Bridge_configuration.diaph_position) are members of a sparse grillage
+        with the stiffness parameters of gmb(). Loads act at midspan and are shared between adjacent beams with the lever rule;
+        the repartition coefficient of a beam is its share of the sum of the midspan deflections of all the beams.
+        The stiffness matrix is factorized once for every model and the unit loads on the beams are solved together,
+        so every load of tl_conc()/tl_dist() is a combination of the same solutions.
+
+        Parameters
+        -------
+
+        E: Elasticity modulusus of beams and diaphragms [E_beams, E_diaphragms]
+        nu: Poisson modulus
+        I_l: Inertia of sections [I_l_beams, I_l_diaphragms]
+        I_t: Torsional inertia of sections [I_t_beams, I_t_diaphragms]
+        n_elements: number of members of every beam between the supports (20 as default)
+        skew: skew angle of supports and diaphragms in degrees (0 as default)
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        Same definitions of courbon().
+        """
+        tl_batch = tl.TL_batch.from_configurations([self.tl_config])
+        results = LoadDistributionBatch(cs=self.cs, tl_batch=tl_batch).grillage(E, nu, I_l, I_t, n_elements, skew)
+        return tuple(result[0].tolist() for result in results)
+
+    def gmb_plot(self,
+                 E: list[float] = None,
+                 nu: float = None,
+                 I_l: list[float] = None,
+                 I_t: list[float] = None,
+                 df = None
+                 ):
+        """
+        Plot the results of the Guyon-Massonnet-Bares load distribution, the coefficient k of every load for every beam
+
+        Parameters
+        -------
+
+        E, nu, I_l, I_t: stiffness parameters, see gmb()
+        df: precomputed dataframe of gmb() or gmb_series(), to plot without computing it again (None as default)
 
         Returns
         -------
         None.
         """
-        distance = self.cs.beam_distance
-        # ki_conc = self.courbon()[1]
-        # d = { 'distance' : distance, 'k': ki_conc}
-        df = self.gmb
-        fig = px.line(data_frame=df)
-        # , x='distance', y='k',
-        #              color='k', color_continuous_scale='Sunsetdark', opacity=0.7, text_auto='.3f')
-        # fig.update_traces(textfont_size=10, textangle=0, textposition='outside', cliponaxis=False)
-        fig.show()
\ No newline at end of file
+        from pyBridgeLD import plotting
+
+        if df is None:
+            if E is None or nu is None or I_l is None or I_t is None:
+                raise ValueError(f"Stiffness parameters E, nu, I_l, I_t or a precomputed dataframe are needed for GMB plot")
+            df = self.gmb(E, nu, I_l, I_t)
+        fig = plotting.coefficient_figure(df, cs=self.cs)
+        fig.show()
+
+def _gmb_parameters(cs: geom.Bridge_configuration, E: list[float], nu: float, I_l: list[float], I_t: list[float]):
+    """
+    Returns the half width b, the wave parameter lambda, the flexural parameter theta and the torsional parameter alpha
+    of the Guyon-Massonnet-Bares theory.
+    """
+    b = cs.cw_width / 2
+    l = cs.beam_length
+    b_1 = cs.beam_spacing
+    l_1 = cs.diaph_spacing
+
+    G_beam = E[0] / (2*(1+nu))
+    G_diaph = E[1] / (2*(1+nu))  
+
+    #Flexural stiffness per unit
+    rho_p = E[0] * I_l[0]  / b_1         
+    rho_e = E[1] * I_l[1]  / l_1   
+
+    #Torsional stiffness per unit
+    gamma_p = G_beam * I_t[0]  / b_1      
+    gamma_e = G_diaph * I_t[1]  / l_1  
+
+    #Flexural parameter     
+    theta = (b / l) * (rho_p / rho_e)**(1/4)
+    
+    #Torsional parameter
+    alpha = (gamma_p + gamma_e) / (2 * (rho_p * rho_e)**(1/2))
+
+    lambd = (math.pi / (l * math.sqrt(2))) * (rho_p / rho_e)**(1/4)
+    return b, lambd, theta, alpha
+
+
+@instrumented('load_distribution.gmb_dataframe')
+def _gmb_dataframe(k_conc: np.ndarray, k_dist: np.ndarray):
+    """
+    Returns the dataframe of LoadDistribution.gmb(), with the k coefficients of every concentrated and distributed load (rows)
+    for every beam (columns).
+    """
+    import pandas as pd
+
+    #Create the dataframe to visualize the repartition coefficient for every single load
+    index = [f'conc_load_{idx+1}' for idx in range(len(k_conc))] + [f'dist_load_{idx+1}' for idx in range(len(k_dist))]
+    df_t = pd.DataFrame(data=np.vstack([k_conc, k_dist]), index=index, columns=range(1, k_conc.shape[1] + 1))
+    return df_t
+
+
+@instrumented('load_distribution.gmb_kernel')
+def _gmb_kernel(e, y, b: float, lambd: float, theta: float, alpha: float):
+    """
+    Vectorized Guyon-Massonnet-Bares kernel. Load eccentricities e and beam distances y are broadcast against each other,
+    e.g. e with shape (n_loads x 1) and y with shape (1 x n_beams) return (n_loads x n_beams) arrays.
+
+    Returns
+    -------
+    [k_0, k_1, k]
+
+    k_0: coefficients for a grillage without torsional stiffness (alpha = 0)
+    k_1: coefficients for a grillage with full torsional stiffness (alpha = 1)
+    k: coefficients for the torsional parameter alpha
+    """
+    e, y = np.broadcast_arrays(np.asarray(e, dtype=float), np.asarray(y, dtype=float))
+
+    # Closed forms hold for e > y, the other pairs are evaluated on the symmetric deck
+    flip = e <= y
+    e_i = np.where(flip, -e, e)
+    y_i = np.where(flip, -y, y)
+
+    # Terms shared by every (load, beam) pair
+    sinh_2lb = math.sinh(2*lambd*b)
+    sin_2lb = math.sin(2*lambd*b)
+    sigma = theta * math.pi
+    sinh_s = math.sinh(sigma)
+    cosh_s = math.cosh(sigma)
+    den_e = 3*sinh_s*cosh_s - sigma
+    den_f = 3*sinh_s*cosh_s + sigma
+
+    #Calculation of k_0
+    l_yb = lambd * (y_i + b)
+    l_be_p = lambd * (b + e_i)
+    l_be_m = lambd * (b - e_i)
+    cosh_yb, cos_yb = np.cosh(l_yb), np.cos(l_yb)
+    cosh_p, cos_p, sinh_p, sin_p = np.cosh(l_be_p), np.cos(l_be_p), np.sinh(l_be_p), np.sin(l_be_p)
+    cosh_m, cos_m, sinh_m, sin_m = np.cosh(l_be_m), np.cos(l_be_m), np.sinh(l_be_m), np.sin(l_be_m)
+
+    a_low = 2 * cosh_yb * cos_yb
+    a_upp = sinh_2lb * cos_p * cosh_m - sin_2lb * cosh_p * cos_m
+    b_low = cosh_yb * np.sin(l_yb) + np.sinh(l_yb) * cos_yb
+    b_upp_1 = sinh_2lb * (sin_p * cosh_m - cos_p * sinh_m)
+    b_upp_2 = sin_2lb * (sinh_p * cos_m - cosh_p * sin_m)
+
+    k_0 = 2 * lambd * b * (a_low * a_upp + b_low * (b_upp_1 + b_upp_2)) / (sinh_2lb**2 - sin_2lb**2)
+
+    #Calculation of k_1
+    psi = math.pi * e_i / b 
+    beta = math.pi * y_i / b
+    csi = math.pi - np.abs(beta - psi)
+
+    r_psi = np.cosh(theta * psi) * (sigma*cosh_s - sinh_s) - theta * psi * sinh_s * np.sinh(theta*psi)
+    r_beta = np.cosh(theta * beta) * (sigma*cosh_s - sinh_s) - theta * beta * sinh_s * np.sinh(theta*beta)
+
+    q_psi = np.sinh(theta * psi) * (2*sinh_s - sigma*cosh_s) - theta * psi * sinh_s * np.cosh(theta*psi)
+    q_beta = np.sinh(theta * beta) * (2*sinh_s - sigma*cosh_s) - theta * beta * sinh_s * np.cosh(theta*beta)
+
+    c = np.cosh(theta * csi) * (sigma * cosh_s + sinh_s)
+    d = theta * csi * sinh_s * np.sinh(theta*csi)
+    e = r_beta * r_psi / den_e
+    f = q_beta * q_psi / den_f
+
+    k_1 = sigma * (c - d + e + f) / (2 * sinh_s**2)
+
+    #Calculation of k for GMB theory
+    k = k_0 + (k_1 - k_0) * alpha**(1/2)
+    return k_0, k_1, k
+
+
+@instrumented('load_distribution.gmb_series')
+def _gmb_series(e, y, concentrated, b: float, lambd: float, theta: float, alpha: float,
+                tolerance: float = GMB_SERIES_TOLERANCE, max_harmonic: int = GMB_SERIES_MAX_HARMONIC):
+    """
+    Fourier series of the Guyon-Massonnet-Bares coefficient k at midspan, for loads at midspan.
+    e: array of load eccentricities, concentrated: boolean array (True for concentrated loads, False for distributed loads)
+    y: array of beam distances
+
+    Returns
+    -------
+    [k, harmonic]
+
+    k: array (n_loads x n_beams) of k coefficients
+    harmonic: last harmonic of the series
+    """
+    e = np.asarray(e, dtype=float)[:, None]
+    y = np.asarray(y, dtype=float)[None, :]
+    concentrated = np.asarray(concentrated)[:, None]
+    power = np.where(concentrated, 4, 5)
+
+    total = np.zeros((e.shape[0], y.shape[1]))
+    weight_sum = np.zeros((e.shape[0], 1))
+    harmonic = 1
+    for m in range(1, max_harmonic + 1, 2):
+        if m > 1 and m * theta > GMB_SERIES_MAX_THETA:
+            break
+        # Midspan deflection of the m-th harmonic: 1/m^4 for concentrated loads, sin(m pi/2)/m^5 for distributed loads
+        weight = np.where(concentrated, 1.0, (-1.0)**((m - 1) // 2)) / m**power
+        k_m = _gmb_kernel(e, y, b, m * lambd, m * theta, alpha)[2]
+        total += weight * k_m
+        weight_sum += weight
+        harmonic = m
+        if m > 1 and np.max(np.abs(weight * (k_m - total / weight_sum)) / np.abs(weight_sum)) < tolerance:
+            break
+    return total / weight_sum, harmonic
+
+
+@functools.lru_cache(maxsize=GMB_TABLE_CACHE_SIZE)
+@instrumented('load_distribution.massonnet_table')
+def _massonnet_table(theta: float):
+    """
+    Returns the Massonnet tables of k_0 and k_1 for the flexural parameter theta, as square arrays sampled
+    on a regular grid of e/b (rows) and y/b (columns), both going from -1 to +1.
+
+    The grid is refined until the interpolation error, checked at the centroid of every triangle of the grid,
+    is lower than half GMB_TABLE_TOLERANCE times the greatest coefficient of the table.
+    """
+    resolution = GMB_TABLE_RESOLUTION
+    while True:
+        u = np.linspace(-1, 1, resolution + 1)
+        k_0, k_1, _ = _gmb_kernel(u[:, None], u[None, :], 1.0, math.pi * theta / math.sqrt(2), theta, 0.0)
+
+        step = 2 / resolution
+        error = 0.0
+        for s, t in [(1/3, 2/3), (2/3, 1/3)]:
+            u_c = (u[:-1] + s * step)[:, None]
+            v_c = (u[:-1] + t * step)[None, :]
+            k_0_c, k_1_c, _ = _gmb_kernel(u_c, v_c, 1.0, math.pi * theta / math.sqrt(2), theta, 0.0)
+            error = max(error,
+                        np.abs(_interpolate_table(k_0, *np.broadcast_arrays(u_c, v_c)) - k_0_c).max() / np.abs(k_0).max(),
+                        np.abs(_interpolate_table(k_1, *np.broadcast_arrays(u_c, v_c)) - k_1_c).max() / np.abs(k_1).max())
+        if 2 * error <= GMB_TABLE_TOLERANCE or resolution >= GMB_TABLE_MAX_RESOLUTION:
+            break
+        resolution = resolution * 2
+
+    k_0.setflags(write=False)
+    k_1.setflags(write=False)
+    return k_0, k_1
+
+
+def _interpolate_table(values: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Linear interpolation of a Massonnet table at e/b = u and y/b = v.
+    Every grid cell is split in two triangles along the e = y direction, where the coefficients have a kink,
+    so that the interpolation error decreases with the square of the grid step.
+    """
+    resolution = values.shape[0] - 1
+    s = (u + 1) * resolution / 2
+    t = (v + 1) * resolution / 2
+    i = np.clip(np.floor(s).astype(int), 0, resolution - 1)
+    j = np.clip(np.floor(t).astype(int), 0, resolution - 1)
+    s = s - i
+    t = t - j
+    idx = i * (resolution + 1) + j
+    corner = np.where(s >= t, idx + resolution + 1, idx + 1)
+    flat = values.ravel()
+    return ((1 - np.maximum(s, t)) * flat[idx]
+            + np.abs(s - t) * flat[corner]
+            + np.minimum(s, t) * flat[idx + resolution + 2])
+
+
+@instrumented('load_distribution.gmb_table_lookup')
+def _gmb_table_lookup(e, y, b: float, lambd: float, theta: float, alpha: float):
+    """
+    Same as _gmb_kernel, with k_0 and k_1 interpolated on the Massonnet tables of theta.
+    Loads or beams outside the carriageway are evaluated with the closed form.
+    """
+    e, y = np.broadcast_arrays(np.asarray(e, dtype=float), np.asarray(y, dtype=float))
+    k_0_table, k_1_table = _massonnet_table(theta)
+    u = e / b
+    v = y / b
+    k_0 = _interpolate_table(k_0_table, u, v)
+    k_1 = _interpolate_table(k_1_table, u, v)
+
+    outside = (np.abs(u) > 1) | (np.abs(v) > 1)
+    if outside.any():
+        k_0_out, k_1_out, _ = _gmb_kernel(e[outside], y[outside], b, lambd, theta, alpha)
+        k_0[outside] = k_0_out
+        k_1[outside] = k_1_out
+
+    k = k_0 + (k_1 - k_0) * alpha**(1/2)
+    return k_0, k_1, k
+
+
+#Cubic interpolation on every segment of an influence line: nodes and check points (midpoints between the nodes)
+#in local coordinate t from 0 to 1, and the matrix from the values at the nodes to the coefficients of 1, t, t^2, t^3
+_INFLUENCE_NODES = np.array([0, 1/3, 2/3, 1])
+_INFLUENCE_CHECKS = np.array([1/6, 1/2, 5/6])
+_INFLUENCE_MATRIX = np.linalg.inv(np.vander(_INFLUENCE_NODES, 4, increasing=True))
+
+@dataclass(frozen=True, eq=False)
+class GMBInfluenceLine:
+    """
+    A data class to store the transverse influence lines of the Guyon-Massonnet-Bares coefficient k of every beam,
+    for a cross section and a set of stiffness parameters, as piecewise cubic polynomials of the load eccentricity.
+    Build it with gmb_influence_line(), and call it with an array of eccentricities.
+
+    The carriageway from -b to +b is split at the beam positions, where k has a kink. Every segment is bisected
+    until the cubic through 4 equally spaced nodes matches the closed form within tolerance/2 at the midpoints between
+    the nodes, where the error of the interpolation is the greatest, for all the beams at once.
+    Loads outside the carriageway are evaluated with the closed form.
+
+    Parameters:
+    y: array (n_beams) of beam distances
+    b, lambd, theta, alpha: parameters of the GMB theory, see _gmb_parameters()
+    edges: array (n_segments + 1) of the segment boundaries
+    coefficients: array (4 x n_segments x n_beams) of the coefficients of 1, t, t^2, t^3 on every segment,
+                  t going from 0 to 1 along the segment
+    tolerance: absolute tolerance on k
+    max_error: greatest error measured at the check points of the segments
+    """
+    y: np.ndarray
+    b: float
+    lambd: float
+    theta: float
+    alpha: float
+    edges: np.ndarray
+    coefficients: np.ndarray
+    tolerance: float
+    max_error: float
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.edges) - 1
+
+    @instrumented('load_distribution.gmb_influence')
+    def __call__(self, ecc) -> np.ndarray:
+        """
+        Returns the coefficients k of every beam for loads at the eccentricities ecc, array (ecc.shape x n_beams).
+        """
+        e = np.asarray(ecc, dtype=float)
+        idx = np.clip(np.searchsorted(self.edges, e, side='right') - 1, 0, self.n_segments - 1)
+        start = self.edges[idx]
+        t = ((e - start) / (self.edges[idx + 1] - start))[..., None]
+        c_0, c_1, c_2, c_3 = self.coefficients
+        k = c_0[idx] + t * (c_1[idx] + t * (c_2[idx] + t * c_3[idx]))
+
+        outside = np.abs(e) > self.b
+        if outside.any():
+            k[outside] = _gmb_kernel(e[outside][:, None], self.y, self.b, self.lambd, self.theta, self.alpha)[2]
+        return k
+
+
+def gmb_influence_line(cs: geom.Bridge_configuration, E: list[float], nu: float, I_l: list[float], I_t: list[float],
+                       tolerance: float = GMB_INFLUENCE_TOLERANCE) -> GMBInfluenceLine:
+    """
+    Returns the GMBInfluenceLine of a cross section, built once and kept in memory for the same cross section and
+    stiffness parameters (GMB_INFLUENCE_CACHE_SIZE influence lines at most, least recently used are discarded).
+
+    E, nu, I_l, I_t: see LoadDistribution.gmb()
+    tolerance: absolute tolerance on k (GMB_INFLUENCE_TOLERANCE as default)
+    """
+    b, lambd, theta, alpha = _gmb_parameters(cs, E, nu, I_l, I_t)
+    return _gmb_influence_line(tuple(cs.beam_distance), b, lambd, theta, alpha, tolerance)
+
+
+@functools.lru_cache(maxsize=GMB_INFLUENCE_CACHE_SIZE)
+@instrumented('load_distribution.gmb_influence_build')
+def _gmb_influence_line(beam_distance: tuple, b: float, lambd: float, theta: float, alpha: float,
+                        tolerance: float) -> GMBInfluenceLine:
+    y = np.array(beam_distance, dtype=float)
+    y.setflags(write=False)
+    breaks = np.unique(np.concatenate([[-b, b], y[np.abs(y) < b]]))
+    start, stop = breaks[:-1], breaks[1:]
+    t = np.concatenate([_INFLUENCE_NODES, _INFLUENCE_CHECKS])
+
+    #Segments are refined all together: nodes and check points of every pending segment in a single kernel call
+    edges, coefficients = [], []
+    max_error = 0.0
+    while len(start):
+        width = stop - start
+        k = _gmb_kernel((start[:, None] + width[:, None] * t)[:, :, None], y, b, lambd, theta, alpha)[2]
+        c = np.einsum('ij,sjb->isb', _INFLUENCE_MATRIX, k[:, :4])
+        powers = np.vander(_INFLUENCE_CHECKS, 4, increasing=True)
+        error = np.abs(np.einsum('pi,isb->spb', powers, c) - k[:, 4:]).max(axis=(1, 2))
+
+        done = (2 * error <= tolerance) | (width <= GMB_INFLUENCE_MIN_WIDTH * b)
+        edges.append(start[done])
+        coefficients.append(c[:, done])
+        if done.any():
+            max_error = max(max_error, error[done].max())
+        middle = (start[~done] + stop[~done]) / 2
+        start, stop = np.concatenate([start[~done], middle]), np.concatenate([middle, stop[~done]])
+
+    edges = np.concatenate(edges)
+    order = np.argsort(edges)
+    coefficients = np.concatenate(coefficients, axis=1)[:, order]
+    edges = np.append(edges[order], b)
+    for array in [edges, coefficients]:
+        array.setflags(write=False)
+    return GMBInfluenceLine(y, b, lambd, theta, alpha, edges, coefficients, tolerance, float(max_error))
+
+
+def _lever_rule(ecc, beam_distance: np.ndarray) -> np.ndarray:
+    """
+    Returns the share of unit loads taken by every beam, with the slab simply supported between adjacent beams.
+    Loads outside the outer beams are shared by the two outer beams as loads on a cantilever.
+    The last axis of the result (one column for every beam) is added to the shape of ecc.
+    """
+    ecc = np.asarray(ecc, dtype=float)
+    idx = np.clip(np.searchsorted(beam_distance, ecc) - 1, 0, len(beam_distance) - 2)
+    y_left = beam_distance[idx]
+    y_right = beam_distance[idx + 1]
+    ratio = (ecc - y_left) / (y_right - y_left)
+    share = np.zeros(ecc.shape + (len(beam_distance),))
+    np.put_along_axis(share, idx[..., None], (1 - ratio)[..., None], axis=-1)
+    np.put_along_axis(share, idx[..., None] + 1, ratio[..., None], axis=-1)
+    return share
+
+
+def _beam_deflection(beam_length: float, x, a) -> np.ndarray:
+    """
+    Deflection of a simply supported beam (unit flexural stiffness) at x for a unit load at a.
+    """
+    x, a = np.meshgrid(np.asarray(x, dtype=float), np.asarray(a, dtype=float), indexing='ij')
+    left = np.minimum(x, a)
+    right = beam_length - np.maximum(x, a)
+    return left * right * (beam_length**2 - left**2 - right**2) / (6 * beam_length)
+
+
+@functools.lru_cache(maxsize=ENGESSER_CACHE_SIZE)
+@instrumented('load_distribution.engesser_matrix')
+def _engesser_matrix(beam_distance: tuple, beam_length: float, diaph_position: tuple) -> np.ndarray:
+    """
+    Returns the matrix (n_beams x n_beams) of the Engesser theory: column j contains the repartition coefficients
+    of all the beams for a unit load applied at midspan of j-th beam.
+
+    Unknowns are the forces X between beams and rigid diaphragms, and the translation/rotation of every diaphragm.
+    Deflections of the beams at the diaphragms must follow the diaphragm rigid motion, and every diaphragm 
+    is in equilibrium (no external load on the diaphragms).
+    """
+    y = np.array(beam_distance)
+    n_beams = len(y)
+    n_diaph = len(diaph_position)
+    midspan = beam_length / 2
+    flex_diaph = _beam_deflection(beam_length, diaph_position, diaph_position)   # (n_diaph x n_diaph)
+    flex_load = _beam_deflection(beam_length, diaph_position, [midspan])[:, 0]    # (n_diaph)
+
+    # Unknowns: X[i, d] (i-th beam, d-th diaphragm) in beam-major order, then translation and rotation of every diaphragm
+    n_x = n_beams * n_diaph
+    a = np.zeros((n_x + 2 * n_diaph, n_x + 2 * n_diaph))
+    rhs = np.zeros((n_x + 2 * n_diaph, n_beams))
+    for i in range(n_beams):
+        for d in range(n_diaph):
+            row = i * n_diaph + d
+            a[row, i * n_diaph:(i + 1) * n_diaph] = flex_diaph[d]
+            a[row, n_x + d] = 1
+            a[row, n_x + n_diaph + d] = y[i]
+            rhs[row, i] = flex_load[d]
+    for d in range(n_diaph):
+        a[n_x + d, d:n_x:n_diaph] = 1
+        a[n_x + n_diaph + d, d:n_x:n_diaph] = y
+    forces = np.linalg.solve(a, rhs)[:n_x].reshape(n_beams, n_diaph, n_beams)
+
+    # Midspan moments of every beam, referred to the midspan moment of the unit load
+    moment_diaph = np.minimum(diaph_position, midspan) * (beam_length - np.maximum(diaph_position, midspan)) / beam_length
+    matrix = np.eye(n_beams) - (forces * moment_diaph[None, :, None]).sum(axis=1) / (beam_length / 4)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@instrumented('load_distribution.distribution')
+def _distribution(cs: geom.Bridge_configuration, batch: tl.TL_batch, k_conc: np.ndarray, k_dist: np.ndarray):
+    """
+    Returns the load distribution of a batch of load cases from the repartition coefficients of every single load,
+    arrays (n_cases x n_loads x n_beams), with the same definitions and rounding of LoadDistributionBatch.courbon().
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        conc_force = _sequential_sum(batch.conc_weights)
+        ecc_conc = _sequential_sum(batch.conc_weights * batch.conc_ecc) / conc_force
+        ki_conc = (batch.conc_weights[:, :, None] * k_conc).sum(axis=1) / conc_force[:, None]
+
+        dist_force = _sequential_sum(batch.dist_weights)
+        ecc_dist = np.where(dist_force == 0, 0.0, _sequential_sum(batch.dist_weights * batch.dist_ecc) / dist_force)
+        ki_dist = np.where(dist_force[:, None] == 0, k_dist.mean(axis=1),
+                           (batch.dist_weights[:, :, None] * k_dist).sum(axis=1) / dist_force[:, None])
+
+    resultant_conc_force = round_builtin(conc_force, 2)
+    resultant_conc_moment = resultant_conc_force * ecc_conc
+    resultant_dist_force = dist_force
+    resultant_dist_moment = round_builtin(resultant_dist_force * ecc_dist, 2)
+    resultant = np.column_stack([resultant_conc_force, resultant_conc_moment, resultant_dist_force, resultant_dist_moment])
+
+    ki_conc = round_builtin(ki_conc, 3)
+    ki_dist = round_builtin(ki_dist, 3)
+    resultant_conc = round_builtin(ki_conc * resultant_conc_force[:, None], 2)
+    resultant_dist = round_builtin(ki_dist * resultant_dist_force[:, None], 2)
+    return resultant, ki_conc, ki_dist, resultant_conc, resultant_dist
+
+
+def _sequential_sum(values: np.ndarray) -> np.ndarray:
+    """
+    Sum the columns of a 2D array from left to right, with the same order of operations of the built-in sum().
+    """
+    total = np.zeros(values.shape[0])
+    for column in values.T:
+        total = total + column
+    return total
+
+
+@dataclass
+class LoadDistributionBatch:
+    """
+    A data class to define the load distribution of many traffic load cases on the same cross section.
+    Every theory is evaluated for all the load cases at once, using NumPy arrays.
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    tl_batch: tl.TL_batch
+    """
+    cs: geom.Bridge_configuration
+    tl_batch: tl.TL_batch
+
+    @instrumented('load_distribution.batch_courbon')
+    def courbon(self):
+        """
+        The function returns a load distribution for every beam of the cross section and for every load case, using the Courbon theory.
+        Results are the same of LoadDistribution.courbon(), stacked by rows (one row for each load case).
+        Load cases without concentrated loads return NaN instead of raising ZeroDivisionError.
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        resultant: array (n_cases x 4) of total vertical reaction force and moment for concentrated and distributed loads
+        ki_conc: array (n_cases x n_beams) of repartition coefficients referred to concentrated loads
+        ki_dist: array (n_cases x n_beams) of repartition coefficients referred to distributed loads
+        resultant_conc: array (n_cases x n_beams) of resultant vertical forces referred to concentrated loads
+        resultant_dist: array (n_cases x n_beams) of resultant vertical distributed loads referred to distributed loads
+        """
+        if self.cs.n_diaph == 0:
+            raise ValueError(f"Number of internal diaphragms is less than 1, so Courbon theory cannot be used")
+        # Calculate the polar inertia of the beams
+        polar_inertia = self.cs.polar_inertia
+        distance = self.cs.beam_offsets
+
+        batch = self.tl_batch
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Calculate the eccentricity of concentrated/distributed resultant load
+            conc_force = _sequential_sum(batch.conc_weights)
+            ecc_conc = _sequential_sum(batch.conc_weights * batch.conc_ecc) / conc_force
+
+            dist_force = _sequential_sum(batch.dist_weights)
+            ecc_dist = np.where(dist_force == 0, 0.0, _sequential_sum(batch.dist_weights * batch.dist_ecc) / dist_force)
+
+        # Calculate the resultant forces/moments of concentrated/distributed definition for traffic_load
+        resultant_conc_force = round_builtin(conc_force, 2)
+        resultant_conc_moment = resultant_conc_force * ecc_conc
+        resultant_dist_force = dist_force
+        resultant_dist_moment = round_builtin(resultant_dist_force * ecc_dist, 2)
+        resultant = np.column_stack([resultant_conc_force, resultant_conc_moment, resultant_dist_force, resultant_dist_moment])
+
+        # Calculate the repartition coefficients
+        ki_conc = round_builtin((1 / self.cs.n_beams) + ecc_conc[:, None] * distance / polar_inertia, 3)
+        ki_dist = round_builtin((1 / self.cs.n_beams) + ecc_dist[:, None] * distance / polar_inertia, 3)
+
+        # Calculate the load per beam after the load distribution
+        resultant_conc = round_builtin(ki_conc * resultant_conc_force[:, None], 2)
+        resultant_dist = round_builtin(ki_dist * resultant_dist_force[:, None], 2)
+
+        return resultant, ki_conc, ki_dist, resultant_conc, resultant_dist
+
+    def engesser(self):
+        """
+        The function returns a load distribution for every beam of the cross section and for every load case, using the Engesser theory.
+        See LoadDistribution.engesser().
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        Same definitions of courbon().
+        """
+        return _distribution(self.cs, self.tl_batch, *self._engesser_coefficients())
+
+    def gmb(self,
+            E: list[float],
+            nu: float,
+            I_l: list[float],
+            I_t: list[float],
+            table: bool = False,
+            influence: bool = False
+            ):
+        """
+        The function returns a load distribution for every beam of the cross section and for every load case, 
+        using the Guyon-Massonnet-Bares theory. The share of a single load taken by i-th beam is k / n_beams.
+
+        Parameters
+        -------
+
+        E, nu, I_l, I_t, table: see LoadDistribution.gmb_arrays()
+        influence: interpolate k on the influence lines of gmb_influence_line(), built once for the cross section and
+                   kept in memory, instead of the closed form (False as default)
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        Same definitions of courbon().
+        """
+        return _distribution(self.cs, self.tl_batch, *self._gmb_coefficients(E, nu, I_l, I_t, table, influence=influence))
+
+    def grillage(self,
+                 E: list[float],
+                 nu: float,
+                 I_l: list[float],
+                 I_t: list[float],
+                 n_elements: int = 20,
+                 skew: float = 0
+                 ):
+        """
+        The function returns a load distribution for every beam of the cross section and for every load case, using a grillage model.
+        See LoadDistribution.grillage().
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+
+        Same definitions of courbon().
+        """
+        return _distribution(self.cs, self.tl_batch, *self._grillage_coefficients(E, nu, I_l, I_t, n_elements, skew))
+
+    @instrumented('load_distribution.result')
+    def result(self, theory: str = 'courbon', **parameters):
+        """
+        The function returns the load distribution of every load case at full precision, as a results.DistributionResult
+        backed by NumPy arrays, that can be exported to pandas or Arrow without copies.
+
+        theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+        parameters: parameters of the theory, e.g. E, nu, I_l, I_t for gmb() and grillage()
+        """
+        from pyBridgeLD import results as res
+
+        coefficients = {'courbon': self._courbon_coefficients,
+                        'engesser': self._engesser_coefficients,
+                        'gmb': self._gmb_coefficients,
+                        'grillage': self._grillage_coefficients}
+        if theory not in coefficients:
+            raise ValueError(f"Theory must be 'courbon', 'engesser', 'gmb' or 'grillage', not {theory}")
+        k_conc, k_dist = coefficients[theory](**parameters)
+        return res.DistributionResult.from_coefficients(theory, self.tl_batch, k_conc, k_dist)
+
+    # Share of every single load taken by every beam, arrays (n_cases x n_loads x n_beams) for concentrated and distributed loads
+
+    def _courbon_coefficients(self):
+        if self.cs.n_diaph == 0:
+            raise ValueError(f"Number of internal diaphragms is less than 1, so Courbon theory cannot be used")
+        batch = self.tl_batch
+        k_conc = 1 / self.cs.n_beams + batch.conc_ecc[:, :, None] * self.cs.beam_offsets / self.cs.polar_inertia
+        k_dist = 1 / self.cs.n_beams + batch.dist_ecc[:, :, None] * self.cs.beam_offsets / self.cs.polar_inertia
+        return k_conc, k_dist
+
+    @instrumented('load_distribution.engesser_coefficients')
+    def _engesser_coefficients(self):
+        if self.cs.n_diaph == 0:
+            raise ValueError(f"Number of internal diaphragms is less than 1, so Engesser theory cannot be used")
+        elif self.cs.n_diaph > 3:
+            raise ValueError(f"Number of internal diaphragms is greater than 3, not currently supported. Use Courbon theory!")
+        if self.cs.beam_length <= 0:
+            raise ValueError(f"Beam length must be greater than 0 for Engesser theory, not {self.cs.beam_length}")
+        if not all(0 < position < self.cs.beam_length for position in self.cs.diaph_position):
+            raise ValueError(f"Internal diaphragms at {self.cs.diaph_position} are not inside the span (0, {self.cs.beam_length}), "
+                             f"reduce diaph_spacing")
+
+        engesser_matrix = _engesser_matrix(tuple(self.cs.beam_distance), self.cs.beam_length, self.cs.diaph_position)
+
+        batch = self.tl_batch
+        k_conc = _lever_rule(batch.conc_ecc, self.cs.beam_offsets) @ engesser_matrix.T
+        k_dist = _lever_rule(batch.dist_ecc, self.cs.beam_offsets) @ engesser_matrix.T
+        return k_conc, k_dist
+
+    @instrumented('load_distribution.gmb_coefficients')
+    def _gmb_coefficients(self, E: list[float], nu: float, I_l: list[float], I_t: list[float], table: bool = False,
+                          series: bool = False, tolerance: float = GMB_SERIES_TOLERANCE, max_harmonic: int = GMB_SERIES_MAX_HARMONIC,
+                          influence: bool = False):
+        b, lambd, theta, alpha = _gmb_parameters(self.cs, E, nu, I_l, I_t)
+        kernel = _gmb_table_lookup if table else _gmb_kernel
+        y = self.cs.beam_offsets
+
+        batch = self.tl_batch
+        if influence:
+            line = gmb_influence_line(self.cs, E, nu, I_l, I_t)
+            return line(batch.conc_ecc) / self.cs.n_beams, line(batch.dist_ecc) / self.cs.n_beams
+        if series:
+            e = np.concatenate([batch.conc_ecc.ravel(), batch.dist_ecc.ravel()])
+            concentrated = np.arange(len(e)) < batch.conc_ecc.size
+            k = _gmb_series(e, y, concentrated, b, lambd, theta, alpha, tolerance, max_harmonic)[0] / self.cs.n_beams
+            return (k[:batch.conc_ecc.size].reshape(batch.conc_ecc.shape + (-1,)),
+                    k[batch.conc_ecc.size:].reshape(batch.dist_ecc.shape + (-1,)))
+        k_conc = kernel(batch.conc_ecc[:, :, None], y, b, lambd, theta, alpha)[2] / self.cs.n_beams
+        k_dist = kernel(batch.dist_ecc[:, :, None], y, b, lambd, theta, alpha)[2] / self.cs.n_beams
+        return k_conc, k_dist
+
+    @instrumented('load_distribution.grillage_coefficients')
+    def _grillage_coefficients(self, E: list[float], nu: float, I_l: list[float], I_t: list[float],
+                               n_elements: int = 20, skew: float = 0):
+        from pyBridgeLD import grillage as gr
+
+        deflections = gr.midspan_deflections(self.cs, E, nu, I_l, I_t, n_elements, skew)
+
+        batch = self.tl_batch
+        w_conc = _lever_rule(batch.conc_ecc, self.cs.beam_offsets) @ deflections.T
+        w_dist = _lever_rule(batch.dist_ecc, self.cs.beam_offsets) @ deflections.T
+        k_conc = w_conc / w_conc.sum(axis=-1, keepdims=True)
+        k_dist = w_dist / w_dist.sum(axis=-1, keepdims=True)
+        return k_conc, k_dist
+
+
+def _share_function(cs: geom.Bridge_configuration, theory: str = 'courbon', stiffness: dict = None, **parameters):
+    """
+    Returns the function giving the share of a unit load taken by every beam, array (... x n_beams) for an array of
+    eccentricities, evaluated by the coefficients of LoadDistributionBatch with all their checks.
+    The checks are run once here, on a load at the centerline, so that invalid decks raise before any evaluation.
+
+    stiffness: dictionary with E, nu, I_l, I_t parameters, needed for 'gmb' and 'grillage' theories
+    parameters: further parameters of the theory, e.g. table=True for gmb()
+    """
+    if theory not in ['courbon', 'engesser', 'gmb', 'grillage']:
+        raise ValueError(f"Theory must be 'courbon', 'engesser', 'gmb' or 'grillage', not {theory}")
+    if theory in ['gmb', 'grillage']:
+        if stiffness is None:
+            raise ValueError(f"Stiffness parameters E, nu, I_l, I_t are needed for {theory} theory")
+        parameters = {**stiffness, **parameters}
+
+    def share(ecc):
+        ecc = np.asarray(ecc, dtype=float)
+        batch = tl.TL_batch(np.ones((1, ecc.size)), ecc.reshape(1, -1), np.zeros((1, 0)), np.zeros((1, 0)))
+        k_conc = getattr(LoadDistributionBatch(cs=cs, tl_batch=batch), f'_{theory}_coefficients')(**parameters)[0]
+        return k_conc.reshape(ecc.shape + (cs.n_beams,))
+
+    share(np.zeros(1))
+    return share
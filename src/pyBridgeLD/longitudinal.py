@@ -0,0 +1,146 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from dataclasses import dataclass
+import numpy as np
+
+def influence_lines(beam_length: float, sections, positions):
+    """
+    Returns the influence lines of bending moment and shear of a simply supported beam.
+
+    Parameters:
+    beam_length: span of the beam
+    sections: array of the sections along the span
+    positions: array of the positions of the unit load along the span
+
+    Returns
+    -------
+    [moment, shear]
+
+    moment: array (n_sections x n_positions) of bending moments (sagging positive)
+    shear: array (n_sections x n_positions) of shear forces, on the right of the section when the load is on the section
+    """
+    x = np.asarray(sections, dtype=float)[:, None]
+    p = np.asarray(positions, dtype=float)[None, :]
+    left = p < x
+    moment = np.where(left, p * (beam_length - x), x * (beam_length - p)) / beam_length
+    shear = np.where(left, -p, beam_length - p) / beam_length
+    return moment, shear
+
+
+def _integral(values: np.ndarray, step: float) -> np.ndarray:
+    """
+    Trapezoidal integral of every row of values, sampled with a constant step.
+    """
+    return step * (values.sum(axis=1) - (values[:, 0] + values[:, -1]) / 2)
+
+
+@dataclass
+class MovingLoad:
+    """
+    A data class to define a longitudinal moving load on a simply supported deck.
+    All the vehicles of the traffic load configuration move together along the span, with their first axles side by side.
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    tl_config: tl.TL_configuration
+    """
+    cs: geom.Bridge_configuration
+    tl_config: tl.TL_configuration
+
+    def axle_train(self, step: float):
+        """
+        Returns the axle train of the vehicles on a grid of the given step.
+
+        Returns
+        -------
+        [axle_offsets, axle_loads]
+
+        axle_offsets: array with the offset of every axle from the first axle, in number of grid steps
+        axle_loads: array with the load of every axle (sum of the concentrated loads of the vehicles)
+        """
+        train = {}
+        for vehicle in self.tl_config.veh_list:
+            axle_load = sum(vehicle.veh_load_conc) / len(vehicle.veh_axle_position)
+            for position in vehicle.veh_axle_position:
+                offset = int(round(position / step))
+                train[offset] = train.get(offset, 0) + axle_load
+        offsets = sorted(train)
+        return np.array(offsets, dtype=int), np.array([train[offset] for offset in offsets], dtype=float)
+
+    def envelope(self,
+                 n_sections: int = 11,
+                 step: float = 0.1,
+                 ki_conc: list[float] = None,
+                 ki_dist: list[float] = None
+                 ):
+        """
+        The function returns the envelopes of bending moment and shear for every beam of the cross section.
+
+        The influence lines are computed once on a grid of load positions, then the axle train is swept along the span
+        in both directions of travel by shifting the influence lines of every axle. Distributed loads (veh_load_dist * veh_width for unit length)
+        are applied on the positive or the negative part of the influence lines.
+        Beam effects are obtained with the transversal repartition coefficients, from courbon() as default.
+
+        Parameters
+        -------
+
+        n_sections: number of sections along the span, supports included (11 as default)
+        step: maximum step of the load positions along the span (0.1 as default)
+        ki_conc: repartition coefficient for i-th beam referred to concentrated loads (courbon()[1] as default)
+        ki_dist: repartition coefficient for i-th beam referred to distributed loads (courbon()[2] as default)
+
+        Returns
+        -------
+        [sections, moment_max, moment_min, shear_max, shear_min]
+
+        sections: array of the sections along the span
+        moment_max, moment_min: arrays (n_beams x n_sections) of maximum and minimum bending moments
+        shear_max, shear_min: arrays (n_beams x n_sections) of maximum and minimum shear forces
+        """
+        length = self.cs.beam_length
+        if length <= 0:
+            raise ValueError(f"Beam length must be greater than 0, not {length}")
+        if ki_conc is None or ki_dist is None:
+            courbon = ld.LoadDistribution(cs=self.cs, tl_config=self.tl_config).courbon()
+            ki_conc = courbon[1] if ki_conc is None else ki_conc
+            ki_dist = courbon[2] if ki_dist is None else ki_dist
+        ki_conc = np.asarray(ki_conc, dtype=float)[:, None]
+        ki_dist = np.asarray(ki_dist, dtype=float)[:, None]
+
+        n_steps = int(np.ceil(length / step))
+        step = length / n_steps
+        sections = np.linspace(0, length, n_sections)
+        positions = np.linspace(0, length, n_steps + 1)
+        moment_il, shear_il = influence_lines(length, sections, positions)
+
+        # Sweep of the axle train: the first axle goes from the first support to the end of the train past the second one,
+        # in both directions of travel (offsets of the reversed train mirrored about its last axle)
+        offsets, loads = self.axle_train(step)
+        train = offsets.max() - offsets.min()
+        n_sweep = n_steps + 1 + train
+        conc = {}
+        for name, il in [('moment', moment_il), ('shear', shear_il)]:
+            il_padded = np.pad(il, ((0, 0), (train, train)))
+            effect = np.zeros((2, n_sections, n_sweep))
+            for direction, train_offsets in enumerate([offsets - offsets.min(), offsets.max() - offsets]):
+                for offset, load in zip(train_offsets, loads):
+                    effect[direction] += load * il_padded[:, train - offset:train - offset + n_sweep]
+            conc[name] = (effect.max(axis=(0, 2)), effect.min(axis=(0, 2)))
+
+        # Distributed loads on the positive or negative part of the influence lines
+        q = sum([vehicle.veh_load_dist * vehicle.veh_width for vehicle in self.tl_config.veh_list])
+        dist = {}
+        for name, il in [('moment', moment_il), ('shear', shear_il)]:
+            dist[name] = (q * _integral(np.maximum(il, 0), step), q * _integral(np.minimum(il, 0), step))
+
+        results = []
+        for name in ['moment', 'shear']:
+            conc_max, conc_min = conc[name]
+            dist_max, dist_min = dist[name]
+            effect_max = (np.where(ki_conc >= 0, ki_conc * conc_max, ki_conc * conc_min)
+                          + np.where(ki_dist >= 0, ki_dist * dist_max, ki_dist * dist_min))
+            effect_min = (np.where(ki_conc >= 0, ki_conc * conc_min, ki_conc * conc_max)
+                          + np.where(ki_dist >= 0, ki_dist * dist_min, ki_dist * dist_max))
+            results.extend([effect_max, effect_min])
+        return sections, results[0], results[1], results[2], results[3]
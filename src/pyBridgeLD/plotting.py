@@ -0,0 +1,129 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD._optional import import_optional
+import numpy as np
+
+#Maximum number of points of every trace of case_figure(), longer series are downsampled
+PLOT_MAX_POINTS = 4000
+
+#Quantiles of the band drawn by envelope_figure() inside the envelope of all the load cases
+PLOT_QUANTILES = (0.05, 0.95)
+
+def downsample(y: np.ndarray, max_points: int = PLOT_MAX_POINTS):
+    """
+    Returns the indices and values of a downsampled series, for plotting.
+
+    The series is split in max_points/2 buckets of consecutive values, and the minimum and the maximum of every bucket
+    are kept in their original order, so that the peaks of the series are never lost.
+    Series with at most max_points values are returned unchanged.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), y
+    n_buckets = max(max_points // 2, 1)
+    size = -(-n // n_buckets)
+
+    # Buckets as rows of a 2D array, the last one padded with the last value (padded indices are clipped back to it)
+    buckets = np.pad(y, (0, n_buckets * size - n), mode='edge').reshape(n_buckets, size)
+    starts = np.arange(n_buckets) * size
+    idx_min = np.minimum(starts + buckets.argmin(axis=1), n - 1)
+    idx_max = np.minimum(starts + buckets.argmax(axis=1), n - 1)
+    idx = np.unique(np.concatenate([idx_min, idx_max]))
+    return idx, y[idx]
+
+
+def _beam_values(result, quantity: str) -> np.ndarray:
+    # Array (n_cases x n_beams) of a quantity of a results.DistributionResult
+    if quantity not in ['ki_conc', 'ki_dist', 'resultant_conc', 'resultant_dist']:
+        raise ValueError(f"Quantity must be 'ki_conc', 'ki_dist', 'resultant_conc' or 'resultant_dist', not {quantity}")
+    return getattr(result, quantity)
+
+
+def envelope_figure(result, quantity: str = 'ki_conc', cs: geom.Bridge_configuration = None,
+                    quantiles: tuple[float] = PLOT_QUANTILES):
+    """
+    Returns a plotly figure with the envelope of a quantity for every beam, over all the load cases of a result.
+
+    The figure has the maximum and minimum value of every beam, the band between the quantiles of the load cases and
+    the mean value. Only n_beams points are drawn for every trace, whatever the number of load cases.
+
+    Parameters:
+    result: results.DistributionResult, e.g. from LoadDistributionBatch.result()
+    quantity: 'ki_conc', 'ki_dist', 'resultant_conc' or 'resultant_dist' ('ki_conc' as default)
+    cs: geometry.Bridge_configuration, to draw the beams at their transversal distance (beam number as default)
+    quantiles: lower and upper quantiles of the band, None to skip it (PLOT_QUANTILES as default)
+    """
+    go = import_optional('plotly.graph_objects', 'plot')
+    values = _beam_values(result, quantity)
+    if cs is None:
+        x, x_title = np.arange(1, result.n_beams + 1), 'beam'
+    else:
+        x, x_title = np.asarray(cs.beam_distance, dtype=float), 'distance'
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=values.max(axis=0), name='max', mode='lines+markers', line={'color': '#b2182b'}))
+    fig.add_trace(go.Scatter(x=x, y=values.min(axis=0), name='min', mode='lines+markers', line={'color': '#2166ac'},
+                             fill='tonexty', fillcolor='rgba(150, 150, 150, 0.15)'))
+    if quantiles is not None:
+        lower, upper = np.quantile(values, quantiles, axis=0)
+        label = f'{100 * quantiles[0]:g}-{100 * quantiles[1]:g}%'
+        fig.add_trace(go.Scatter(x=x, y=upper, name=label, mode='lines', line={'width': 0}, showlegend=False))
+        fig.add_trace(go.Scatter(x=x, y=lower, name=label, mode='lines', line={'width': 0},
+                                 fill='tonexty', fillcolor='rgba(150, 150, 150, 0.4)'))
+    fig.add_trace(go.Scatter(x=x, y=values.mean(axis=0), name='mean', mode='lines', line={'color': 'black', 'dash': 'dot'}))
+    fig.update_layout(title=f'{result.theory} envelope of {quantity}, {result.n_cases} load cases',
+                      xaxis_title=x_title, yaxis_title=quantity)
+    return fig
+
+
+def case_figure(result, quantity: str = 'ki_conc', beams: list[int] = None, max_points: int = PLOT_MAX_POINTS):
+    """
+    Returns a plotly figure with a quantity of the selected beams for every load case, e.g. the cases of a moving load.
+
+    Traces are WebGL scatters (Scattergl) and series longer than max_points are downsampled with downsample(),
+    keeping the minimum and the maximum of every bucket of load cases, so that the figure stays small and responsive.
+
+    Parameters:
+    result: results.DistributionResult, e.g. from LoadDistributionBatch.result()
+    quantity: 'ki_conc', 'ki_dist', 'resultant_conc' or 'resultant_dist' ('ki_conc' as default)
+    beams: list of beam numbers, from 1 to n_beams (all the beams as default)
+    max_points: maximum number of points of every trace (PLOT_MAX_POINTS as default)
+    """
+    go = import_optional('plotly.graph_objects', 'plot')
+    values = _beam_values(result, quantity)
+    if beams is None:
+        beams = range(1, result.n_beams + 1)
+
+    fig = go.Figure()
+    for beam in beams:
+        if not 1 <= beam <= result.n_beams:
+            raise ValueError(f"Beam number must be between 1 and {result.n_beams}, not {beam}")
+        idx, y = downsample(values[:, beam - 1], max_points)
+        fig.add_trace(go.Scattergl(x=idx, y=y, name=f'beam {beam}', mode='lines'))
+    fig.update_layout(title=f'{result.theory} {quantity}, {result.n_cases} load cases', xaxis_title='case', yaxis_title=quantity)
+    return fig
+
+
+def coefficient_figure(k: np.ndarray, cs: geom.Bridge_configuration = None, names: list[str] = None):
+    """
+    Returns a plotly figure with the share of every load taken by every beam (e.g. the rows of LoadDistribution.gmb()).
+
+    Parameters:
+    k: array (n_loads x n_beams) of coefficients, or a dataframe with one row for every load
+    cs: geometry.Bridge_configuration, to draw the beams at their transversal distance (beam number as default)
+    names: name of every load (index of the dataframe, or load_1 to load_n as default)
+    """
+    go = import_optional('plotly.graph_objects', 'plot')
+    if names is None:
+        names = list(k.index) if hasattr(k, 'index') else [f'load_{idx + 1}' for idx in range(len(k))]
+    k = np.asarray(k, dtype=float)
+    if cs is None:
+        x, x_title = np.arange(1, k.shape[1] + 1), 'beam'
+    else:
+        x, x_title = np.asarray(cs.beam_distance, dtype=float), 'distance'
+
+    fig = go.Figure()
+    for name, values in zip(names, k):
+        fig.add_trace(go.Scatter(x=x, y=values, name=name, mode='lines+markers'))
+    fig.update_layout(xaxis_title=x_title, yaxis_title='k')
+    return fig
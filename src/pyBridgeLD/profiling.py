@@ -0,0 +1,205 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+#State of the instrumentation: when disabled every instrumented function costs a single test of _enabled
+_enabled = False
+_memory = False
+_trace = False
+_tracemalloc_started = False
+_stats = {}
+_events = []
+_lock = threading.Lock()
+_local = threading.local()
+
+def enable(memory: bool = False, trace: bool = False):
+    """
+    Start collecting the statistics of the instrumented stages.
+
+    memory: measure the peak memory and the number of allocations of every stage with tracemalloc (slower, False as default).
+            Allocations are counted by a snapshot at the start and at the end of every call, whose time is included in the
+            time of the outer stages
+    trace: record a trace event for every call, see trace_events() (False as default)
+    """
+    global _enabled, _memory, _trace, _tracemalloc_started
+    _memory = memory
+    _trace = trace
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_started = True
+    _enabled = True
+
+
+def disable():
+    """
+    Stop collecting the statistics, the collected ones are kept until reset().
+    """
+    global _enabled, _tracemalloc_started
+    _enabled = False
+    if _tracemalloc_started:
+        tracemalloc.stop()
+        _tracemalloc_started = False
+
+
+def reset():
+    """
+    Discard the collected statistics and trace events.
+    """
+    with _lock:
+        _stats.clear()
+        _events.clear()
+
+
+class profile:
+    """
+    Context manager to collect the statistics of a block of code, e.g.
+
+        with pybld.profiling.profile() as stats:
+            ...
+        print(stats.summary())
+
+    Parameters:
+    memory, trace: see enable()
+    """
+    def __init__(self, memory: bool = False, trace: bool = False):
+        self.memory = memory
+        self.trace = trace
+
+    def __enter__(self):
+        reset()
+        enable(self.memory, self.trace)
+        return self
+
+    def __exit__(self, *exc):
+        disable()
+        return False
+
+    @staticmethod
+    def stats() -> dict:
+        return stats()
+
+    @staticmethod
+    def summary(sort: str = 'time') -> str:
+        return summary(sort)
+
+    @staticmethod
+    def export_trace(path: str):
+        export_trace(path)
+
+
+def instrumented(stage: str):
+    """
+    Decorator of the functions of a stage, e.g. @instrumented('load_distribution.gmb_kernel').
+    Time of nested stages is included in the time of the outer ones.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            return _call(stage, function, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def _call(stage: str, function, args, kwargs):
+    memory = _memory and tracemalloc.is_tracing()
+    if memory:
+        # The peak of tracemalloc is reset by every stage: the peak of the outer stages before the reset is kept in the stack
+        peak = tracemalloc.get_traced_memory()[1]
+        stack = _memory_stack()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        blocks = _traced_blocks()
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        stack.append([current, current])
+    start = time.perf_counter_ns()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        allocated = 0
+        allocations = 0
+        if memory:
+            memory_start, peak = stack.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            allocated = peak - memory_start
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            allocations = sum(max(count - blocks.get(filename, 0), 0) for filename, count in _traced_blocks().items())
+            # The snapshots are freed, so that they are not in the peak of the outer stages
+            tracemalloc.reset_peak()
+        with _lock:
+            record = _stats.setdefault(stage, [0, 0, 0, 0])
+            record[0] += 1
+            record[1] += elapsed
+            record[2] += allocated
+            record[3] += allocations
+            if _trace:
+                _events.append((stage, start, elapsed, threading.get_ident()))
+
+
+def _memory_stack() -> list:
+    """
+    Returns the stack of [traced memory at the start, peak] of the running stages of the current thread.
+    """
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _traced_blocks() -> dict:
+    """
+    Returns the number of traced memory blocks of every file, from the statistics of a tracemalloc snapshot.
+    Blocks of tracemalloc and of this module are excluded.
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                          tracemalloc.Filter(False, __file__)])
+    return {statistic.traceback[0].filename: statistic.count for statistic in snapshot.statistics('filename')}
+
+
+def stats() -> dict:
+    """
+    Returns a dictionary with calls, cumulative time in seconds, allocated memory in bytes and number of allocations
+    (if measured) of every stage.
+    The allocated memory of a call is its peak of traced memory over the memory at the start, freed temporaries included.
+    The allocations of a call are the memory blocks allocated by the call and still traced at its end, from the count
+    of the snapshot statistics of every file: freed temporaries are in the allocated memory only.
+    """
+    with _lock:
+        return {stage: {'calls': calls, 'time': elapsed / 1e9, 'memory': allocated, 'allocations': allocations}
+                for stage, (calls, elapsed, allocated, allocations) in _stats.items()}
+
+
+def summary(sort: str = 'time') -> str:
+    """
+    Returns a table of the statistics of every stage, sorted by 'time', 'calls', 'memory' or 'allocations' ('time' as default).
+    """
+    rows = sorted(stats().items(), key=lambda item: item[1][sort], reverse=True)
+    lines = [f"{'stage':45s} {'calls':>10s} {'time [s]':>12s} {'per call [us]':>14s} {'memory [kB]':>12s} {'allocations':>12s}"]
+    for stage, item in rows:
+        lines.append(f"{stage:45s} {item['calls']:10d} {item['time']:12.6f} {1e6 * item['time'] / item['calls']:14.2f} "
+                     f"{item['memory'] / 1024:12.1f} {item['allocations']:12d}")
+    return '\n'.join(lines)
+
+
+def trace_events() -> list[dict]:
+    """
+    Returns the recorded calls as complete events of the Chrome trace format (chrome://tracing, Perfetto).
+    """
+    pid = os.getpid()
+    with _lock:
+        return [{'name': stage, 'cat': stage.split('.')[0], 'ph': 'X', 'ts': start / 1e3, 'dur': elapsed / 1e3,
+                 'pid': pid, 'tid': tid} for stage, start, elapsed, tid in _events]
+
+
+def export_trace(path: str):
+    """
+    Write the recorded calls as a JSON file of the Chrome trace format.
+    """
+    with open(path, 'w') as file:
+        json.dump({'traceEvents': trace_events(), 'displayTimeUnit': 'ms'}, file)
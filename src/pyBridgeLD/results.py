@@ -0,0 +1,144 @@
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD._optional import import_optional
+from pyBridgeLD._rounding import round_builtin
+from dataclasses import dataclass
+import numpy as np
+
+#Quantities of every beam and of the resultant load, in the order of the result arrays
+BEAM_QUANTITIES = ('ki_conc', 'ki_dist', 'resultant_conc', 'resultant_dist')
+RESULTANT_QUANTITIES = ('conc_force', 'conc_moment', 'dist_force', 'dist_moment')
+
+#Number of decimals used to display the results, the arrays are never rounded
+DISPLAY_DECIMALS = {'ki_conc': 3, 'ki_dist': 3, 'resultant_conc': 2, 'resultant_dist': 2}
+
+@dataclass(frozen=True)
+class DistributionResult:
+    """
+    A data class to store the load distribution of a batch of load cases at full precision.
+
+    Values are kept in two contiguous arrays, one row for every quantity and one column for every load case,
+    so that every column of to_pandas() and to_arrow() is a view of the same memory, without copies.
+    ki_conc, ki_dist, resultant_conc, resultant_dist and resultant have the same definitions of LoadDistribution.courbon(),
+    as arrays (n_cases x n_beams) and (n_cases x 4); rounding is applied only when the results are printed.
+    When the distributed loads of a case sum to 0, ki_dist is the mean share of the distributed loads of the case,
+    as LoadDistributionBatch, while the legacy LoadDistribution.courbon() gives the share of a load at the centerline (1/n_beams).
+
+    Parameters:
+    theory: name of the theory of the load distribution
+    beam_data: array (4 x n_beams x n_cases) of ki_conc, ki_dist, resultant_conc and resultant_dist
+    resultant_data: array (4 x n_cases) of force and moment of concentrated and distributed loads
+    k_conc: array (n_cases x n_conc x n_beams) with the share of every concentrated load taken by every beam
+    k_dist: array (n_cases x n_dist x n_beams) with the share of every distributed load taken by every beam
+    """
+    theory: str
+    beam_data: np.ndarray
+    resultant_data: np.ndarray
+    k_conc: np.ndarray
+    k_dist: np.ndarray
+
+    @classmethod
+    def from_coefficients(cls, theory: str, batch: tl.TL_batch, k_conc: np.ndarray, k_dist: np.ndarray):
+        """
+        Build the result of a batch of load cases from the share of every single load taken by every beam,
+        arrays (n_cases x n_loads x n_beams). The result keeps read-only views of k_conc and k_dist, the arrays
+        of the caller are not copied and stay writable.
+        """
+        k_conc = k_conc.view()
+        k_dist = k_dist.view()
+        n_cases, _, n_beams = k_conc.shape
+        resultant_data = np.empty((4, n_cases))
+        resultant_data[0] = batch.conc_weights.sum(axis=1)
+        resultant_data[1] = (batch.conc_weights * batch.conc_ecc).sum(axis=1)
+        resultant_data[2] = batch.dist_weights.sum(axis=1)
+        resultant_data[3] = (batch.dist_weights * batch.dist_ecc).sum(axis=1)
+
+        beam_data = np.empty((4, n_beams, n_cases))
+        beam_data[2] = np.einsum('cl,clb->bc', batch.conc_weights, k_conc)
+        beam_data[3] = np.einsum('cl,clb->bc', batch.dist_weights, k_dist)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beam_data[0] = beam_data[2] / resultant_data[0]
+            beam_data[1] = np.where(resultant_data[2] == 0, k_dist.mean(axis=1).T, beam_data[3] / resultant_data[2])
+
+        for array in [beam_data, resultant_data, k_conc, k_dist]:
+            array.setflags(write=False)
+        return cls(theory, beam_data, resultant_data, k_conc, k_dist)
+
+    @property
+    def n_cases(self) -> int:
+        return self.beam_data.shape[2]
+
+    @property
+    def n_beams(self) -> int:
+        return self.beam_data.shape[1]
+
+    @property
+    def resultant(self) -> np.ndarray:
+        return self.resultant_data.T
+
+    @property
+    def ki_conc(self) -> np.ndarray:
+        return self.beam_data[0].T
+
+    @property
+    def ki_dist(self) -> np.ndarray:
+        return self.beam_data[1].T
+
+    @property
+    def resultant_conc(self) -> np.ndarray:
+        return self.beam_data[2].T
+
+    @property
+    def resultant_dist(self) -> np.ndarray:
+        return self.beam_data[3].T
+
+    def case(self, idx: int):
+        """
+        Returns the result of the idx-th load case, as a DistributionResult with a single load case.
+        """
+        beam_data = np.ascontiguousarray(self.beam_data[:, :, idx:idx + 1])
+        resultant_data = np.ascontiguousarray(self.resultant_data[:, idx:idx + 1])
+        k_conc = self.k_conc[idx:idx + 1]
+        k_dist = self.k_dist[idx:idx + 1]
+        for array in [beam_data, resultant_data]:
+            array.setflags(write=False)
+        return DistributionResult(self.theory, beam_data, resultant_data, k_conc, k_dist)
+
+    def to_pandas(self):
+        """
+        Returns a dataframe with one row for every load case and a column for every quantity and beam
+        (two levels: ki_conc, ki_dist, resultant_conc, resultant_dist and beam 1 to n_beams).
+        The dataframe is a view of the result arrays, without copies.
+        """
+        import pandas as pd
+
+        columns = pd.MultiIndex.from_product([BEAM_QUANTITIES, range(1, self.n_beams + 1)], names=['quantity', 'beam'])
+        index = pd.RangeIndex(self.n_cases, name='case')
+        return pd.DataFrame(self.beam_data.reshape(4 * self.n_beams, self.n_cases).T, index=index, columns=columns, copy=False)
+
+    def to_arrow(self):
+        """
+        Returns a pyarrow Table with one row for every load case, with the columns of the resultant load
+        (conc_force, conc_moment, dist_force, dist_moment) and one column for every quantity and beam (e.g. ki_conc_1).
+        Every column is a view of the result arrays, without copies.
+        """
+        pa = import_optional('pyarrow', 'parquet')
+        columns = {name: pa.array(values) for name, values in zip(RESULTANT_QUANTITIES, self.resultant_data)}
+        for name, values in zip(BEAM_QUANTITIES, self.beam_data):
+            columns.update({f'{name}_{beam + 1}': pa.array(values[beam]) for beam in range(self.n_beams)})
+        return pa.table(columns)
+
+    def rounded(self):
+        """
+        Returns the results rounded for display, with the layout of LoadDistributionBatch.courbon().
+
+        Returns
+        -------
+        [resultant, ki_conc , ki_dist, resultant_conc, resultant_dist]
+        """
+        return (round_builtin(self.resultant, 2),) + tuple(round_builtin(getattr(self, name), DISPLAY_DECIMALS[name]) for name in BEAM_QUANTITIES)
+
+    def __str__(self):
+        df = self.to_pandas().copy()
+        for name, decimals in DISPLAY_DECIMALS.items():
+            df[name] = round_builtin(df[name].to_numpy(), decimals)
+        return f"{self.theory} load distribution, {self.n_cases} load cases\n{df}"
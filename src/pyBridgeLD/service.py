@@ -0,0 +1,174 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from pyBridgeLD.cache import cache_key
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import asyncio
+
+#Time in seconds during which the requests on the same cross section are collected in a single batch
+SERVICE_WINDOW = 0.002
+
+#Maximum number of load cases evaluated by a single batch
+SERVICE_MAX_BATCH = 1024
+
+#Maximum number of requests waiting or running at the same time, further requests wait for a free slot
+SERVICE_MAX_PENDING = 4096
+
+@dataclass
+class _Group:
+    # Requests collected for the same cross section, theory and parameters, evaluated in a single batch
+    cs: geom.Bridge_configuration
+    theory: str
+    parameters: dict
+    tl_configs: list = field(default_factory=list)
+    futures: list = field(default_factory=list)
+    handle: object = None
+
+
+@dataclass
+class DistributionService:
+    """
+    A data class to compute load distributions from asyncio code without blocking the event loop.
+
+    Theories are evaluated by a bounded pool of worker threads. Requests on the same cross section, theory and parameters
+    (and with the same number of loads) received within window seconds are coalesced in a single
+    LoadDistributionBatch, evaluated once for all of them.
+    At most max_pending requests are accepted at the same time, further requests wait for a free slot (backpressure).
+    A request that exceeds its timeout raises asyncio.TimeoutError, without cancelling the batch of the other requests.
+
+        async with pybld.service.DistributionService() as service:
+            result = await service.result(cs, tl_config, 'gmb', E=E, nu=nu, I_l=I_l, I_t=I_t)
+
+    Parameters:
+    max_workers: number of worker threads (ThreadPoolExecutor default as default), not used if executor is given
+    window: collection time of a batch, in seconds (SERVICE_WINDOW as default)
+    max_batch: maximum number of load cases of a batch, a full batch is evaluated at once (SERVICE_MAX_BATCH as default)
+    max_pending: maximum number of requests waiting or running (SERVICE_MAX_PENDING as default)
+    timeout: default timeout of a request in seconds, including the wait for a free slot (None as default, no timeout)
+    executor: concurrent.futures executor to use instead of a new thread pool, not shut down by close()
+
+    n_requests, n_batches and n_pending count the received requests, the evaluated batches and the requests
+    waiting for a slot or for their batch. A service must be used by a single event loop.
+    """
+    max_workers: int = None
+    window: float = SERVICE_WINDOW
+    max_batch: int = SERVICE_MAX_BATCH
+    max_pending: int = SERVICE_MAX_PENDING
+    timeout: float = None
+    executor: object = None
+    n_requests: int = field(default=0, init=False)
+    n_batches: int = field(default=0, init=False)
+    n_pending: int = field(default=0, init=False)
+    _own_executor: bool = field(default=False, init=False, repr=False)
+    _slots: asyncio.Semaphore = field(default=None, init=False, repr=False)
+    _groups: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_batch < 1:
+            raise ValueError(f"Maximum batch size must be at least 1, not {self.max_batch}")
+        if self.max_pending < 1:
+            raise ValueError(f"Maximum number of pending requests must be at least 1, not {self.max_pending}")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pyBridgeLD')
+            self._own_executor = True
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Shut down the worker threads created by the service, waiting for the running batches.
+        """
+        if self._own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def result(self, cs: geom.Bridge_configuration, tl_config: tl.TL_configuration, theory: str = 'courbon',
+                     timeout: float = None, **parameters):
+        """
+        The function returns the load distribution of a traffic load configuration, as LoadDistribution.result(),
+        computed in a worker thread together with the concurrent requests on the same cross section.
+
+        theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+        timeout: timeout of the request in seconds (the timeout of the service as default)
+        parameters: parameters of the theory, e.g. E, nu, I_l, I_t for gmb() and grillage()
+        """
+        if theory not in ['courbon', 'engesser', 'gmb', 'grillage']:
+            raise ValueError(f"Theory must be 'courbon', 'engesser', 'gmb' or 'grillage', not {theory}")
+        # Loads are checked here, so that an invalid configuration does not fail the batch of the other requests
+        n_loads = (len(tl_config.conc_ecc), len(tl_config.dist_ecc))
+        timeout = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(self._request(cs, tl_config, theory, parameters, n_loads), timeout)
+
+    async def gmb(self, cs: geom.Bridge_configuration, tl_config: tl.TL_configuration, E: list[float], nu: float,
+                  I_l: list[float], I_t: list[float], timeout: float = None, **parameters):
+        """
+        Shortcut of result() for the GMB theory.
+        """
+        return await self.result(cs, tl_config, 'gmb', timeout, E=E, nu=nu, I_l=I_l, I_t=I_t, **parameters)
+
+    async def _request(self, cs, tl_config, theory, parameters, n_loads):
+        self.n_pending += 1
+        try:
+            async with self._slots:
+                future = self._submit(cs, tl_config, theory, parameters, n_loads)
+                # The batch is shared with other requests: a timeout of this request must not cancel it
+                result, idx = await asyncio.shield(future)
+        finally:
+            self.n_pending -= 1
+        return result.case(idx)
+
+    def _submit(self, cs, tl_config, theory, parameters, n_loads) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = (cache_key(cs, theory, parameters), n_loads)
+        group = self._groups.get(key)
+        if group is None:
+            group = _Group(cs, theory, parameters)
+            group.handle = loop.call_later(self.window, self._flush, key)
+            self._groups[key] = group
+        future = loop.create_future()
+        group.tl_configs.append(tl_config)
+        group.futures.append(future)
+        self.n_requests += 1
+        if len(group.futures) >= self.max_batch:
+            group.handle.cancel()
+            self._flush(key)
+        return future
+
+    def _flush(self, key):
+        group = self._groups.pop(key, None)
+        if group is None:
+            return
+        self.n_batches += 1
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, _evaluate, group.cs, group.tl_configs, group.theory, group.parameters)
+        task.add_done_callback(lambda task: _dispatch(task, group.futures))
+
+
+def _evaluate(cs, tl_configs, theory, parameters):
+    tl_batch = tl.TL_batch.from_configurations(tl_configs)
+    return ld.LoadDistributionBatch(cs=cs, tl_batch=tl_batch).result(theory, **parameters)
+
+
+def _dispatch(task, futures):
+    # Results (or the error) of a batch are delivered to every request that is still waiting
+    if task.cancelled():
+        for future in futures:
+            future.cancel()
+        return
+    error = task.exception()
+    for idx, future in enumerate(futures):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+            # Requests already timed out do not retrieve the error
+            future.add_done_callback(lambda future: future.exception())
+            continue
+        future.set_result((task.result(), idx))
@@ -0,0 +1,166 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from pyBridgeLD._rounding import round_builtin
+from dataclasses import dataclass, field
+import numpy as np
+
+#Number of updates after which the running sums are computed again from scratch, to bound the round-off drift
+SESSION_REFRESH = 10_000
+
+@dataclass
+class DistributionSession:
+    """
+    A data class to update the load distribution when the vehicles of a traffic load configuration move or change loads,
+    e.g. in an interactive placement tool.
+
+    The session keeps the running sums of the loads, of load * eccentricity and of the load taken by every beam,
+    together with the contribution of every load. Loads are built by TL_configuration, so that weights and eccentricities
+    are paired as in LoadDistribution.result(), also for vehicles with a different number of weights and eccentricities.
+    When a vehicle moves, or changes loads without changing their number, only its loads are evaluated again
+    and their old contributions are replaced with the new ones, in O(n_beams) operations for every load of the vehicle;
+    other changes of the vehicle compute again all the loads, see refresh().
+    Results are at full precision, with the same definitions of LoadDistribution.result().
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    tl_config: tl.TL_configuration, initial position of the vehicles
+    theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+    stiffness: dictionary with E, nu, I_l, I_t parameters, needed for 'gmb' and 'grillage' theories
+    """
+    cs: geom.Bridge_configuration
+    tl_config: tl.TL_configuration
+    theory: str = 'courbon'
+    stiffness: dict = None
+    n_updates: int = field(default=0, init=False)
+    _veh_list: list = field(default=None, init=False, repr=False)
+    _veh_ecc: list = field(default=None, init=False, repr=False)
+    _weights: np.ndarray = field(default=None, init=False, repr=False)
+    _ecc: np.ndarray = field(default=None, init=False, repr=False)
+    _weight_offsets: np.ndarray = field(default=None, init=False, repr=False)
+    _ecc_offsets: np.ndarray = field(default=None, init=False, repr=False)
+    _contribution: np.ndarray = field(default=None, init=False, repr=False)
+    _sums: np.ndarray = field(default=None, init=False, repr=False)
+    _share: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._share = ld._share_function(self.cs, self.theory, self.stiffness)
+        self._veh_list = list(self.tl_config.veh_list)
+        self._veh_ecc = [float(ecc) for ecc in self.tl_config.veh_ecc[:len(self._veh_list)]]
+        self.refresh()
+
+    def _contribution_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Returns the contribution of the loads of the rows to the running sums, an array (n_rows x (4 + 2 * n_beams)):
+        [conc_force, conc_moment, dist_force, dist_moment, load of every beam from concentrated loads, from distributed loads].
+        Concentrated loads are the first rows, then a distributed load veh_width * veh_load_dist for every vehicle.
+        """
+        n_conc = len(self._weights) - len(self._veh_list)
+        n_beams = self.cs.n_beams
+        weights = self._weights[rows]
+        ecc = self._ecc[rows]
+        conc = rows < n_conc
+        weighted = weights[:, None] * self._share(ecc)
+
+        contribution = np.zeros((len(rows), 4 + 2 * n_beams))
+        contribution[conc, 0] = weights[conc]
+        contribution[~conc, 2] = weights[~conc]
+        contribution[:, 1] = contribution[:, 0] * ecc
+        contribution[:, 3] = contribution[:, 2] * ecc
+        contribution[conc, 4:4 + n_beams] = weighted[conc]
+        contribution[~conc, 4 + n_beams:] = weighted[~conc]
+        return contribution
+
+    def _vehicle_ecc(self, idx: int) -> np.ndarray:
+        # Eccentricities of the concentrated loads of idx-th vehicle, as TL_configuration.tl_conc()
+        spacing = np.asarray(self._veh_list[idx].veh_load_conc_spacing, dtype=float)
+        ecc = self._veh_ecc[idx]
+        return round_builtin(np.column_stack([ecc - spacing / 2, ecc + spacing / 2]).ravel(), 2)
+
+    def refresh(self):
+        """
+        Compute again the loads from a TL_configuration, the contribution of every load and the running sums.
+        """
+        tl_config = self.tl_configuration()
+        n_conc = len(tl_config.conc_weights)
+        self._weights = np.concatenate([tl_config.conc_weights, tl_config.dist_weights])
+        self._ecc = np.concatenate([tl_config.conc_ecc, tl_config.dist_ecc])
+        self._weight_offsets = np.cumsum([0] + [len(vehicle.veh_load_conc) for vehicle in self._veh_list])
+        self._ecc_offsets = np.minimum(np.cumsum([0] + [2 * len(vehicle.veh_load_conc_spacing) for vehicle in self._veh_list]), n_conc)
+        self._contribution = self._contribution_rows(np.arange(len(self._weights)))
+        self._sums = self._contribution.sum(axis=0)
+        self.n_updates = 0
+
+    def _update(self, rows: np.ndarray):
+        new = self._contribution_rows(rows)
+        self._sums += new.sum(axis=0) - self._contribution[rows].sum(axis=0)
+        self._contribution[rows] = new
+        self.n_updates += 1
+        if self.n_updates >= SESSION_REFRESH:
+            self.refresh()
+
+    def _place_vehicle(self, idx: int, weights: bool) -> np.ndarray:
+        # Update the eccentricities of idx-th vehicle, returns the rows of its loads (and of its weights) to evaluate again
+        n_conc = len(self._weights) - len(self._veh_list)
+        start, stop = self._ecc_offsets[idx], self._ecc_offsets[idx + 1]
+        self._ecc[start:stop] = self._vehicle_ecc(idx)[:stop - start]
+        self._ecc[n_conc + idx] = self._veh_ecc[idx]
+        rows = [np.arange(start, stop), [n_conc + idx]]
+        if weights:
+            rows.append(np.arange(self._weight_offsets[idx], self._weight_offsets[idx + 1]))
+        return np.unique(np.concatenate(rows)).astype(int)
+
+    def move(self, idx: int, veh_ecc: float):
+        """
+        Move idx-th vehicle to the eccentricity veh_ecc.
+        """
+        self._veh_ecc[idx] = float(veh_ecc)
+        self._update(self._place_vehicle(idx, weights=False))
+
+    def set_vehicle(self, idx: int, vehicle: tl.Vehicle):
+        """
+        Replace idx-th vehicle, e.g. with new loads, keeping its eccentricity.
+        """
+        old = self._veh_list[idx]
+        self._veh_list[idx] = vehicle
+        if (len(vehicle.veh_load_conc) != len(old.veh_load_conc)
+                or len(vehicle.veh_load_conc_spacing) != len(old.veh_load_conc_spacing)):
+            # The loads of the other vehicles are paired with other eccentricities
+            self.refresh()
+            return
+        n_conc = len(self._weights) - len(self._veh_list)
+        self._weights[self._weight_offsets[idx]:self._weight_offsets[idx + 1]] = vehicle.veh_load_conc
+        self._weights[n_conc + idx] = vehicle.veh_load_dist * vehicle.veh_width
+        self._update(self._place_vehicle(idx, weights=True))
+
+    def tl_configuration(self) -> tl.TL_configuration:
+        """
+        Returns the current position of the vehicles as a TL_configuration.
+        """
+        return tl.TL_configuration(veh_list=list(self._veh_list), veh_ecc=list(self._veh_ecc))
+
+    @property
+    def resultant(self) -> np.ndarray:
+        """
+        Returns an array of total vertical force and moment for concentrated and distributed loads.
+        """
+        return self._sums[:4].copy()
+
+    @property
+    def resultant_conc(self) -> np.ndarray:
+        return self._sums[4:4 + self.cs.n_beams].copy()
+
+    @property
+    def resultant_dist(self) -> np.ndarray:
+        return self._sums[4 + self.cs.n_beams:].copy()
+
+    @property
+    def ki_conc(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.resultant_conc / self._sums[0]
+
+    @property
+    def ki_dist(self) -> np.ndarray:
+        if self._sums[2] == 0:
+            return self._share(np.array(self._veh_ecc)).mean(axis=0)
+        return self.resultant_dist / self._sums[2]
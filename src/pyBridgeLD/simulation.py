@@ -0,0 +1,323 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import load_distribution as ld
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import numpy as np
+
+import math
+
+#Maximum number of events sampled at once, memory of a worker does not grow beyond it
+SIMULATION_CHUNK = 100_000
+
+#Euler-Mascheroni constant, for the Gumbel fit with the method of moments
+EULER_GAMMA = 0.5772156649015329
+
+@dataclass
+class VehicleClass:
+    """
+    A data class that defines a class of vehicles of a random traffic population.
+
+    Parameters:
+    probability: relative frequency of the class in the traffic
+    weight_mean: mean gross weight of the vehicles
+    weight_cov: coefficient of variation of the gross weight, lognormal distribution
+    axle_fractions: share of the gross weight taken by every axle (sum 1)
+    axle_spacing: mean spacings between consecutive axles (n_axles - 1 values)
+    spacing_cov: coefficient of variation of the axle spacings, lognormal distribution (0.05 as default)
+    veh_width: width of the vehicle (2.50 as default)
+    track_width: transversal distance between the wheels of an axle (2.00 as default)
+    """
+    probability: float
+    weight_mean: float
+    weight_cov: float
+    axle_fractions: list[float]
+    axle_spacing: list[float]
+    spacing_cov: float = 0.05
+    veh_width: float = 2.50
+    track_width: float = 2.00
+
+    def __post_init__(self):
+        if len(self.axle_spacing) != len(self.axle_fractions) - 1:
+            raise ValueError(f"A vehicle with {len(self.axle_fractions)} axles needs {len(self.axle_fractions) - 1} axle spacings, "
+                             f"not {len(self.axle_spacing)}")
+
+
+@dataclass
+class TrafficModel:
+    """
+    A data class that defines a random traffic on the carriageway, as a sequence of independent events.
+    In every event each lane is occupied by one vehicle, with a given probability, and the vehicles of the lanes
+    cross the deck side by side.
+
+    Parameters:
+    classes: list of VehicleClass objects
+    lane_ecc: eccentricity of the centre of every lane
+    lane_occupancy: probability that a lane is occupied in an event, one value for every lane
+    lateral_std: standard deviation of the lateral position of the vehicles around the lane centre (0.30 as default)
+    """
+    classes: list[VehicleClass]
+    lane_ecc: list[float]
+    lane_occupancy: list[float]
+    lateral_std: float = 0.30
+
+    def __post_init__(self):
+        if len(self.lane_ecc) != len(self.lane_occupancy):
+            raise ValueError(f"Lane occupancy must have one value for every lane, not {len(self.lane_occupancy)}")
+
+    def sample(self, rng: np.random.Generator, n_events: int, half_width: float) -> dict:
+        """
+        Returns a dictionary of arrays with n_events random events, for every lane (n_events x n_lanes):
+        present, weight, ecc, veh_width, track_width; and for every axle (n_events x n_lanes x max_axles):
+        axle_loads, axle_position (from the first axle, padded axles have zero load).
+
+        half_width: half width of the carriageway, vehicles are kept inside it
+        """
+        n_lanes = len(self.lane_ecc)
+        size = (n_events, n_lanes)
+        probability = np.array([vehicle.probability for vehicle in self.classes], dtype=float)
+        vehicle_class = rng.choice(len(self.classes), size=size, p=probability / probability.sum())
+        present = rng.random(size) < np.asarray(self.lane_occupancy, dtype=float)
+
+        #Parameters of every class, as arrays indexed by the class of every vehicle
+        max_axles = max([len(vehicle.axle_fractions) for vehicle in self.classes])
+        fractions = np.zeros((len(self.classes), max_axles))
+        spacing = np.zeros((len(self.classes), max_axles))
+        for idx, vehicle in enumerate(self.classes):
+            fractions[idx, :len(vehicle.axle_fractions)] = vehicle.axle_fractions
+            spacing[idx, 1:len(vehicle.axle_fractions)] = vehicle.axle_spacing
+        weight_mean, weight_cov, spacing_cov, veh_width, track_width = (
+            np.array([getattr(vehicle, name) for vehicle in self.classes], dtype=float)[vehicle_class]
+            for name in ['weight_mean', 'weight_cov', 'spacing_cov', 'veh_width', 'track_width'])
+
+        weight = _lognormal(rng, weight_mean, weight_cov) * present
+        axle_loads = weight[:, :, None] * fractions[vehicle_class]
+        spacing_cov = np.broadcast_to(spacing_cov[:, :, None], axle_loads.shape)
+        axle_position = np.cumsum(_lognormal(rng, spacing[vehicle_class], spacing_cov), axis=2)
+
+        limit = half_width - veh_width / 2
+        ecc = np.clip(np.asarray(self.lane_ecc, dtype=float) + self.lateral_std * rng.standard_normal(size), -limit, limit)
+        return {'present': present, 'weight': weight, 'ecc': ecc, 'veh_width': veh_width, 'track_width': track_width,
+                'axle_loads': axle_loads, 'axle_position': axle_position}
+
+
+def _lognormal(rng: np.random.Generator, mean: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    """
+    Returns lognormal random values with the given means and coefficients of variation (zero means return zeros).
+    """
+    sigma = np.sqrt(np.log1p(np.square(cov)))
+    with np.errstate(divide='ignore'):
+        mu = np.log(mean) - sigma ** 2 / 2
+    return np.exp(mu + sigma * rng.standard_normal(np.shape(mean)))
+
+
+def midspan_moment(beam_length: float, axle_loads: np.ndarray, axle_position: np.ndarray) -> np.ndarray:
+    """
+    Returns the maximum midspan bending moment of a simply supported beam crossed by axle trains.
+    The influence line at midspan (see longitudinal.influence_lines()) has its peak at midspan, so the maximum is reached
+    with one of the axles at midspan: all of them are tried at once.
+
+    axle_loads, axle_position: arrays (... x n_axles) of loads and positions of the axles of every train
+    """
+    half = beam_length / 2
+    distance = np.abs(axle_position[..., :, None] - axle_position[..., None, :])
+    influence = np.maximum(half - distance, 0.0) / 2
+    return np.einsum('...i,...ij->...j', axle_loads, influence).max(axis=-1)
+
+
+@dataclass
+class SimulationResult:
+    """
+    A data class to store the maxima of a Monte Carlo simulation.
+
+    Parameters:
+    n_events: number of simulated events
+    events_per_maximum: number of events of every period of the maxima (e.g. the traffic of a day)
+    load: array (n_periods x n_beams) with the maximum load of every beam in every period
+    moment: array (n_periods x n_beams) with the maximum midspan bending moment of every beam in every period
+            (NaN if beam_length is 0)
+    """
+    n_events: int
+    events_per_maximum: int
+    load: np.ndarray
+    moment: np.ndarray
+
+    def gumbel(self, effect: str = 'load', method: str = 'moments'):
+        """
+        Fit a Gumbel (extreme value type I) distribution to the maxima of every beam.
+
+        effect: 'load' or 'moment' ('load' as default)
+        method: 'moments' for the method of moments, 'ml' for maximum likelihood (scipy) ('moments' as default)
+
+        Returns
+        -------
+        [location, scale]
+
+        location, scale: arrays (n_beams) with the parameters of the distribution of every beam
+        """
+        maxima = self._maxima(effect)
+        if method == 'moments':
+            scale = maxima.std(axis=0, ddof=1) * math.sqrt(6) / math.pi
+            location = maxima.mean(axis=0) - EULER_GAMMA * scale
+        elif method == 'ml':
+            from scipy import stats
+
+            location, scale = np.array([stats.gumbel_r.fit(values) for values in maxima.T]).T
+        else:
+            raise ValueError(f"Method must be 'moments' or 'ml', not {method}")
+        return location, scale
+
+    def return_level(self, return_period: float, effect: str = 'load', method: str = 'moments') -> np.ndarray:
+        """
+        Returns the value of every beam exceeded on average once every return_period periods, from the Gumbel fit.
+        """
+        if return_period <= 1:
+            raise ValueError(f"Return period must be greater than 1, not {return_period}")
+        location, scale = self.gumbel(effect, method)
+        return location - scale * math.log(-math.log(1 - 1 / return_period))
+
+    def _maxima(self, effect: str) -> np.ndarray:
+        if effect not in ['load', 'moment']:
+            raise ValueError(f"Effect must be 'load' or 'moment', not {effect}")
+        if effect == 'moment' and np.isnan(self.moment).all():
+            raise ValueError(f"Moments are not available, beam_length of the cross section must be greater than 0")
+        return getattr(self, effect)
+
+
+@dataclass
+class MonteCarloSimulation:
+    """
+    A data class to simulate random traffic on a deck and collect the maxima of the load of every beam.
+
+    Events are grouped in periods of events_per_maximum events, and the maximum of every period is kept.
+    Every period has its own random stream, child idx of numpy.random.SeedSequence(seed), so that the results depend
+    only on the seed and not on the number of processes or on the order of the tasks.
+    The load of every beam is the sum over the vehicles of the event of the vehicle weight times the share of the beam,
+    with the two wheels of every axle at -/+ track_width/2; the moment of every beam sums the maximum midspan moments
+    of the vehicles times the same shares, as if the vehicles of an event reached midspan together (conservative).
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    traffic: TrafficModel
+    theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+    stiffness: dictionary with E, nu, I_l, I_t parameters, needed for 'gmb' and 'grillage' theories
+    events_per_maximum: number of events of every period (10000 as default)
+    seed: seed of the random streams (None as default, a new random seed, see seed_entropy)
+    """
+    cs: geom.Bridge_configuration
+    traffic: TrafficModel
+    theory: str = 'courbon'
+    stiffness: dict = None
+    events_per_maximum: int = 10_000
+    seed: int = None
+    seed_entropy: int = field(default=None, init=False)
+    _share: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        # Entropy of the root SeedSequence, stored so that a run without seed can be repeated
+        self.seed_entropy = np.random.SeedSequence(self.seed).entropy
+        self._share = ld._share_function(self.cs, self.theory, self.stiffness)
+
+    def __getstate__(self):
+        # The share function is built again by the worker processes, closures cannot be pickled
+        state = self.__dict__.copy()
+        state['_share'] = None
+        return state
+
+    def evaluate(self, events: dict):
+        """
+        Returns the load and the midspan moment of every beam for every event of TrafficModel.sample().
+
+        Returns
+        -------
+        [load, moment]
+
+        load, moment: arrays (n_events x n_beams)
+        """
+        if self._share is None:
+            self._share = ld._share_function(self.cs, self.theory, self.stiffness)
+        shape = events['ecc'].shape
+        track = events['track_width'] / 2
+        wheels = np.concatenate([(events['ecc'] - track).ravel(), (events['ecc'] + track).ravel()])
+        share = self._share(wheels).reshape((2,) + shape + (self.cs.n_beams,)).mean(axis=0)
+
+        load = np.einsum('el,elb->eb', events['weight'], share)
+        if self.cs.beam_length > 0:
+            moment = midspan_moment(self.cs.beam_length, events['axle_loads'], events['axle_position'])
+            moment = np.einsum('el,elb->eb', moment, share)
+        else:
+            moment = np.full_like(load, np.nan)
+        return load, moment
+
+    def periods(self, start: int, stop: int):
+        """
+        Simulate the periods from start to stop (excluded).
+
+        Returns
+        -------
+        [load, moment]
+
+        load, moment: arrays ((stop - start) x n_beams) with the maxima of every period
+        """
+        half_width = self.cs.cw_width / 2
+        load = np.empty((stop - start, self.cs.n_beams))
+        moment = np.empty((stop - start, self.cs.n_beams))
+        for row, idx in enumerate(range(start, stop)):
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed_entropy, spawn_key=(idx,)))
+            load[row] = -np.inf
+            # Moments are NaN without a span, np.maximum keeps them NaN
+            moment[row] = -np.inf if self.cs.beam_length > 0 else np.nan
+            for first in range(0, self.events_per_maximum, SIMULATION_CHUNK):
+                n_events = min(SIMULATION_CHUNK, self.events_per_maximum - first)
+                events = self.traffic.sample(rng, n_events, half_width)
+                chunk_load, chunk_moment = self.evaluate(events)
+                load[row] = np.maximum(load[row], chunk_load.max(axis=0))
+                moment[row] = np.maximum(moment[row], chunk_moment.max(axis=0))
+        return load, moment
+
+    def run(self, n_events: int, processes: int = None, chunksize: int = None, progress=None) -> SimulationResult:
+        """
+        The function simulates n_events events (rounded up to whole periods) and returns the maxima of every period.
+
+        n_events: number of events to simulate
+        processes: number of worker processes, every chunk of periods is an independent task (None to use the current process,
+                   os.cpu_count() to use every core)
+        chunksize: number of periods of every task (None to give about 4 tasks to every process)
+        progress: optional function called with the number of simulated events and the total number of events, after every task
+        """
+        n_periods = max(1, math.ceil(n_events / self.events_per_maximum))
+        if chunksize is None:
+            chunksize = max(1, math.ceil(n_periods / (4 * (processes or 1))))
+        chunks = [(start, min(start + chunksize, n_periods)) for start in range(0, n_periods, chunksize)]
+        total = n_periods * self.events_per_maximum
+
+        load = np.empty((n_periods, self.cs.n_beams))
+        moment = np.empty((n_periods, self.cs.n_beams))
+        done = 0
+        if processes is None:
+            for start, stop in chunks:
+                load[start:stop], moment[start:stop] = self.periods(start, stop)
+                done += (stop - start) * self.events_per_maximum
+                if progress is not None:
+                    progress(done, total)
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self,)) as executor:
+                futures = {executor.submit(_simulate_chunk, start, stop): (start, stop) for start, stop in chunks}
+                for future in as_completed(futures):
+                    start, stop = futures[future]
+                    load[start:stop], moment[start:stop] = future.result()
+                    done += (stop - start) * self.events_per_maximum
+                    if progress is not None:
+                        progress(done, total)
+        return SimulationResult(total, self.events_per_maximum, load, moment)
+
+
+#Simulation of the worker process, set once by the initializer of the pool
+_worker_simulation = None
+
+def _init_worker(simulation: MonteCarloSimulation):
+    global _worker_simulation
+    _worker_simulation = simulation
+
+
+def _simulate_chunk(start: int, stop: int):
+    return _worker_simulation.periods(start, stop)
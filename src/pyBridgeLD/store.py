@@ -0,0 +1,237 @@
+from pyBridgeLD import results as res
+from dataclasses import dataclass, field
+import numpy as np
+
+import json
+import os
+
+#Name and version of the result store format
+STORE_FORMAT = 'pyBridgeLD-store'
+STORE_VERSION = 1
+
+#Name of the index file of a store
+STORE_INDEX = 'index.jsonl'
+
+#Default number of load cases of every chunk file
+STORE_CHUNK_SIZE = 65_536
+
+@dataclass
+class ResultStore:
+    """
+    A data class to store the results of large studies on disk, in chunked memory-mapped arrays, and read them lazily.
+
+    Every result is a set of quantities with one value for every load case and beam (e.g. ki_conc, ki_dist,
+    resultant_conc and resultant_dist of results.DistributionResult). Load cases are appended in batches and
+    written in chunk files of chunk_size cases, chunk_00000.npy, chunk_00001.npy, ..., every one an array
+    (n_quantities x n_beams x chunk_size), so that a beam of a range of cases is a contiguous slice of every chunk.
+    Batches with fewer beams than n_beams are padded with NaN.
+
+    The index file index.jsonl has a header line with the layout of the store, then one line for every batch
+    with its range of cases (start, stop) and its inputs, e.g. the parameters of the deck or the seed of the simulation.
+    A batch is added to the index only after its values are written, so that an interrupted study can be opened
+    again and continued from the last complete batch.
+
+    Parameters:
+    directory: path of the store, created if missing. An existing store is opened with its layout
+    n_beams: number of beams of every result (None to take it from the store, or from the first batch)
+    quantities: names of the quantities (results.BEAM_QUANTITIES as default)
+    chunk_size: number of load cases of every chunk file (STORE_CHUNK_SIZE as default)
+    """
+    directory: str
+    n_beams: int = None
+    quantities: tuple[str] = res.BEAM_QUANTITIES
+    chunk_size: int = STORE_CHUNK_SIZE
+    records: list[dict] = field(default_factory=list, init=False, repr=False)
+    _starts: np.ndarray = field(default=None, init=False, repr=False)
+    _writer: tuple = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.directory = os.fspath(self.directory)
+        self.quantities = tuple(self.quantities)
+        index = os.path.join(self.directory, STORE_INDEX)
+        if os.path.exists(index):
+            with open(index) as file:
+                text = file.read()
+            lines = [line for line in text.splitlines() if line.strip()]
+            header = json.loads(lines[0])
+            if header.get('format') != STORE_FORMAT:
+                raise ValueError(f"Directory {self.directory} is not a {STORE_FORMAT} store")
+            if header.get('version') is None or int(header['version']) > STORE_VERSION:
+                raise ValueError(f"Store version {header.get('version')} is not supported, the greatest supported version is {STORE_VERSION}")
+            if self.n_beams is not None and self.n_beams != header['n_beams']:
+                raise ValueError(f"Store {self.directory} has {header['n_beams']} beams, not {self.n_beams}")
+            self.n_beams = header['n_beams']
+            self.quantities = tuple(header['quantities'])
+            self.chunk_size = header['chunk_size']
+            # Lines after an interrupted write of the index are ignored, and removed before the next batch
+            for line in lines[1:]:
+                try:
+                    self.records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+            if len(self.records) < len(lines) - 1 or not text.endswith('\n'):
+                self._write_index()
+        else:
+            if self.chunk_size < 1:
+                raise ValueError(f"Chunk size must be at least 1, not {self.chunk_size}")
+            os.makedirs(self.directory, exist_ok=True)
+            if self.n_beams is not None:
+                self._write_index()
+        self._starts = np.array([record['start'] for record in self.records], dtype=int)
+
+    @property
+    def n_cases(self) -> int:
+        return self.records[-1]['stop'] if self.records else 0
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self.n_cases // self.chunk_size)
+
+    def path(self, chunk: int) -> str:
+        return os.path.join(self.directory, f'chunk_{chunk:05d}.npy')
+
+    def append(self, result, inputs: dict = None) -> tuple[int]:
+        """
+        Write a batch of load cases at the end of the store and add it to the index.
+
+        result: results.DistributionResult, or dictionary with an array (n_cases x n_beams) for every quantity of the store
+        inputs: optional dictionary of JSON values, stored in the index with the range of cases of the batch
+
+        Returns
+        -------
+        start, stop: range of the cases of the batch in the store
+        """
+        if isinstance(result, res.DistributionResult):
+            result = {name: getattr(result, name) for name in res.BEAM_QUANTITIES}
+        missing = [name for name in self.quantities if name not in result]
+        if missing:
+            raise ValueError(f"Quantities {missing} are missing from the batch")
+        values = np.stack([np.atleast_2d(result[name]) for name in self.quantities], axis=1)
+        n_cases, _, n_beams = values.shape
+        if self.n_beams is None:
+            self.n_beams = n_beams
+            self._write_index()
+        if n_beams > self.n_beams:
+            raise ValueError(f"Batch has {n_beams} beams, the store has {self.n_beams} beams")
+
+        start = self.n_cases
+        position = start
+        while position < start + n_cases:
+            chunk, offset = divmod(position, self.chunk_size)
+            size = min(self.chunk_size - offset, start + n_cases - position)
+            array = self._chunk_writer(chunk)
+            array[:, :n_beams, offset:offset + size] = values[position - start:position - start + size].transpose(1, 2, 0)
+            array[:, n_beams:, offset:offset + size] = np.nan
+            array.flush()
+            position += size
+
+        record = {'start': start, 'stop': start + n_cases, 'inputs': inputs}
+        with open(os.path.join(self.directory, STORE_INDEX), 'a') as file:
+            file.write(json.dumps(record, default=_json_value) + '\n')
+        self.records.append(record)
+        self._starts = np.append(self._starts, start)
+        return start, start + n_cases
+
+    def record(self, idx: int) -> dict:
+        """
+        Returns the index record of the batch of the idx-th load case, with start, stop and inputs of the batch.
+        """
+        if not 0 <= idx < self.n_cases:
+            raise IndexError(f"Load case {idx} is not in the store, that has {self.n_cases} load cases")
+        return self.records[np.searchsorted(self._starts, idx, side='right') - 1]
+
+    def blocks(self, start: int = 0, stop: int = None, quantities: list[str] = None, beams=None):
+        """
+        Iterate over a range of load cases one chunk at a time, without loading the store in memory.
+
+        start, stop: range of the load cases (all the cases as default)
+        quantities: names of the quantities to read (all the quantities as default)
+        beams: index, slice or list of indices of the beams to read, from 0 (all the beams as default)
+
+        Returns
+        -------
+        Generator of (start, values), with the index of the first case of the block and a dictionary
+        with an array (n_cases x n_beams) for every quantity, read-only views of the memory-mapped chunk file
+        """
+        stop = self.n_cases if stop is None else min(stop, self.n_cases)
+        quantities = self.quantities if quantities is None else quantities
+        rows = [self.quantities.index(name) for name in quantities]
+        beams = slice(None) if beams is None else beams
+        position = max(start, 0)
+        while position < stop:
+            chunk, offset = divmod(position, self.chunk_size)
+            size = min(self.chunk_size - offset, stop - position)
+            array = np.load(self.path(chunk), mmap_mode='r')
+            yield position, {name: array[row, beams, offset:offset + size].T for name, row in zip(quantities, rows)}
+            position += size
+
+    def read(self, quantity: str, start: int = 0, stop: int = None, beams=None) -> np.ndarray:
+        """
+        Returns the values of a quantity for a range of load cases, as an array (n_cases x n_beams) in memory.
+
+        start, stop, beams: same definitions of blocks()
+        """
+        if quantity not in self.quantities:
+            raise ValueError(f"Quantity {quantity} is not in the store, quantities are {list(self.quantities)}")
+        blocks = [values[quantity] for _, values in self.blocks(start, stop, [quantity], beams)]
+        if not blocks:
+            return np.empty((0, self.n_beams or 0))[:, slice(None) if beams is None else beams]
+        return np.concatenate(blocks)
+
+    def envelope(self, quantity: str, start: int = 0, stop: int = None):
+        """
+        The function returns the minimum and the maximum of a quantity for every beam, streaming over the chunks.
+        Padded beams, and beams without values, are NaN.
+
+        Returns
+        -------
+        [minimum, maximum]
+
+        minimum, maximum: arrays (n_beams)
+        """
+        minimum = np.full(self.n_beams or 0, np.inf)
+        maximum = np.full(self.n_beams or 0, -np.inf)
+        for _, values in self.blocks(start, stop, [quantity]):
+            np.fmin(minimum, np.fmin.reduce(values[quantity], axis=0), out=minimum)
+            np.fmax(maximum, np.fmax.reduce(values[quantity], axis=0), out=maximum)
+        minimum[np.isinf(minimum)] = np.nan
+        maximum[np.isinf(maximum)] = np.nan
+        return minimum, maximum
+
+    def _write_index(self):
+        # The index is written to a temporary file and then renamed, so that it is never partial
+        header = {'format': STORE_FORMAT, 'version': STORE_VERSION, 'n_beams': self.n_beams,
+                  'quantities': list(self.quantities), 'chunk_size': self.chunk_size}
+        index = os.path.join(self.directory, STORE_INDEX)
+        with open(f'{index}.tmp', 'w') as file:
+            file.write(json.dumps(header) + '\n')
+            file.writelines(json.dumps(record) + '\n' for record in self.records)
+        os.replace(f'{index}.tmp', index)
+
+    def _chunk_writer(self, chunk: int):
+        # Only the chunk being written is kept open, the file is created with its full size
+        if self._writer is None or self._writer[0] != chunk:
+            path = self.path(chunk)
+            if os.path.exists(path):
+                array = np.load(path, mmap_mode='r+')
+            else:
+                shape = (len(self.quantities), self.n_beams, self.chunk_size)
+                array = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+            self._writer = (chunk, array)
+        return self._writer[1]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_writer'] = None
+        return state
+
+
+def _json_value(value):
+    """
+    Converts NumPy arrays and scalars of the inputs to JSON values.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Input of type {type(value).__name__} cannot be stored in the index")
@@ -0,0 +1,176 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import traffic_load as tl
+from pyBridgeLD import load_distribution as ld
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import MISSING, dataclass, field, fields
+import numpy as np
+
+import math
+
+#Parameters of the grid that define the cross section and the stiffness of the deck
+GEOMETRY_PARAMETERS = tuple(item.name for item in fields(geom.Bridge_configuration) if item.init)
+STIFFNESS_PARAMETERS = ('E', 'nu', 'I_l', 'I_t')
+
+#Fields of Bridge_configuration without a default, every grid must define them
+REQUIRED_PARAMETERS = tuple(item.name for item in fields(geom.Bridge_configuration)
+                            if item.init and item.default is MISSING and item.default_factory is MISSING)
+
+#Maximum number of grid points evaluated by a single task
+STUDY_CHUNK_SIZE = 10_000
+
+@dataclass
+class ParametricStudy:
+    """
+    A data class to evaluate a load distribution theory on the Cartesian product of ranges of parameters.
+
+    Every point of the grid is an independent cross section, loaded by all the traffic load configurations at once.
+    The grid is split in chunks of consecutive points: worker processes receive the study once, when they start,
+    and every task is just the range of points of a chunk, decoded from the flat index of the grid.
+
+    Parameters:
+    parameters: dictionary with a sequence of values for every parameter of the grid, among the fields of
+                geometry.Bridge_configuration and the stiffness parameters E, nu, I_l, I_t (e.g. {'n_beams': [3, 4, 5]}).
+                The fields of Bridge_configuration without a default (cw_width, n_beams, beam_spacing) are required.
+                Stiffness parameters are needed for 'gmb' and 'grillage' theories, values of E, I_l and I_t are lists.
+    tl_configs: A list of pre-defined TL_configuration objects, the load cases of every point of the grid
+    theory: 'courbon', 'engesser', 'gmb' or 'grillage' ('courbon' as default)
+    """
+    parameters: dict
+    tl_configs: list[tl.TL_configuration]
+    theory: str = 'courbon'
+    _tl_batch: tl.TL_batch = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        for name in self.parameters:
+            if name not in GEOMETRY_PARAMETERS + STIFFNESS_PARAMETERS:
+                raise ValueError(f"Parameter {name} is not a field of Bridge_configuration or a stiffness parameter")
+        missing = [name for name in REQUIRED_PARAMETERS if name not in self.parameters]
+        if missing:
+            raise ValueError(f"Parameters {missing} are required fields of Bridge_configuration and must be in the grid")
+        if self.theory not in ['courbon', 'engesser', 'gmb', 'grillage']:
+            raise ValueError(f"Theory must be 'courbon', 'engesser', 'gmb' or 'grillage', not {self.theory}")
+        if self.theory in ['gmb', 'grillage']:
+            missing = [name for name in STIFFNESS_PARAMETERS if name not in self.parameters]
+            if missing:
+                raise ValueError(f"Stiffness parameters {missing} are needed for {self.theory} theory")
+        self._tl_batch = tl.TL_batch.from_configurations(self.tl_configs)
+
+    @property
+    def shape(self) -> tuple[int]:
+        """
+        Returns the number of values of every parameter, in the order of the parameters dictionary.
+        """
+        return tuple(len(values) for values in self.parameters.values())
+
+    @property
+    def n_points(self) -> int:
+        return math.prod(self.shape)
+
+    def point(self, idx: int) -> dict:
+        """
+        Returns the values of the parameters at the idx-th point of the grid (last parameter changes fastest).
+        """
+        position = np.unravel_index(idx, self.shape)
+        return {name: values[i] for (name, values), i in zip(self.parameters.items(), position)}
+
+    def evaluate(self, start: int, stop: int):
+        """
+        Evaluate the points of the grid from start to stop (excluded).
+
+        Returns
+        -------
+        [point, case, beam, ki_conc, ki_dist, resultant_conc, resultant_dist]
+
+        Flat arrays with one value for every point, load case and beam of the points.
+        """
+        results = [[] for _ in range(7)]
+        n_cases = self._tl_batch.n_cases
+        for idx in range(start, stop):
+            values = self.point(idx)
+            cs = geom.Bridge_configuration(**{name: value for name, value in values.items() if name in GEOMETRY_PARAMETERS})
+            stiffness = {name: value for name, value in values.items() if name in STIFFNESS_PARAMETERS}
+            distribution = getattr(ld.LoadDistributionBatch(cs=cs, tl_batch=self._tl_batch), self.theory)
+            if self.theory in ['gmb', 'grillage']:
+                _, ki_conc, ki_dist, resultant_conc, resultant_dist = distribution(**stiffness)
+            else:
+                _, ki_conc, ki_dist, resultant_conc, resultant_dist = distribution()
+
+            size = n_cases * cs.n_beams
+            results[0].append(np.full(size, idx))
+            results[1].append(np.repeat(np.arange(n_cases), cs.n_beams))
+            results[2].append(np.tile(np.arange(1, cs.n_beams + 1), n_cases))
+            for result, value in zip(results[3:], [ki_conc, ki_dist, resultant_conc, resultant_dist]):
+                result.append(value.ravel())
+        return tuple(np.concatenate(result) for result in results)
+
+    def run(self, processes: int = None, chunksize: int = None, progress=None):
+        """
+        The function evaluates all the points of the grid and returns the results in a single table.
+
+        processes: number of worker processes, every chunk of the grid is an independent task (None to use the current process,
+                   os.cpu_count() to use every core)
+        chunksize: number of points of every chunk (None to give about 4 chunks to every process, STUDY_CHUNK_SIZE at most)
+        progress: optional function called with the number of evaluated points and the total number of points,
+                  after every chunk
+
+        Returns
+        -------
+
+        df: dataframe with one row for every point, load case and beam. Columns are the parameters of the grid,
+            case (index in tl_configs), beam (1 to n_beams), ki_conc, ki_dist, resultant_conc, resultant_dist
+            with the same definitions of LoadDistribution.courbon()
+        """
+        import pandas as pd
+
+        n_points = self.n_points
+        if chunksize is None:
+            chunksize = min(STUDY_CHUNK_SIZE, max(1, math.ceil(n_points / (4 * (processes or 1)))))
+        chunks = [(start, min(start + chunksize, n_points)) for start in range(0, n_points, chunksize)]
+
+        results = {}
+        done = 0
+        if processes is None:
+            for start, stop in chunks:
+                results[start] = self.evaluate(start, stop)
+                done += stop - start
+                if progress is not None:
+                    progress(done, n_points)
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self,)) as executor:
+                futures = {executor.submit(_evaluate_chunk, start, stop): (start, stop) for start, stop in chunks}
+                for future in as_completed(futures):
+                    start, stop = futures[future]
+                    results[start] = future.result()
+                    done += stop - start
+                    if progress is not None:
+                        progress(done, n_points)
+
+        if not results:
+            return pd.DataFrame(columns=list(self.parameters) + ['case', 'beam', 'ki_conc', 'ki_dist', 'resultant_conc', 'resultant_dist'])
+        point, case, beam, ki_conc, ki_dist, resultant_conc, resultant_dist = (
+            np.concatenate(result) for result in zip(*[results[start] for start, _ in chunks]))
+
+        #Values of the parameters decoded from the flat index of the points
+        data = {}
+        for (name, values), position in zip(self.parameters.items(), np.unravel_index(point, self.shape)):
+            if np.ndim(values[0]) > 0:
+                values_array = np.empty(len(values), dtype=object)
+                values_array[:] = list(values)
+            else:
+                values_array = np.asarray(values)
+            data[name] = values_array[position]
+        data.update({'case': case, 'beam': beam, 'ki_conc': ki_conc, 'ki_dist': ki_dist,
+                     'resultant_conc': resultant_conc, 'resultant_dist': resultant_dist})
+        return pd.DataFrame(data)
+
+
+#Study of the worker process, set once by the initializer of the pool
+_worker_study = None
+
+def _init_worker(study: ParametricStudy):
+    global _worker_study
+    _worker_study = study
+
+
+def _evaluate_chunk(start: int, stop: int):
+    return _worker_study.evaluate(start, stop)
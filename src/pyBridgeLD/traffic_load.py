@@ -1,23 +1,29 @@
-from dataclasses import dataclass
+from pyBridgeLD._rounding import round_builtin
+from pyBridgeLD.profiling import instrumented
+from dataclasses import dataclass, field
+import numpy as np
 
 @dataclass
 class Vehicle:
     """
-    A data class that contains all the information about the considered vehicle in the transversal direction.
+    A data class that contains all the information about the considered vehicle in the transversal and longitudinal directions.
 
     Parameters:
     - veh_width: Width of the vehicle
     - veh_load_conc: A list of all the concentrated loads for the considered vehicle
     - veh_load_conc_spacing: A list of all the spacing between the concentrated loads, referred to the middle of vehicle
     - veh_load_dist: Distributed load value for the considered vehicle (0 as default)
+    - veh_axle_position: A list of the longitudinal positions of the axles, referred to the first axle ([0] as default).
+                         The concentrated loads are equally shared between the axles.
 
     """
     veh_width: float
     veh_load_conc: list[float]
     veh_load_conc_spacing: list[float]
     veh_load_dist: float = 0
+    veh_axle_position: list[float] = field(default_factory=lambda: [0.0])
     
-@dataclass
+@dataclass(slots=True)
 class TL_configuration:
     """
     A data class that defines a transversal Traffic Load Configuration.
@@ -26,9 +32,83 @@ class TL_configuration:
     Parameters:
     - veh_list: A list of pre-defined Vehicle objects
     - veh_ecc: A list of the Vehicle's eccentricity, measured from the middle of vehicle to the centerline of cross section
+
+    Load weights and eccentricities are computed once and cached, with a snapshot of veh_ecc and of the loads of
+    the vehicles: changes made in place to the lists, or to the vehicles, are found at the next access and the cache is built again.
     """
     veh_list: list[Vehicle]
     veh_ecc: list[float]
+    _conc: tuple = field(default=None, init=False, repr=False, compare=False)
+    _dist: tuple = field(default=None, init=False, repr=False, compare=False)
+
+    def _snapshot(self) -> tuple:
+        # A copy of the inputs as tuples, much cheaper than building the arrays
+        return (tuple(self.veh_ecc),
+                tuple((vehicle.veh_width, tuple(vehicle.veh_load_conc), tuple(vehicle.veh_load_conc_spacing), vehicle.veh_load_dist)
+                      for vehicle in self.veh_list))
+
+    def _conc_arrays(self):
+        snapshot = self._snapshot()
+        if self._conc is None or self._conc[0] != snapshot:
+            self._conc = (snapshot, self._build_conc())
+        return self._conc[1]
+
+    def _dist_arrays(self):
+        snapshot = self._snapshot()
+        if self._dist is None or self._dist[0] != snapshot:
+            self._dist = (snapshot, self._build_dist())
+        return self._dist[1]
+
+    @instrumented('traffic_load.tl_conc')
+    def _build_conc(self):
+        weights = np.array([weight for vehicle in self.veh_list for weight in vehicle.veh_load_conc], dtype=float)
+        spacing = np.array([ecc for vehicle in self.veh_list for ecc in vehicle.veh_load_conc_spacing], dtype=float)
+        centre = np.repeat(np.asarray(self.veh_ecc, dtype=float)[:len(self.veh_list)],
+                           [len(vehicle.veh_load_conc_spacing) for vehicle in self.veh_list])
+        ecc = round_builtin(np.column_stack([centre - spacing / 2, centre + spacing / 2]).ravel(), 2)
+        weights.setflags(write=False)
+        ecc.setflags(write=False)
+        return weights, ecc, weights.tolist(), ecc.tolist()
+
+    @instrumented('traffic_load.tl_dist')
+    def _build_dist(self):
+        weights = np.array([vehicle.veh_load_dist * vehicle.veh_width for vehicle in self.veh_list], dtype=float)
+        ecc = np.array(self.veh_ecc, dtype=float)
+        weights.setflags(write=False)
+        ecc.setflags(write=False)
+        return weights, ecc, weights.tolist(), list(self.veh_ecc)
+
+    @property
+    def conc_weights(self) -> np.ndarray:
+        """
+        Returns a read-only array with the weights of concentrated loads, the same of tl_conc()[0].
+        """
+        return self._conc_arrays()[0]
+
+    @property
+    def conc_ecc(self) -> np.ndarray:
+        """
+        Returns a read-only array with the eccentricities of concentrated loads, one for every load weight.
+        Eccentricities of tl_conc()[1] exceeding the number of load weights are discarded.
+        """
+        weights, ecc = self._conc_arrays()[:2]
+        if len(ecc) < len(weights):
+            raise ValueError(f"Concentrated loads have {len(weights)} weights but only {len(ecc)} eccentricities")
+        return ecc[:len(weights)]
+
+    @property
+    def dist_weights(self) -> np.ndarray:
+        """
+        Returns a read-only array with the weights of distributed loads, the same of tl_dist()[0].
+        """
+        return self._dist_arrays()[0]
+
+    @property
+    def dist_ecc(self) -> np.ndarray:
+        """
+        Returns a read-only array with the eccentricities of distributed loads, the same of tl_dist()[1].
+        """
+        return self._dist_arrays()[1]
 
     def tl_dist(self):
         """
@@ -36,12 +116,8 @@ class TL_configuration:
         - Traffic load weights for distributed loads (concentated loads obtained as veh_width * veh_load_dist)
         - Traffic load eccentricity for distributed loads (coincident with the veh_ecc list)
         """
-        load_weights = []
-        for vehicle in self.veh_list:
-            load_weight = vehicle.veh_load_dist * vehicle.veh_width
-            load_weights.append(load_weight)
-        load_ecc = self.veh_ecc
-        return load_weights, load_ecc
+        load_weights, load_ecc = self._dist_arrays()[2:]
+        return list(load_weights), list(load_ecc)
     
     def tl_conc(self):
         """
@@ -49,16 +125,58 @@ class TL_configuration:
         - Traffic load weights for concentrated loads (a list of all the concentrated load, from left to right direction)
         - Traffic load eccentricity for concentrated loads (a list of all the eccentricity for the load weights)
         """
-        load_weights = []
-        load_ecc = []
-        for idx, vehicle in enumerate(self.veh_list):
-            for weight in vehicle.veh_load_conc:
-                load_weights.append(weight)
-            for ecc in vehicle.veh_load_conc_spacing:
-                eccentricity_1 = self.veh_ecc[idx] - ecc / 2
-                eccentricity_rounded_1 = round(eccentricity_1, 2)
-                eccentricity_2 = self.veh_ecc[idx] + ecc / 2
-                eccentricity_rounded_2 = round(eccentricity_2, 2)
-                load_ecc.append(eccentricity_rounded_1)
-                load_ecc.append(eccentricity_rounded_2)
-        return load_weights, load_ecc
\ No newline at end of file
+        load_weights, load_ecc = self._conc_arrays()[2:]
+        return list(load_weights), list(load_ecc)
+
+@dataclass
+class TL_batch:
+    """
+    A data class that stacks many transversal Traffic Load Configurations with the same number of loads.
+    Every row of the arrays is a load case, every column a load.
+
+    Parameters:
+    - conc_weights: Array (n_cases x n_conc) of concentrated load weights
+    - conc_ecc: Array (n_cases x n_conc) of concentrated load eccentricities
+    - dist_weights: Array (n_cases x n_dist) of distributed load weights (veh_width * veh_load_dist)
+    - dist_ecc: Array (n_cases x n_dist) of distributed load eccentricities
+    """
+    conc_weights: np.ndarray
+    conc_ecc: np.ndarray
+    dist_weights: np.ndarray
+    dist_ecc: np.ndarray
+
+    def __post_init__(self):
+        self.conc_weights = np.atleast_2d(np.asarray(self.conc_weights, dtype=float))
+        self.conc_ecc = np.atleast_2d(np.asarray(self.conc_ecc, dtype=float))
+        self.dist_weights = np.atleast_2d(np.asarray(self.dist_weights, dtype=float))
+        self.dist_ecc = np.atleast_2d(np.asarray(self.dist_ecc, dtype=float))
+        if self.conc_weights.shape != self.conc_ecc.shape:
+            raise ValueError(f"Concentrated weights {self.conc_weights.shape} and eccentricities {self.conc_ecc.shape} must have the same shape")
+        if self.dist_weights.shape != self.dist_ecc.shape:
+            raise ValueError(f"Distributed weights {self.dist_weights.shape} and eccentricities {self.dist_ecc.shape} must have the same shape")
+        if self.conc_weights.shape[0] != self.dist_weights.shape[0]:
+            raise ValueError(f"Concentrated and distributed loads must have the same number of cases")
+
+    @property
+    def n_cases(self) -> int:
+        """
+        Returns the number of load cases stored in the batch.
+        """
+        return self.conc_weights.shape[0]
+
+    @classmethod
+    @instrumented('traffic_load.batch')
+    def from_configurations(cls, tl_configs: list[TL_configuration]):
+        """
+        Stack a list of TL_configuration objects, all with the same number of loads, in a single batch.
+        Eccentricities exceeding the number of load weights are discarded, as done by LoadDistribution.
+        """
+        if len(tl_configs) == 0:
+            raise ValueError(f"At least one traffic load configuration is needed to build a batch")
+        conc_weights = [tl_config.conc_weights for tl_config in tl_configs]
+        conc_ecc = [tl_config.conc_ecc for tl_config in tl_configs]
+        dist_weights = [tl_config.dist_weights for tl_config in tl_configs]
+        dist_ecc = [tl_config.dist_ecc for tl_config in tl_configs]
+        if len({len(weights) for weights in conc_weights}) > 1 or len({len(weights) for weights in dist_weights}) > 1:
+            raise ValueError(f"All the traffic load configurations of a batch must have the same number of loads")
+        return cls(conc_weights, conc_ecc, dist_weights, dist_ecc)
@@ -0,0 +1,117 @@
+from pyBridgeLD import geometry as geom
+from pyBridgeLD import load_distribution as ld
+from dataclasses import dataclass, field
+import numpy as np
+
+@dataclass
+class WIMSpectrum:
+    """
+    A data class to accumulate the load spectra of every beam from weigh-in-motion (WIM) records.
+
+    Every record is a vehicle, with the lateral position of its centerline (measured as veh_ecc) and the loads of its axles.
+    Every axle is made of two wheels with half of the axle load, at lateral_position -/+ track_width/2.
+    Records are processed in chunks, so that memory use does not depend on the number of records.
+
+    Record format (CSV or Parquet columns):
+    - lateral_position: lateral position of the vehicle centerline
+    - axle_load_1, axle_load_2, ...: axle loads, empty (NaN) for missing axles
+    - axle_spacing_1, axle_spacing_2, ...: axle spacings, not used for the transversal distribution
+
+    Parameters:
+    cs: geometry.Bridge_configuration
+    bins: edges of the load bins of the histograms
+    theory: 'courbon' or 'gmb' ('courbon' as default)
+    stiffness: dictionary with E, nu, I_l, I_t parameters of LoadDistribution.gmb, needed for 'gmb' theory
+    track_width: transversal distance between the wheels of an axle (2.00 as default)
+    """
+    cs: geom.Bridge_configuration
+    bins: np.ndarray
+    theory: str = 'courbon'
+    stiffness: dict = None
+    track_width: float = 2.00
+    n_records: int = field(default=0, init=False)
+    axle_counts: np.ndarray = field(default=None, init=False, repr=False)
+    vehicle_counts: np.ndarray = field(default=None, init=False, repr=False)
+    _share: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.bins = np.asarray(self.bins, dtype=float)
+        self.axle_counts = np.zeros((self.cs.n_beams, len(self.bins) - 1), dtype=np.int64)
+        self.vehicle_counts = np.zeros((self.cs.n_beams, len(self.bins) - 1), dtype=np.int64)
+        if self.theory not in ['courbon', 'gmb']:
+            raise ValueError(f"Theory must be 'courbon' or 'gmb', not {self.theory}")
+        self._share = ld._share_function(self.cs, self.theory, self.stiffness)
+
+    def coefficients(self, ecc) -> np.ndarray:
+        """
+        Returns an array (n_loads x n_beams) with the share of a unit load, placed at the eccentricity ecc, taken by every beam.
+        """
+        return self._share(np.asarray(ecc, dtype=float))
+
+    def add(self, lateral_position, axle_loads) -> np.ndarray:
+        """
+        Add a chunk of records to the histograms.
+
+        lateral_position: array (n_records) of lateral positions of the vehicles
+        axle_loads: array (n_records x n_axles) of axle loads, NaN for missing axles
+
+        Returns
+        -------
+        vehicle_loads: array (n_records x n_beams) with the load of every beam for every vehicle
+        """
+        lateral_position = np.asarray(lateral_position, dtype=float)
+        axle_loads = np.nan_to_num(np.atleast_2d(np.asarray(axle_loads, dtype=float)))
+        share = (self.coefficients(lateral_position - self.track_width / 2)
+                 + self.coefficients(lateral_position + self.track_width / 2)) / 2
+
+        axle_beam_loads = axle_loads[:, :, None] * share[:, None, :]
+        vehicle_loads = axle_loads.sum(axis=1)[:, None] * share
+        self.axle_counts += self._histogram(axle_beam_loads[axle_loads > 0])
+        self.vehicle_counts += self._histogram(vehicle_loads)
+        self.n_records += len(lateral_position)
+        return vehicle_loads
+
+    def _histogram(self, values: np.ndarray) -> np.ndarray:
+        """
+        Returns the counts (n_beams x n_bins) of an array (n_values x n_beams), values outside the bins are discarded.
+        """
+        n_bins = len(self.bins) - 1
+        idx = np.searchsorted(self.bins, values, side='right') - 1
+        idx[values == self.bins[-1]] = n_bins - 1
+        valid = (idx >= 0) & (idx < n_bins)
+        beam = np.broadcast_to(np.arange(self.cs.n_beams), values.shape)
+        counts = np.bincount(beam[valid] * n_bins + idx[valid], minlength=self.cs.n_beams * n_bins)
+        return counts.reshape(self.cs.n_beams, n_bins)
+
+    def process(self, path: str, chunksize: int = 100_000, on_chunk=None):
+        """
+        Read a CSV or Parquet file of WIM records in chunks and add them to the histograms.
+
+        path: path of the file, Parquet files must have the .parquet extension
+        chunksize: number of records of every chunk (100000 as default)
+        on_chunk: optional function called with the vehicle_loads array of every chunk, e.g. to store a time series
+
+        Returns
+        -------
+        n_records: total number of records processed
+        """
+        for chunk in _read_chunks(path, chunksize):
+            axle_columns = [column for column in chunk.columns if column.startswith('axle_load_')]
+            axle_columns.sort(key=lambda column: int(column.rsplit('_', 1)[1]))
+            vehicle_loads = self.add(chunk['lateral_position'].to_numpy(), chunk[axle_columns].to_numpy(dtype=float))
+            if on_chunk is not None:
+                on_chunk(vehicle_loads)
+        return self.n_records
+
+
+def _read_chunks(path: str, chunksize: int):
+    """
+    Yields DataFrames of at most chunksize records from a CSV or Parquet file.
+    """
+    if str(path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize)
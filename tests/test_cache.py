@@ -0,0 +1,65 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import os
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_gmb_disk_cache(tmp_path):
+    """
+    Test for GMB coefficients stored and read back from the disk cache
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76,
+                                                          beam_length=32,
+                                                          diaph_spacing=8)
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=3)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-2.00])
+    load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+    stiffness = {'E': [3e7, 3e7], 'nu': 0.2, 'I_l': [1.0, 0.1], 'I_t': [0.05, 0.01]}
+
+    cache = pybld.cache.DiskCache(tmp_path)
+    first = load_distribution.gmb(**stiffness, cache=cache)
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+    second = load_distribution.gmb(**stiffness, cache=str(tmp_path))
+    assert np.array_equal(first.to_numpy(), load_distribution.gmb(**stiffness).to_numpy())
+    assert np.array_equal(first.to_numpy(), second.to_numpy())
+
+    # Different inputs give different keys
+    key = pybld.cache.cache_key('gmb', bridge_geometry, traffic_load_configuration, *stiffness.values(), False)
+    bridge_geometry.n_beams = 4
+    assert pybld.cache.cache_key('gmb', bridge_geometry, traffic_load_configuration, *stiffness.values(), False) != key
+
+
+def test_disk_cache_eviction(tmp_path):
+    """
+    Test for eviction of the least recently used entries over the size limit
+    """
+    cache = pybld.cache.DiskCache(tmp_path)
+    cache.put('entry0', {'values': np.zeros(100)})
+    cache.max_bytes = 3.5 * os.path.getsize(cache.path('entry0'))
+    for idx in range(3):
+        cache.put(f'entry{idx}', {'values': np.full(100, idx, dtype=float)})
+        os.utime(cache.path(f'entry{idx}'), (idx, idx))
+    assert cache.get('entry0')['values'][0] == 0
+
+    cache.put('entry3', {'values': np.full(100, 3, dtype=float)})
+    assert cache.get('entry1') is None
+    assert cache.get('entry0') is not None
+
+    with open(cache.path('entry0'), 'wb') as file:
+        file.write(b'corrupted')
+    assert cache.get('entry0') is None
+    assert not os.path.exists(cache.path('entry0'))
+
+    # Truncated entry, e.g. from an interrupted copy
+    cache.max_bytes = 2**20
+    cache.put('entry4', {'values': np.full(1000, 4, dtype=float)})
+    with open(cache.path('entry4'), 'r+b') as file:
+        file.truncate(os.path.getsize(cache.path('entry4')) // 2)
+    assert cache.get('entry4') is None
+    assert not os.path.exists(cache.path('entry4'))
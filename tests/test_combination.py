@@ -0,0 +1,49 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import itertools
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_combination():
+    """
+    Test for streaming envelope of load combinations, against all the combinations evaluated one by one
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)
+    veh_ecc = np.array([[-3.5], [-1.0], [1.0], [3.5]])
+    tl_batch = pybld.traffic_load.TL_batch(conc_weights=[[300.0], [300.0], [200.0], [200.0]], conc_ecc=veh_ecc,
+                                           dist_weights=np.zeros((4, 1)), dist_ecc=veh_ecc)
+    result = pybld.load_distribution.LoadDistributionBatch(cs=bridge_geometry, tl_batch=tl_batch).result()
+    effects = pybld.combination.result_effects(result, names=['lane1_left', 'lane1_right', 'lane2_left', 'lane2_right'])
+    effects['self_weight'] = [250.0, 250.0, 250.0]
+
+    groups = [pybld.combination.LoadGroup('permanent', ['self_weight'], factors=[1.35, 1.0], variable=False),
+              pybld.combination.LoadGroup('lane1', ['lane1_left', 'lane1_right'], factors=[1.5]),
+              pybld.combination.LoadGroup('lane2', ['lane2_left', 'lane2_right'], factors=[1.5])]
+    presence_factors = [1.2, 1.0]
+    combination = pybld.combination.LoadCombination(effects=effects, groups=groups, presence_factors=presence_factors)
+    envelope = combination.envelope(block_size=4)
+
+    # Every combination evaluated one by one
+    expected = []
+    for permanent, lane1, lane2 in itertools.product([1.35, 1.0], ['lane1_left', 'lane1_right', None], ['lane2_left', 'lane2_right', None]):
+        present = [lane for lane in [lane1, lane2] if lane is not None]
+        factor = 1.0 if not present else presence_factors[len(present) - 1]
+        expected.append(permanent * np.array(effects['self_weight']) + factor * sum([1.5 * effects[lane] for lane in present]))
+    expected = np.array(expected)
+
+    assert combination.n_combinations == envelope.n_combinations == 18
+    assert envelope.max_effect == pytest.approx(expected.max(axis=0))
+    assert envelope.min_effect == pytest.approx(expected.min(axis=0))
+    assert envelope.max_index.tolist() == expected.argmax(axis=0).tolist()
+    assert envelope.min_index.tolist() == expected.argmin(axis=0).tolist()
+    # Multi-presence factor 1.2 of a single lane governs the edge beam
+    assert combination.combination(envelope.max_index[0]) == {'permanent': ('self_weight', 1.35),
+                                                              'lane1': ('lane1_left', 1.5),
+                                                              'lane2': None}
+
+    with pytest.raises(ValueError):
+        pybld.combination.LoadCombination(effects=effects, groups=groups + [pybld.combination.LoadGroup('lane3', ['lane1_left'])])
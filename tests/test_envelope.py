@@ -0,0 +1,27 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_envelope_courbon():
+    """
+    Test for Courbon envelope of the transversal positions of vehicles
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.50, 
+                                                          n_beams=5, 
+                                                          beam_spacing=2.50)
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[300, 300], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=2.50, veh_load_conc=[200, 200], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    lane3 = pybld.traffic_load.Vehicle(veh_width=2.00, veh_load_conc=[100], veh_load_conc_spacing=[0], veh_load_dist=2.5)
+
+    envelope = pybld.envelope.TransverseEnvelope(cs=bridge_geometry, veh_list=[lane1, lane2, lane3])
+    max_load, min_load, max_ecc, min_ecc = envelope.courbon()
+
+    assert max_load == pytest.approx([466.4, 343.2, 220.0, 343.2, 466.4])
+    assert min_load == pytest.approx([-26.4, 96.8, 220.0, 96.8, -26.4])
+    assert max_ecc[0] == pytest.approx([-4.25, -1.50, 0.75])
+    assert min_ecc[0] == pytest.approx([4.25, 1.50, -0.75])
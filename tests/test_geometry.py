@@ -22,4 +22,19 @@ def test_geometry():
 
     control_distances = [-3.76, 0.0, 3.76]
 
-    assert distances == pytest.approx(control_distances)
\ No newline at end of file
+    assert distances == pytest.approx(control_distances)
+
+def test_geometry_cache():
+    """
+    Test for update of cached beam distances when the geometry changes
+    """
+    geom = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)
+
+    assert geom.beam_distance == pytest.approx([-3.76, 0.0, 3.76])
+    assert geom.polar_inertia == pytest.approx(2 * 3.76**2)
+
+    geom.n_beams = 4
+
+    assert geom.beam_distance == pytest.approx([-5.64, -1.88, 1.88, 5.64])
+    assert geom.beam_offsets.tolist() == pytest.approx([-5.64, -1.88, 1.88, 5.64])
+    assert geom.polar_inertia == pytest.approx(2 * (5.64**2 + 1.88**2))
@@ -0,0 +1,50 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_grillage():
+    """
+    Test for grillage load distribution with and without internal diaphragms
+    """
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])
+
+    ki_conc = {}
+    for n_diaph in [0, 1]:
+        bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                              n_beams=3, 
+                                                              beam_spacing=3.76, 
+                                                              beam_length=32,
+                                                              n_diaph=n_diaph)
+        load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+        ki_conc[n_diaph] = load_distribution.grillage(E=[3e7, 3e7], nu=0.2, I_l=[1.0, 1e4], I_t=[1e-6, 1.0])[1]
+
+    # Without diaphragms the load is shared with the lever rule
+    assert ki_conc[0] == pytest.approx([0.931, 0.069, 0.0])
+    # A rigid diaphragm at midspan and beams without torsional stiffness give the Courbon distribution
+    assert ki_conc[1] == pytest.approx([0.799, 0.333, -0.132])
+
+
+def test_grillage_skew():
+    """
+    Test for symmetry of the grillage deflections of a skewed deck
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=4, 
+                                                          beam_spacing=2.80, 
+                                                          beam_length=25,
+                                                          n_diaph=2)
+    grillage = pybld.grillage.Grillage(cs=bridge_geometry, E=[3e7, 3e7], nu=0.2, I_l=[0.5, 0.1], I_t=[0.05, 0.01], skew=30)
+    deflections = grillage.midspan_deflections()
+
+    # Maxwell reciprocity and central symmetry of the skewed deck
+    assert deflections == pytest.approx(deflections.T)
+    assert deflections == pytest.approx(deflections[::-1, ::-1])
+    assert (deflections.diagonal() > 0).all()
+
+    with pytest.raises(ValueError):
+        pybld.grillage.Grillage(cs=bridge_geometry, E=[3e7, 3e7], nu=0.2, I_l=[0.5, 0.1], I_t=[0, 0.01]).midspan_deflections()
@@ -0,0 +1,21 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import subprocess
+import sys
+
+
+def test_lazy_import():
+    """
+    Test that the core theories do not import pandas, plotly and scipy
+    """
+    code = ("import sys, pyBridgeLD as pybld\n"
+            "cs = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)\n"
+            "vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)\n"
+            "tl_config = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])\n"
+            "print(pybld.load_distribution.LoadDistribution(cs=cs, tl_config=tl_config).courbon()[1])\n"
+            "print([name for name in ['pandas', 'plotly', 'scipy'] if name in sys.modules])\n")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.splitlines()
+
+    assert output == ['[0.799, 0.333, -0.132]', '[]']
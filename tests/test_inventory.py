@@ -0,0 +1,70 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import json
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def _inventory():
+    bridge_1 = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=32, diaph_spacing=8)
+    bridge_2 = pybld.geometry.Bridge_configuration(cw_width=10.00, n_beams=4, beam_spacing=2.50)
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[lane1, lane2], veh_ecc=[-3.00, 0.50]),
+                  pybld.traffic_load.TL_configuration(veh_list=[lane1], veh_ecc=[1.25])]
+    stiffness = [{'E': [3e7, 3e7], 'nu': 0.2, 'I_l': [1.0, 0.1], 'I_t': [0.05, 0.01]}, None]
+    inventory = pybld.inventory.Inventory.from_objects(['B001', 'B002'], [bridge_1, bridge_2], tl_configs, stiffness)
+    return inventory, [bridge_1, bridge_2], tl_configs, stiffness
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'parquet'])
+def test_inventory(tmp_path, extension):
+    """
+    Test for writing and bulk loading an inventory, against the load distribution of every deck
+    """
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+    inventory, bridges, tl_configs, stiffness = _inventory()
+    path = tmp_path / f'network.{extension}'
+    inventory.write(path)
+    inventory = pybld.inventory.read(path)
+
+    assert inventory.n_decks == 2
+    assert inventory.check() == []
+    assert inventory.bridge(1) == bridges[1]
+    assert inventory.tl_configuration(0) == tl_configs[0]
+    assert inventory.stiffness_parameters(0) == stiffness[0]
+    assert inventory.conc_weights.tolist() == [[150, 150, 100, 100], [150, 150, 0, 0]]
+
+    resultant, ki_conc, ki_dist, resultant_conc, resultant_dist = inventory.result('courbon')
+    for idx, (cs, tl_config) in enumerate(zip(bridges, tl_configs)):
+        expected = pybld.load_distribution.LoadDistribution(cs=cs, tl_config=tl_config).result()
+        assert ki_conc[idx, :cs.n_beams] == pytest.approx(expected.ki_conc[0])
+        assert resultant_dist[idx, :cs.n_beams] == pytest.approx(expected.resultant_dist[0])
+        assert resultant[idx] == pytest.approx(expected.resultant[0])
+    assert np.isnan(ki_conc[0, 3])
+
+    with pytest.raises(ValueError):
+        inventory.result('gmb')
+
+
+def test_inventory_check(tmp_path):
+    """
+    Test for the checks of an inventory and for the version of the format
+    """
+    inventory, _, _, _ = _inventory()
+    path = tmp_path / 'network.jsonl'
+    inventory.write(path)
+    lines = path.read_text().splitlines()
+    record = json.loads(lines[2])
+    record['veh_ecc'] = [4.50]
+    path.write_text('\n'.join(lines[:2] + [json.dumps(record)]))
+
+    assert pybld.inventory.read(path).check() == [('B002', 'vehicles outside the carriageway')]
+
+    path.write_text('\n'.join([json.dumps({'format': 'pyBridgeLD-inventory', 'version': 2})] + lines[1:]))
+    with pytest.raises(ValueError):
+        pybld.inventory.read(path)
@@ -0,0 +1,44 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import itertools
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_lane_placement_courbon():
+    """
+    Test for worst arrangement of vehicles in notional lanes against the enumeration of all the arrangements
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=13.00, 
+                                                          n_beams=5, 
+                                                          beam_spacing=2.80)
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=2.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=2.00, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    lane3 = pybld.traffic_load.Vehicle(veh_width=2.00, veh_load_conc=[50, 50], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    veh_list = [lane1, lane2, lane3]
+
+    lane_placement = pybld.lane_placement.LanePlacement(cs=bridge_geometry, lane_width=3.00, veh_list=veh_list)
+    max_load, max_ecc = lane_placement.courbon()
+
+    # Every subset of the vehicles in every arrangement, no vehicle at all gives no load
+    control = [0.0] * bridge_geometry.n_beams
+    for lane_ecc in lane_placement.lane_ecc():
+        for n_veh in range(1, len(veh_list) + 1):
+            for vehicles in itertools.combinations(veh_list, n_veh):
+                for lanes in itertools.permutations(range(len(lane_ecc)), n_veh):
+                    tl_config = pybld.traffic_load.TL_configuration(veh_list=list(vehicles), veh_ecc=[lane_ecc[lane] for lane in lanes])
+                    resultant_conc = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=tl_config).courbon()[3]
+                    control = [max(value, load) for value, load in zip(control, resultant_conc)]
+
+    assert max_load == pytest.approx(control, abs=0.5)
+    assert max_ecc[0] == pytest.approx([-5.00, -2.00, 1.00])
+    assert lane_placement.courbon(processes=2)[0] == pytest.approx(max_load)
+
+    # A fourth vehicle in the far lane would relieve the edge beam, so it is left out
+    lane_placement = pybld.lane_placement.LanePlacement(cs=bridge_geometry, lane_width=3.00, veh_list=veh_list + [lane3], n_shifts=1)
+    max_load_4, max_ecc_4 = lane_placement.courbon()
+    assert max_ecc_4[0].count(None) == 1
+    assert max_load_4[0] == pytest.approx(max_load[0], abs=0.5)
@@ -2,6 +2,7 @@
 Tests for pyBridgeLD
 """
 
+import numpy as np
 import pytest
 import pyBridgeLD as pybld
 
@@ -35,4 +36,174 @@ def test_singlevehicle():
     assert load_distribution.courbon()[1]  == pytest.approx(ki_conc)
 
 
-    
\ No newline at end of file
+    
+def test_courbon_batch():
+    """
+    Test for batch Courbon load distribution against the single configuration results
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=20.00, 
+                                                          n_beams=8, 
+                                                          beam_spacing=2.50)
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[300, 300], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[200, 200], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[lane1, lane2], veh_ecc=[ecc, ecc + 3.00]) 
+                  for ecc in [-8.50, -5.555, -1.005, 0.00, 2.675, 5.50]]
+    tl_batch = pybld.traffic_load.TL_batch.from_configurations(tl_configs)
+    results = pybld.load_distribution.LoadDistributionBatch(cs=bridge_geometry, tl_batch=tl_batch).courbon()
+
+    for case, tl_config in enumerate(tl_configs):
+        control = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=tl_config).courbon()
+        for result, control_result in zip(results, control):
+            assert result[case].tolist() == control_result
+
+def test_gmb():
+    """
+    Test for Guyon-Massonnet-Bares load distribution for single vehicle
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76, 
+                                                          beam_cantilever_left=1.88,
+                                                          beam_cantilever_right=1.88,
+                                                          beam_length=32,
+                                                          n_diaph=2,
+                                                          diaph_spacing=10.50)
+
+    vehicle = pybld.traffic_load.Vehicle(veh_width= 3.50, 
+                                          veh_load_conc=[1], 
+                                          veh_load_conc_spacing=[0], 
+                                          veh_load_dist=0)
+
+    stiffness = dict(E=[35000, 35000], nu=0.1, I_l=[1.3469, 0.1672], I_t=[0.0833, 0.000001])
+
+    left = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])
+    right = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[+3.50])
+    df_left = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=left).gmb(**stiffness)
+    df_right = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=right).gmb(**stiffness)
+
+    k_conc = [1.9469, 0.9774, 0.0750]
+
+    assert df_left.loc['conc_load_1'].tolist() == pytest.approx(k_conc, abs=1e-4)
+    assert df_right.loc['conc_load_1'].tolist() == pytest.approx(k_conc[::-1], abs=1e-4)
+
+def test_gmb_table():
+    """
+    Test for Guyon-Massonnet-Bares load distribution interpolated on Massonnet tables
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.50, 
+                                                          n_beams=11, 
+                                                          beam_spacing=1.00,
+                                                          beam_length=22.30,
+                                                          n_diaph=2,
+                                                          diaph_spacing=22.30)
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[300, 300], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[200, 200], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[lane1, lane2], veh_ecc=[4.25, 0.50])
+
+    stiffness = dict(E=[32308, 32308], nu=0.2, I_l=[0.11375171, 0.10382507], I_t=[0.00510383, 0.01228304])
+    load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+
+    df = load_distribution.gmb(**stiffness)
+    df_table = load_distribution.gmb(**stiffness, table=True)
+
+    assert df_table.to_numpy() == pytest.approx(df.to_numpy(), abs=1e-3 * abs(df.to_numpy()).max())
+
+def test_gmb_series():
+    """
+    Test for Guyon-Massonnet-Bares load distribution as a Fourier series of harmonics
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.50, 
+                                                          n_beams=11, 
+                                                          beam_spacing=1.00,
+                                                          beam_length=22.30,
+                                                          n_diaph=2,
+                                                          diaph_spacing=22.30)
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[300, 300], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[lane1], veh_ecc=[4.25])
+
+    stiffness = dict(E=[32308, 32308], nu=0.2, I_l=[0.11375171, 0.10382507], I_t=[0.00510383, 0.01228304])
+    load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+
+    # First harmonic only is the same of gmb()
+    df_first = load_distribution.gmb_series(**stiffness, max_harmonic=1)
+    assert df_first.to_numpy() == pytest.approx(load_distribution.gmb(**stiffness).to_numpy())
+    assert df_first.attrs['harmonic'] == 1
+
+    df = load_distribution.gmb_series(**stiffness, tolerance=1e-4)
+    df_fine = load_distribution.gmb_series(**stiffness, tolerance=1e-7)
+    assert 1 < df.attrs['harmonic'] < df_fine.attrs['harmonic']
+    assert df.to_numpy() == pytest.approx(df_fine.to_numpy(), abs=1e-2)
+    # Higher harmonics change the coefficients of concentrated loads
+    assert abs(df.to_numpy() - df_first.to_numpy()).max() > 1e-2
+
+    # Distributed load: harmonics weighted by their midspan deflection, that sum to the exact 5/384 of the uniform load
+    df_dist = load_distribution.gmb_series(**stiffness, tolerance=1e-12)
+    b, lambd, theta, alpha = pybld.load_distribution._gmb_parameters(bridge_geometry, **stiffness)
+    e = np.array(traffic_load_configuration.dist_ecc)[:, None]
+    expected = sum(np.sign(np.sin(m * np.pi / 2)) / m**5 * pybld.load_distribution._gmb_kernel(
+                   e, bridge_geometry.beam_offsets[None, :], b, m * lambd, m * theta, alpha)[2]
+                   for m in range(1, df_dist.attrs['harmonic'] + 1, 2))
+    assert df_dist.filter(like='dist', axis=0).to_numpy() == pytest.approx(4 / np.pi**5 * expected / (5 / 384), rel=1e-5)
+
+def test_engesser():
+    """
+    Test for Engesser load distribution with one and two internal diaphragms
+    """
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])
+
+    ki_conc = {}
+    for n_diaph in [1, 2]:
+        bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                              n_beams=3, 
+                                                              beam_spacing=3.76, 
+                                                              beam_length=32,
+                                                              n_diaph=n_diaph,
+                                                              diaph_spacing=10.50)
+        load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+        ki_conc[n_diaph] = load_distribution.engesser()[1]
+
+    # A single rigid diaphragm at midspan, where the load acts, gives the Courbon distribution
+    assert ki_conc[1] == pytest.approx([0.799, 0.333, -0.132])
+    assert ki_conc[2] == pytest.approx([0.829, 0.272, -0.102])
+
+    # Diaphragms outside the span, and a deck without span
+    for beam_length, diaph_spacing in [(32, 20), (0, 0)]:
+        bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=beam_length,
+                                                              n_diaph=3, diaph_spacing=diaph_spacing)
+        with pytest.raises(ValueError):
+            pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration).engesser()
+
+
+def test_gmb_influence_line():
+    """
+    Test for Guyon-Massonnet-Bares influence lines, against the closed form
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.50, 
+                                                          n_beams=11, 
+                                                          beam_spacing=1.00,
+                                                          beam_length=22.30,
+                                                          n_diaph=2,
+                                                          diaph_spacing=22.30)
+    stiffness = {'E': [3.4e7, 3.4e7], 'nu': 0.2, 'I_l': [0.1035, 0.001], 'I_t': [0.0047, 0.003]}
+    line = pybld.load_distribution.gmb_influence_line(bridge_geometry, **stiffness)
+    b, lambd, theta, alpha = pybld.load_distribution._gmb_parameters(bridge_geometry, **stiffness)
+
+    ecc = np.linspace(-b - 0.5, b + 0.5, 5001)
+    exact = pybld.load_distribution._gmb_kernel(ecc[:, None], bridge_geometry.beam_offsets, b, lambd, theta, alpha)[2]
+    assert np.abs(line(ecc) - exact).max() <= line.tolerance
+    assert line(0.5).shape == (11,)
+    assert pybld.load_distribution.gmb_influence_line(bridge_geometry, **stiffness) is line
+
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[300, 300], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[lane1], veh_ecc=[veh_ecc]) for veh_ecc in np.linspace(-4.25, 4.25, 50)]
+    load_distribution = pybld.load_distribution.LoadDistributionBatch(cs=bridge_geometry, 
+                                                                      tl_batch=pybld.traffic_load.TL_batch.from_configurations(tl_configs))
+    result = load_distribution.result('gmb', influence=True, **stiffness)
+    expected = load_distribution.result('gmb', **stiffness)
+    assert result.ki_conc == pytest.approx(expected.ki_conc, abs=1e-6)
+    assert result.resultant_dist == pytest.approx(expected.resultant_dist, abs=1e-4)
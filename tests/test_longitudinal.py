@@ -0,0 +1,51 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_moving_load():
+    """
+    Test for moment and shear envelopes of a tandem moving along a simply supported deck
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76,
+                                                          beam_length=20.00)
+
+    tandem = pybld.traffic_load.Vehicle(veh_width=3.00, 
+                                        veh_load_conc=[300, 300], 
+                                        veh_load_conc_spacing=[2.00], 
+                                        veh_load_dist=9,
+                                        veh_axle_position=[0.00, 1.20])
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[tandem], veh_ecc=[0.00])
+
+    moving_load = pybld.longitudinal.MovingLoad(cs=bridge_geometry, tl_config=traffic_load_configuration)
+    sections, moment_max, moment_min, shear_max, shear_min = moving_load.envelope(n_sections=3, step=0.05)
+
+    # Tandem with an axle at midspan and distributed load on the whole span
+    moment_midspan = 300 * 5.00 + 300 * 8.80 / 2 + 27 * 20.00**2 / 8
+    # Tandem with an axle on the support and distributed load on the whole span
+    shear_support = 300 + 300 * 18.80 / 20.00 + 27 * 20.00 / 2
+
+    assert sections.tolist() == pytest.approx([0.00, 10.00, 20.00])
+    assert moment_max[:, 1].tolist() == pytest.approx([0.333 * moment_midspan] * 3)
+    assert shear_max[:, 0].tolist() == pytest.approx([0.333 * shear_support] * 3)
+    assert moment_min.ravel().tolist() == pytest.approx([0.00] * 9)
+
+
+def test_moving_load_directions():
+    """
+    Test that an asymmetric axle train travels in both directions: the envelopes are symmetric about midspan
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=20.00)
+    truck = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[120, 120, 480, 480], veh_load_conc_spacing=[2.00, 2.00],
+                                       veh_axle_position=[0.00, 4.00, 5.20, 6.40])
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[truck], veh_ecc=[0.00])
+
+    moving_load = pybld.longitudinal.MovingLoad(cs=bridge_geometry, tl_config=traffic_load_configuration)
+    sections, moment_max, moment_min, shear_max, shear_min = moving_load.envelope(n_sections=5, step=0.05)
+
+    assert moment_max == pytest.approx(moment_max[:, ::-1])
@@ -0,0 +1,49 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_downsample():
+    """
+    Test that downsampling keeps the extremes of the series in their order
+    """
+    y = np.sin(np.linspace(0, 20, 100_001))
+    y[12_345] = 5.0
+    y[54_321] = -5.0
+    idx, values = pybld.plotting.downsample(y, max_points=1000)
+
+    assert len(idx) <= 1000
+    assert np.all(np.diff(idx) > 0)
+    assert values.max() == 5.0 and idx[values.argmax()] == 12_345
+    assert values.min() == -5.0 and idx[values.argmin()] == 54_321
+    assert len(pybld.plotting.downsample(y[:500], max_points=1000)[0]) == 500
+
+
+def test_figures():
+    """
+    Test for envelope and case figures of many load cases
+    """
+    pytest.importorskip('plotly')
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)
+    n_cases = 100_000
+    veh_ecc = np.linspace(-3.5, 3.5, n_cases)[:, None]
+    tl_batch = pybld.traffic_load.TL_batch(conc_weights=np.full((n_cases, 1), 100.0), conc_ecc=veh_ecc,
+                                           dist_weights=np.full((n_cases, 1), 10.0), dist_ecc=veh_ecc)
+    result = pybld.load_distribution.LoadDistributionBatch(cs=bridge_geometry, tl_batch=tl_batch).result()
+
+    fig = pybld.plotting.envelope_figure(result, 'resultant_conc', cs=bridge_geometry)
+    assert list(fig.data[0].y) == pytest.approx(result.resultant_conc.max(axis=0))
+    assert list(fig.data[1].y) == pytest.approx(result.resultant_conc.min(axis=0))
+    assert list(fig.data[0].x) == pytest.approx(bridge_geometry.beam_distance)
+
+    fig = pybld.plotting.case_figure(result, beams=[1, 3], max_points=2000)
+    assert [trace.type for trace in fig.data] == ['scattergl', 'scattergl']
+    assert all(len(trace.x) <= 2000 for trace in fig.data)
+    assert max(fig.data[0].y) == pytest.approx(result.ki_conc[:, 0].max())
+
+    with pytest.raises(ValueError):
+        pybld.plotting.case_figure(result, beams=[4])
@@ -0,0 +1,62 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import json
+import numpy as np
+import pyBridgeLD as pybld
+
+
+def test_profiling(tmp_path):
+    """
+    Test for statistics and trace events of the instrumented stages
+    """
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])
+
+    with pybld.profiling.profile(trace=True) as profile:
+        for _ in range(3):
+            bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)
+            pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration).courbon()
+    stats = profile.stats()
+
+    assert stats['load_distribution.courbon']['calls'] == 3
+    assert stats['geometry.beam_distance']['calls'] == 3
+    assert stats['traffic_load.tl_conc']['calls'] == 1
+    assert stats['load_distribution.courbon']['time'] >= stats['geometry.beam_distance']['time']
+    assert 'load_distribution.courbon' in profile.summary()
+
+    profile.export_trace(tmp_path / 'trace.json')
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    assert len(events) == sum([item['calls'] for item in stats.values()])
+
+    # Nothing is collected when the instrumentation is disabled
+    pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration).courbon()
+    assert pybld.profiling.stats()['load_distribution.courbon']['calls'] == 3
+
+
+def test_profiling_memory():
+    """
+    Test that the memory of a stage is its peak allocation, temporaries freed before the end included,
+    and that the allocations of a stage are the blocks it leaves allocated
+    """
+    kept = []
+
+    @pybld.profiling.instrumented('test.temporary')
+    def temporary():
+        kept.extend(np.ones(1) for _ in range(100))
+        return np.ones(1_000_000).sum()
+
+    @pybld.profiling.instrumented('test.outer')
+    def outer():
+        temporary()
+        return np.ones(10).sum()
+
+    with pybld.profiling.profile(memory=True) as profile:
+        outer()
+    stats = profile.stats()
+
+    assert stats['test.temporary']['memory'] >= 8_000_000
+    assert stats['test.outer']['memory'] >= 8_000_000
+    assert 100 <= stats['test.temporary']['allocations'] <= stats['test.outer']['allocations'] < 1000
+    assert 'allocations' in profile.summary(sort='allocations')
@@ -0,0 +1,55 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_result_courbon():
+    """
+    Test for full precision results of Courbon theory and their export without copies
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76)
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=3)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-2.00])
+    load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=traffic_load_configuration)
+
+    result = load_distribution.result()
+    courbon = load_distribution.courbon()
+
+    # Rounded legacy values against full precision ones
+    assert result.ki_conc[0] == pytest.approx(courbon[1], abs=1e-3)
+    assert result.resultant_conc[0] == pytest.approx([119.858, 66.667, 13.475], abs=1e-3)
+    assert result.resultant_conc.sum() == pytest.approx(200)
+    assert result.rounded()[1].tolist() == [courbon[1]]
+
+    df = result.to_pandas()
+    assert df['ki_conc'].shape == (1, 3)
+    assert np.shares_memory(df.to_numpy(), result.beam_data)
+
+    pytest.importorskip('pyarrow')
+    table = result.to_arrow()
+    assert table.column('resultant_conc_1').to_pylist() == pytest.approx([119.858], abs=1e-3)
+    assert np.shares_memory(table.column('ki_conc_1').chunk(0).to_numpy(), result.beam_data)
+
+
+def test_result_arrays():
+    """
+    Test that the arrays of the caller stay writable, and that results are rounded as the built-in round()
+    """
+    batch = pybld.traffic_load.TL_batch(conc_weights=[[100, 100]], conc_ecc=[[-1.0, 1.0]], dist_weights=[[0]], dist_ecc=[[0.5]])
+    k_conc = np.array([[[0.6, 0.4], [0.4, 0.6]]])
+    k_dist = np.array([[[0.45, 0.55]]])
+    result = pybld.results.DistributionResult.from_coefficients('courbon', batch, k_conc, k_dist)
+
+    assert k_conc.flags.writeable and k_dist.flags.writeable
+    assert not result.k_conc.flags.writeable
+    assert result.ki_dist[0] == pytest.approx([0.45, 0.55])
+
+    beam_data = np.full((4, 1, 1), 0.0025)
+    result = pybld.results.DistributionResult('courbon', beam_data, np.zeros((4, 1)), k_conc, k_dist)
+    assert result.rounded()[1].tolist() == [[round(0.0025, 3)]]
@@ -0,0 +1,63 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import asyncio
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_service():
+    """
+    Test for coalescing of concurrent requests on the same cross section, against LoadDistribution.result()
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28,
+                                                          n_beams=3,
+                                                          beam_spacing=3.76,
+                                                          beam_length=32,
+                                                          diaph_spacing=8)
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    stiffness = {'E': [3e7, 3e7], 'nu': 0.2, 'I_l': [1.0, 0.1], 'I_t': [0.05, 0.01]}
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[lane1], veh_ecc=[ecc]) for ecc in [-3.00, -1.50, 0.00, 1.50, 3.00]]
+
+    async def requests():
+        async with pybld.service.DistributionService(max_workers=2, max_pending=3) as service:
+            results = await asyncio.gather(*[service.gmb(bridge_geometry, tl_config, **stiffness) for tl_config in tl_configs])
+            courbon = await service.result(bridge_geometry, tl_configs[0])
+            return results, courbon, service.n_requests, service.n_batches
+
+    results, courbon, n_requests, n_batches = asyncio.run(requests())
+
+    # 5 GMB requests with at most 3 pending at once, and a Courbon request
+    assert n_requests == 6
+    assert n_batches == 3
+    for tl_config, result in zip(tl_configs, results):
+        expected = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=tl_config).result('gmb', **stiffness)
+        assert result.n_cases == 1
+        assert result.ki_conc == pytest.approx(expected.ki_conc)
+        assert result.resultant_dist == pytest.approx(expected.resultant_dist)
+    expected = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=tl_configs[0]).result()
+    assert courbon.resultant_conc == pytest.approx(expected.resultant_conc)
+
+
+def test_service_timeout():
+    """
+    Test that a request exceeding its timeout does not cancel the batch of the other requests
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76)
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)
+    tl_config = pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[-3.50])
+
+    async def requests():
+        async with pybld.service.DistributionService(window=0.05) as service:
+            late = asyncio.ensure_future(service.result(bridge_geometry, tl_config, timeout=0.001))
+            result = await service.result(bridge_geometry, tl_config)
+            with pytest.raises(asyncio.TimeoutError):
+                await late
+            return result, service.n_batches, service.n_pending
+
+    result, n_batches, n_pending = asyncio.run(requests())
+
+    assert n_batches == 1
+    assert n_pending == 0
+    assert result.ki_conc[0] == pytest.approx([0.799, 0.333, -0.132], abs=5e-4)
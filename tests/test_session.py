@@ -0,0 +1,77 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_session():
+    """
+    Test for incremental load distribution when vehicles move, against the full computation
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76,
+                                                          beam_length=32,
+                                                          diaph_spacing=8)
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[lane1, lane2], veh_ecc=[-3.00, 0.50])
+    stiffness = {'E': [3e7, 3e7], 'nu': 0.2, 'I_l': [1.0, 0.1], 'I_t': [0.05, 0.01]}
+
+    for theory, parameters in [('courbon', {}), ('gmb', stiffness)]:
+        session = pybld.session.DistributionSession(cs=bridge_geometry, 
+                                                    tl_config=traffic_load_configuration, 
+                                                    theory=theory, 
+                                                    stiffness=parameters or None)
+        session.move(1, 2.345)
+        session.set_vehicle(0, lane2)
+        session.move(0, -1.20)
+
+        load_distribution = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=session.tl_configuration())
+        result = load_distribution.result(theory, **parameters)
+        assert session.ki_conc == pytest.approx(result.ki_conc[0])
+        assert session.ki_dist == pytest.approx(result.ki_dist[0])
+        assert session.resultant_conc == pytest.approx(result.resultant_conc[0])
+        assert session.resultant == pytest.approx(result.resultant[0])
+
+    assert session.tl_configuration().veh_ecc == [-1.20, 2.345]
+    assert traffic_load_configuration.veh_ecc == [-3.00, 0.50]
+
+
+def test_session_mixed_vehicles():
+    """
+    Test for a vehicle with more eccentricities than weights, paired with the loads of the other vehicles as in result()
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=32, diaph_spacing=8)
+    single = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=1)
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    lane2 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[100, 100], veh_load_conc_spacing=[2.00], veh_load_dist=2.5)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[single, lane1, lane2], veh_ecc=[-3.50, 0.00, 3.00])
+
+    session = pybld.session.DistributionSession(cs=bridge_geometry, tl_config=traffic_load_configuration)
+    for update in [lambda: None, lambda: session.move(1, 1.25), lambda: session.move(0, -2.00),
+                   lambda: session.set_vehicle(2, lane1), lambda: session.set_vehicle(0, lane2), lambda: session.move(2, -3.40)]:
+        update()
+        result = pybld.load_distribution.LoadDistribution(cs=bridge_geometry, tl_config=session.tl_configuration()).result()
+        assert session.ki_conc == pytest.approx(result.ki_conc[0])
+        assert session.ki_dist == pytest.approx(result.ki_dist[0])
+        assert session.resultant_conc == pytest.approx(result.resultant_conc[0])
+        assert session.resultant_dist == pytest.approx(result.resultant_dist[0])
+        assert session.resultant == pytest.approx(result.resultant[0])
+
+
+def test_session_checks():
+    """
+    Test that the session applies the checks of the theories, e.g. Engesser diaphragms outside the span
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=32,
+                                                          n_diaph=3, diaph_spacing=20)
+    lane1 = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    traffic_load_configuration = pybld.traffic_load.TL_configuration(veh_list=[lane1], veh_ecc=[-3.00])
+
+    with pytest.raises(ValueError):
+        pybld.session.DistributionSession(cs=bridge_geometry, tl_config=traffic_load_configuration, theory='engesser')
+    with pytest.raises(ValueError):
+        pybld.session.DistributionSession(cs=bridge_geometry, tl_config=traffic_load_configuration, theory='gmb')
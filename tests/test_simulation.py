@@ -0,0 +1,76 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_simulation():
+    """
+    Test that the maxima of a simulation depend only on the seed, and not on the number of processes
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=5, beam_spacing=2.50, beam_length=30)
+    car = pybld.simulation.VehicleClass(probability=0.7, weight_mean=15, weight_cov=0.2, axle_fractions=[0.5, 0.5], axle_spacing=[2.6])
+    truck = pybld.simulation.VehicleClass(probability=0.3, weight_mean=400, weight_cov=0.25, axle_fractions=[0.2, 0.3, 0.25, 0.25],
+                                          axle_spacing=[3.5, 6.0, 1.3])
+    traffic = pybld.simulation.TrafficModel(classes=[car, truck], lane_ecc=[-3.5, 0.0, 3.5], lane_occupancy=[0.6, 0.3, 0.1])
+    simulation = pybld.simulation.MonteCarloSimulation(cs=bridge_geometry, traffic=traffic, events_per_maximum=2_000, seed=2024)
+
+    result = simulation.run(40_000)
+    parallel = simulation.run(40_000, processes=2, chunksize=3)
+
+    assert result.load.shape == (20, 5)
+    assert np.array_equal(result.load, parallel.load)
+    assert np.array_equal(result.moment, parallel.moment)
+    # Edge beams are the most loaded
+    assert result.load.mean(axis=0).argmax() in [0, 4]
+    assert result.return_level(100).shape == (5,)
+    assert np.all(result.return_level(100) > result.load.mean(axis=0))
+
+    other = pybld.simulation.MonteCarloSimulation(cs=bridge_geometry, traffic=traffic, events_per_maximum=2_000, seed=2025)
+    assert not np.array_equal(other.run(4_000).load, result.load[:2])
+
+    # Without a span the moments are NaN, and cannot be fitted
+    no_span = pybld.geometry.Bridge_configuration(cw_width=10.00, n_beams=4, beam_spacing=2.50, beam_length=0)
+    result = pybld.simulation.MonteCarloSimulation(cs=no_span, traffic=traffic, events_per_maximum=2_000, seed=2024).run(4_000)
+    assert np.isnan(result.moment).all() and np.isfinite(result.load).all()
+    with pytest.raises(ValueError):
+        result.gumbel('moment')
+
+    # Checks of the theories, e.g. Engesser diaphragms outside the span or a deck without span
+    for cs in [pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=3, beam_spacing=3.76, beam_length=32, n_diaph=3, diaph_spacing=20),
+               no_span]:
+        with pytest.raises(ValueError):
+            pybld.simulation.MonteCarloSimulation(cs=cs, traffic=traffic, theory='engesser')
+
+
+def test_midspan_moment():
+    """
+    Test for the maximum midspan moment of an axle train, against the influence line of the moment
+    """
+    beam_length = 20.0
+    axle_loads = np.array([100.0, 150.0, 150.0])
+    axle_position = np.array([0.0, 3.5, 4.8])
+    positions = np.linspace(-10, 30, 4001)
+
+    moment = pybld.longitudinal.influence_lines(beam_length, [beam_length / 2], np.linspace(0, beam_length, 2001))[0][0]
+    lines = np.interp(positions[:, None] + axle_position, np.linspace(0, beam_length, 2001), moment, left=0, right=0)
+
+    assert pybld.simulation.midspan_moment(beam_length, axle_loads, axle_position) == pytest.approx((lines @ axle_loads).max())
+
+
+def test_gumbel():
+    """
+    Test for the Gumbel fit of the maxima
+    """
+    rng = np.random.default_rng(0)
+    maxima = rng.gumbel(loc=[500.0, 300.0], scale=[40.0, 25.0], size=(20_000, 2))
+    result = pybld.simulation.SimulationResult(n_events=20_000, events_per_maximum=1, load=maxima, moment=maxima)
+
+    for method in ['moments', 'ml']:
+        location, scale = result.gumbel(method=method)
+        assert location == pytest.approx([500.0, 300.0], rel=0.01)
+        assert scale == pytest.approx([40.0, 25.0], rel=0.03)
+    assert result.return_level(100, method='ml') == pytest.approx(location - scale * np.log(-np.log(0.99)))
@@ -0,0 +1,50 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_store(tmp_path):
+    """
+    Test that batches written across many chunks are read back by case range and beam, with the inputs of every case
+    """
+    lane = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[150, 150], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[lane], veh_ecc=[ecc]) for ecc in np.linspace(-3.5, 3.5, 7)]
+    tl_batch = pybld.traffic_load.TL_batch.from_configurations(tl_configs)
+
+    store = pybld.store.ResultStore(tmp_path / 'study', chunk_size=5)
+    results = []
+    for n_beams in [5, 4, 5]:
+        cs = pybld.geometry.Bridge_configuration(cw_width=11.28, n_beams=n_beams, beam_spacing=2.50)
+        results.append(pybld.load_distribution.LoadDistributionBatch(cs=cs, tl_batch=tl_batch).result())
+        assert store.append(results[-1], inputs={'n_beams': np.int64(n_beams)}) == (7 * len(results) - 7, 7 * len(results))
+
+    store = pybld.store.ResultStore(tmp_path / 'study')
+    assert store.n_cases == 21 and store.n_beams == 5 and store.n_chunks == 5
+    assert store.read('ki_conc', 0, 7) == pytest.approx(results[0].ki_conc)
+    assert store.read('resultant_dist', 14, 21, beams=4) == pytest.approx(results[2].resultant_dist[:, 4])
+    assert store.read('ki_dist', 7, 14, beams=[0, 3]) == pytest.approx(results[1].ki_dist[:, [0, 3]])
+    assert np.isnan(store.read('ki_dist', 7, 14, beams=4)).all()
+    assert store.record(9) == {'start': 7, 'stop': 14, 'inputs': {'n_beams': 4}}
+    assert sum(len(values['ki_conc']) for _, values in store.blocks(3, 18)) == 15
+
+    ki_conc = np.vstack([results[0].ki_conc, np.pad(results[1].ki_conc, ((0, 0), (0, 1)), constant_values=np.nan), results[2].ki_conc])
+    minimum, maximum = store.envelope('ki_conc')
+    assert minimum == pytest.approx(np.nanmin(ki_conc, axis=0))
+    assert maximum == pytest.approx(np.nanmax(ki_conc, axis=0))
+
+    # A batch after an interrupted write of the index continues from the last complete batch
+    with open(tmp_path / 'study' / 'index.jsonl', 'a') as file:
+        file.write('{"start": 21, "sto')
+    store = pybld.store.ResultStore(tmp_path / 'study')
+    assert store.n_cases == 21
+    store.append(results[0])
+    assert pybld.store.ResultStore(tmp_path / 'study').read('ki_conc', 21) == pytest.approx(results[0].ki_conc)
+
+    with pytest.raises(ValueError):
+        store.append({name: np.ones((2, 6)) for name in pybld.results.BEAM_QUANTITIES})
+    with pytest.raises(ValueError):
+        store.append({'ki_conc': results[0].ki_conc})
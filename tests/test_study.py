@@ -0,0 +1,36 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import pandas as pd
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_parametric_study():
+    """
+    Test for parametric study on a grid of cross sections, in the current process and in a process pool
+    """
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.50, veh_load_conc=[1], veh_load_conc_spacing=[0], veh_load_dist=0)
+    tl_configs = [pybld.traffic_load.TL_configuration(veh_list=[vehicle], veh_ecc=[veh_ecc]) for veh_ecc in [-3.50, 0.0]]
+
+    study = pybld.study.ParametricStudy(parameters={'cw_width': [11.28], 'n_beams': [3, 4], 'beam_spacing': [3.00, 3.76]},
+                                        tl_configs=tl_configs)
+    progress = []
+    df = study.run(chunksize=1, progress=lambda done, total: progress.append((done, total)))
+
+    assert study.n_points == 4
+    assert len(df) == 2 * 2 * (3 + 4)
+    assert progress[-1] == (4, 4)
+
+    point = df[(df.n_beams == 3) & (df.beam_spacing == 3.76) & (df.case == 0)]
+    assert point.ki_conc.tolist() == pytest.approx([0.799, 0.333, -0.132])
+    assert point.beam.tolist() == [1, 2, 3]
+
+    pd.testing.assert_frame_equal(study.run(processes=2), df)
+
+    with pytest.raises(ValueError):
+        pybld.study.ParametricStudy(parameters={'n_beams': [3]}, tl_configs=tl_configs, theory='gmb')
+    # Required fields of Bridge_configuration are checked before any task is sent to the workers
+    with pytest.raises(ValueError):
+        pybld.study.ParametricStudy(parameters={'n_beams': [3], 'beam_spacing': [3.76]}, tl_configs=tl_configs)
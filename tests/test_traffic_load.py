@@ -47,4 +47,27 @@ def test_traffic_load():
 
     assert load_config.tl_dist()[0]  == pytest.approx(load_weights_dist)
     assert load_config.tl_dist()[1]  == pytest.approx(load_ecc_dist)
-    
\ No newline at end of file
+    
+
+def test_traffic_load_cache():
+    """
+    Test for update of cached load arrays when the vehicle eccentricities or the vehicles change
+    """
+    vehicle = pybld.traffic_load.Vehicle(veh_width=3.00, veh_load_conc=[200, 200], veh_load_conc_spacing=[2.00], veh_load_dist=9)
+    load_config = pybld.traffic_load.TL_configuration([vehicle], veh_ecc=[-1.00])
+
+    assert load_config.conc_ecc.tolist() == pytest.approx([-2.00, 0.00])
+
+    load_config.veh_ecc = [1.50]
+
+    assert load_config.tl_conc()[1] == pytest.approx([0.50, 2.50])
+    assert load_config.conc_weights.tolist() == pytest.approx([200, 200])
+    assert load_config.dist_ecc.tolist() == pytest.approx([1.50])
+
+    # Changes made in place to the lists and to the vehicles are found too
+    load_config.veh_ecc[0] = 2.00
+    assert load_config.conc_ecc.tolist() == pytest.approx([1.00, 3.00])
+    vehicle.veh_load_conc[1] = 100
+    vehicle.veh_load_dist = 5
+    assert load_config.conc_weights.tolist() == pytest.approx([200, 100])
+    assert load_config.dist_weights.tolist() == pytest.approx([15.00])
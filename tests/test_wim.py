@@ -0,0 +1,61 @@
+"""
+Tests for pyBridgeLD
+"""
+
+import numpy as np
+import pytest
+import pyBridgeLD as pybld
+
+
+def test_wim_spectrum(tmp_path):
+    """
+    Test for per-beam load spectra of weigh-in-motion records read in chunks
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=3, 
+                                                          beam_spacing=3.76)
+
+    records = tmp_path / 'wim.csv'
+    records.write_text('lateral_position,axle_load_1,axle_load_2,axle_load_3,axle_spacing_1,axle_spacing_2\n'
+                       '-3.50,60,100,,4.20,\n'
+                       '0.00,50,80,80,3.60,1.30\n'
+                       '3.50,40,40,,2.80,\n')
+
+    spectrum = pybld.wim.WIMSpectrum(cs=bridge_geometry, bins=np.arange(0, 201, 10))
+    vehicle_loads = []
+    n_records = spectrum.process(records, chunksize=2, on_chunk=vehicle_loads.append)
+    vehicle_loads = np.vstack(vehicle_loads)
+
+    # Courbon coefficients of a unit load on the centerline of the vehicles
+    k = [[0.799, 0.333, -0.132], [0.333, 0.333, 0.333], [-0.132, 0.333, 0.799]]
+
+    assert n_records == 3
+    assert vehicle_loads.ravel().tolist() == pytest.approx((np.array([160, 210, 80])[:, None] * k).ravel().tolist(), abs=0.2)
+    assert spectrum.vehicle_counts.sum(axis=1).tolist() == [2, 3, 2]
+    assert spectrum.axle_counts.sum(axis=1).tolist() == [5, 7, 5]
+
+
+def test_wim_coefficients():
+    """
+    Test that the shares of the WIM spectra are the coefficients of LoadDistributionBatch
+    """
+    bridge_geometry = pybld.geometry.Bridge_configuration(cw_width=11.28, 
+                                                          n_beams=5, 
+                                                          beam_spacing=2.50,
+                                                          beam_length=32,
+                                                          diaph_spacing=8)
+    stiffness = {'E': [3e7, 3e7], 'nu': 0.2, 'I_l': [1.0, 0.1], 'I_t': [0.05, 0.01]}
+    ecc = np.linspace(-4.5, 4.5, 7)
+    tl_batch = pybld.traffic_load.TL_batch(np.ones((7, 1)), ecc[:, None], np.ones((7, 1)), ecc[:, None])
+    batch = pybld.load_distribution.LoadDistributionBatch(cs=bridge_geometry, tl_batch=tl_batch)
+
+    for theory, parameters in [('courbon', {}), ('gmb', stiffness)]:
+        spectrum = pybld.wim.WIMSpectrum(cs=bridge_geometry, bins=np.arange(0, 201, 10), theory=theory,
+                                         stiffness=parameters or None)
+        ki_conc = getattr(batch, theory)(**parameters)[1]
+        assert spectrum.coefficients(ecc).ravel().tolist() == pytest.approx(ki_conc.ravel().tolist(), abs=1e-3)
+
+    with pytest.raises(ValueError):
+        pybld.wim.WIMSpectrum(cs=bridge_geometry, bins=np.arange(0, 201, 10), theory='gmb')
+    with pytest.raises(ValueError):
+        pybld.wim.WIMSpectrum(cs=bridge_geometry, bins=np.arange(0, 201, 10), theory='engesser')